@@ -0,0 +1,77 @@
+"""
+Time the dispatch of buy and gain events with different numbers of registered effects.
+
+"""
+import time
+
+from pyminion.bots.examples import BigMoney
+from pyminion.core import AbstractDeck, Card
+from pyminion.effects import EffectAction, PlayerCardGameDeckEffect
+from pyminion.expansions.base import base_set, province, silver, smithy
+from pyminion.game import Game
+from pyminion.player import Player
+
+DISPATCHES = 20000
+REPEATS = 5
+
+
+class ProvinceEffect(PlayerCardGameDeckEffect):
+    """
+    Effect that is only triggered when a player gains a Province.
+
+    """
+
+    def __init__(self, player: Player|None):
+        super().__init__("Benchmark: Province")
+        self.player = player
+
+    def get_action(self) -> EffectAction:
+        return EffectAction.Other
+
+    def get_player(self) -> Player|None:
+        return self.player
+
+    def is_triggered(self, player: Player, card: Card, game: Game, deck: AbstractDeck) -> bool:
+        return card is province
+
+    def handler(self, player: Player, card: Card, game: Game, deck: AbstractDeck) -> None:
+        pass
+
+
+def time_dispatch(num_effects: int, buy: bool) -> float:
+    game = Game(
+        players=[BigMoney(), BigMoney()],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        headless=True,
+    )
+    game.start()
+    player, opponent = game.players
+
+    registry = game.effect_registry
+    registry.reset()
+    for i in range(num_effects):
+        # a mix of effects for any player and effects of the other player,
+        # like the effects of the cards an opponent has in play.
+        # cards register gain effects, which are also triggered by buying
+        effect = ProvinceEffect(opponent if i % 2 == 0 else None)
+        registry.register_gain_effect(effect)
+
+    dispatch = registry.on_buy if buy else registry.on_gain
+    deck = player.discard_pile
+
+    # the best of several runs is the least affected by other load on the machine
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(DISPATCHES):
+            dispatch(player, silver, game, deck)
+        best = min(best, time.perf_counter() - start)
+    return best / DISPATCHES
+
+
+if __name__ == "__main__":
+    for num_effects in (0, 5, 50):
+        buy = time_dispatch(num_effects, buy=True)
+        gain = time_dispatch(num_effects, buy=False)
+        print(f"{num_effects:>2} effects: buy {buy * 1e6:.3f} us, gain {gain * 1e6:.3f} us")
@@ -0,0 +1,34 @@
+"""
+Compare the time per game of games with logging disabled to headless games.
+
+"""
+import time
+
+from pyminion.bots.examples import BigMoney, BigMoneySmithy
+from pyminion.expansions.base import base_set, smithy
+from pyminion.game import Game
+
+ITERATIONS = 500
+
+
+def time_games(headless: bool) -> float:
+    game = Game(
+        players=[BigMoney(), BigMoneySmithy()],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        log_stdout=False,
+        headless=headless,
+        seed=0,
+    )
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        game.play()
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+if __name__ == "__main__":
+    logging_disabled = time_games(headless=False)
+    headless = time_games(headless=True)
+    print(f"logging disabled: {logging_disabled * 1000:.3f} ms/game")
+    print(f"headless:         {headless * 1000:.3f} ms/game")
+    print(f"speedup:          {logging_disabled / headless:.2f}x")
@@ -0,0 +1,181 @@
+import asyncio
+import inspect
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from pyminion.human import HumanDecider, Terminal, terminal
+from pyminion.lockstep import DECISION_METHODS, DecisionRequest, ExternalDecider
+from pyminion.player import Player
+from pyminion.result import GameResult
+
+if TYPE_CHECKING:
+    from pyminion.game import Game
+
+
+def is_async_decider(decider: Any) -> bool:
+    """
+    Whether the decisions of a decider are coroutines (see AsyncDecider).
+
+    """
+    return inspect.iscoroutinefunction(getattr(decider, "action_phase_decision", None))
+
+
+async def play_game(game: "Game") -> GameResult:
+    """
+    Play a game in an asyncio event loop and return its result.
+
+    Decisions of players with an async decider are awaited, so other tasks of
+    the loop, such as other games, run while a player is thinking. Their
+    deciders are wrapped in an ExternalDecider while the game is played and
+    given back when it ends. Bots with regular deciders play inline. If the
+    task is cancelled or a decision fails, the game is closed.
+
+    The game is suspended with Game.step, so each game in progress holds an
+    OS thread while it waits for a decision (see GameCoroutine). Turns of
+    bots run while the loop waits for the game's next request, so they block
+    the other tasks of the loop until the game needs an async decision again.
+
+    """
+    deciders = {player: player.decider for player in game.players if is_async_decider(player.decider)}
+    for player, decider in deciders.items():
+        player.decider = ExternalDecider(decider)
+
+    try:
+        step = game.step()
+        while isinstance(step, DecisionRequest):
+            # only async deciders are external, so every answer is awaitable
+            answer = await step.answer()
+            step = game.step(answer)
+    except BaseException:
+        game.close()
+        raise
+    finally:
+        for player, decider in deciders.items():
+            player.decider = decider
+
+    return step
+
+
+class _NeedInput(Exception):
+    """
+    Raised by a replay terminal when the human has not entered the next line yet.
+
+    """
+
+
+class _ReplayTerminal(Terminal):
+    """
+    Terminal that reads the lines a human has entered so far and collects the
+    text shown to them.
+
+    """
+
+    def __init__(self, lines: list[str]):
+        self.lines = lines
+        self.num_read = 0
+        self.output: list[str] = []
+
+    def input(self, prompt: str) -> str:
+        self.output.append(prompt)
+        if self.num_read == len(self.lines):
+            raise _NeedInput()
+        line = self.lines[self.num_read]
+        self.num_read += 1
+        return line
+
+    def print(self, text: str) -> None:
+        self.output.append(f"{text}\n")
+
+    def error(self, error: Exception) -> None:
+        self.output.append(f"{error}\n")
+
+
+class StreamHumanDecider:
+    """
+    Async decider for a human playing over a stream, such as a socket.
+
+    Prompts are written to the writer and answers are read from the reader one
+    line at a time, with the prompts and input format of HumanDecider. Before
+    each decision, the player's hand and turn state are shown.
+
+    The decisions of HumanDecider read their input synchronously, so each one
+    is run with the lines entered so far. When it asks for another line, the
+    new output is sent, the line is awaited and the decision is run again.
+
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.decider = HumanDecider()
+
+    async def decide(self, name: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+        """
+        Make the decision of HumanDecider with the given name and arguments.
+
+        """
+        request = DecisionRequest(name, args, kwargs, ExternalDecider(self.decider))
+        player = request.player
+        state = player.state
+        self.writer.write(
+            f"\nHand: {player.hand} | actions: {state.actions}, money: {state.money}, buys: {state.buys}\n".encode()
+        )
+
+        lines: list[str] = []
+        num_sent = 0
+        while True:
+            replay = _ReplayTerminal(lines)
+            token = terminal.set(replay)
+            try:
+                return request.answer()
+            except _NeedInput:
+                pass
+            finally:
+                terminal.reset(token)
+                output = "".join(replay.output)
+                self.writer.write(output[num_sent:].encode())
+                num_sent = len(output)
+
+            await self.writer.drain()
+            line = await self.reader.readline()
+            if not line:
+                raise ConnectionError("the stream was closed before the decision was made")
+            lines.append(line.decode().rstrip("\r\n"))
+
+
+def _make_stream_decision(name: str) -> Callable[..., Any]:
+    async def decision(self: StreamHumanDecider, *args: Any, **kwargs: Any) -> Any:
+        return await self.decide(name, args, kwargs)
+
+    decision.__name__ = name
+    decision.__qualname__ = f"StreamHumanDecider.{name}"
+    return decision
+
+
+for _name in DECISION_METHODS:
+    setattr(StreamHumanDecider, _name, _make_stream_decision(_name))
+
+
+def human_game_handler(
+    make_game: Callable[[Player], "Game"],
+    player_id: str = "human",
+) -> Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]]:
+    """
+    Connection handler for asyncio.start_server that plays a game with each
+    client. make_game creates the game from the player of the client, whose
+    decisions are made over the connection. The result is sent at the end.
+    Games are played with play_game, so each connected client holds a thread.
+
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        player = Player(decider=StreamHumanDecider(reader, writer), player_id=player_id)
+        try:
+            result = await play_game(make_game(player))
+            writer.write(f"\n{result}\n".encode())
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return handle
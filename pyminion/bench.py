@@ -0,0 +1,377 @@
+"""
+Benchmark the throughput of the game engine on fixed scenarios.
+
+Run with `python -m pyminion.bench`. Every scenario plays the same seeded games
+on every run, so the reported turn counts double as a check that the engine
+still plays the same games. The results are written as JSON, which can be
+compared with the results of another version using --compare.
+
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from pyminion.bots.examples import BigMoney, BigMoneySmithy
+from pyminion.bots.optimized_bot import OptimizedBot, OptimizedBotDecider
+from pyminion.core import Card
+from pyminion.decider import Decider
+from pyminion.expansions.alchemy import (alchemist, alchemy_set, apothecary, familiar, golem, herbalist,
+                                         possession, potion, scrying_pool, transmute, university, vineyard)
+from pyminion.expansions.base import (bandit, base_set, bureaucrat, cellar, chapel, council_room, duchy,
+                                      estate, festival, gardens, gold, laboratory, library, market, militia,
+                                      moat, province, silver, smithy, village, witch, workshop)
+from pyminion.expansions.intrigue import (baron, bridge, conspirator, courtyard, duke, intrigue_set,
+                                          masquerade, minion, nobles, shanty_town, torturer)
+from pyminion.expansions.seaside import (bazaar, caravan, fishing_village, haven, lighthouse, merchant_ship,
+                                         monkey, seaside_set, tactician, treasure_map, wharf)
+from pyminion.game import Game
+from pyminion.lockstep import DECISION_METHODS
+from pyminion.player import Player
+from pyminion.simulator import get_game_seed
+
+# number of games of each scenario that are played while tracing memory
+MEMORY_GAMES = 10
+
+
+class KingdomBotDecider(OptimizedBotDecider):
+    """
+    Plays the given actions in order and buys the given kingdom cards up to a
+    number of copies each, otherwise plays like big money.
+
+    """
+
+    def __init__(self, actions: list[Card], buys: list[tuple[Card, int]]):
+        self.actions = actions
+        self.buys = buys
+
+    def action_priority(self, player: Player, game: Game) -> Iterator[Card]:
+        yield from self.actions
+
+    def buy_priority(self, player: Player, game: Game) -> Iterator[Card]:
+        money = player.state.money
+        potions = player.state.potions
+        num_province = game.supply.pile_length(pile_name="Province")
+
+        if money >= 8:
+            yield province
+        if num_province < 5 and money >= 5:
+            yield duchy
+        if num_province < 3 and money >= 2:
+            yield estate
+        for card, copies in self.buys:
+            cost = card.get_cost(player, game)
+            if cost.money <= money and cost.potions <= potions and player.get_card_count(card) < copies:
+                yield card
+        if money >= 6:
+            yield gold
+        if money >= 3:
+            yield silver
+
+
+def kingdom_bot(player_id: str, actions: list[Card], buys: list[tuple[Card, int]]) -> OptimizedBot:
+    return OptimizedBot(decider=KingdomBotDecider(actions, buys), player_id=player_id)
+
+
+class CountingDecider:
+    """
+    Decider that counts the decisions of another decider.
+
+    """
+
+    def __init__(self, decider: Decider):
+        self.decider = decider
+        self.decisions = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.decider, name)
+
+
+def _make_counting_decision(name: str) -> Callable[..., Any]:
+    def decision(self: CountingDecider, *args: Any, **kwargs: Any) -> Any:
+        self.decisions += 1
+        return getattr(self.decider, name)(*args, **kwargs)
+
+    decision.__name__ = name
+    decision.__qualname__ = f"CountingDecider.{name}"
+    return decision
+
+
+for _name in DECISION_METHODS:
+    setattr(CountingDecider, _name, _make_counting_decision(_name))
+
+
+@dataclass
+class Scenario:
+    """
+    A fixed game setup that is benchmarked.
+
+    Attributes:
+        name: name of the scenario in the results.
+        make_players: creates the players of the game.
+        expansions: expansions of the game.
+        kingdom_cards: cards of the kingdom.
+        games: number of games played by default.
+
+    """
+
+    name: str
+    make_players: Callable[[], list[Player]]
+    expansions: list[list[Card]]
+    kingdom_cards: list[Card]
+    games: int
+
+    def make_game(self) -> Game:
+        return Game(
+            players=self.make_players(),
+            expansions=self.expansions,
+            kingdom_cards=self.kingdom_cards,
+            headless=True,
+        )
+
+
+BASE_KINGDOM = [cellar, chapel, moat, village, workshop, smithy, gardens, festival, laboratory, market]
+
+SCENARIOS = [
+    Scenario(
+        name="big_money_mirror",
+        make_players=lambda: [BigMoney(player_id="big_money_1"), BigMoney(player_id="big_money_2")],
+        expansions=[base_set],
+        kingdom_cards=BASE_KINGDOM,
+        games=500,
+    ),
+    Scenario(
+        name="smithy_vs_big_money",
+        make_players=lambda: [BigMoneySmithy(), BigMoney()],
+        expansions=[base_set],
+        kingdom_cards=BASE_KINGDOM,
+        games=500,
+    ),
+    Scenario(
+        name="attacks",
+        make_players=lambda: [
+            kingdom_bot("witch", [witch, militia], [(witch, 2), (militia, 1), (moat, 1)]),
+            kingdom_bot("militia", [militia, bandit, bureaucrat], [(militia, 2), (bandit, 1), (bureaucrat, 1)]),
+        ],
+        expansions=[base_set],
+        kingdom_cards=[witch, militia, bandit, bureaucrat, moat, library, council_room, village, smithy, market],
+        games=200,
+    ),
+    Scenario(
+        name="seaside_durations",
+        make_players=lambda: [
+            kingdom_bot(
+                "wharf",
+                [fishing_village, bazaar, caravan, wharf, merchant_ship, tactician],
+                [(wharf, 2), (fishing_village, 2), (bazaar, 1), (merchant_ship, 1), (tactician, 1)],
+            ),
+            kingdom_bot(
+                "haven",
+                [caravan, lighthouse, monkey, haven, treasure_map],
+                [(caravan, 3), (lighthouse, 1), (monkey, 1), (haven, 2), (treasure_map, 2)],
+            ),
+        ],
+        expansions=[seaside_set],
+        kingdom_cards=[
+            bazaar, caravan, fishing_village, haven, lighthouse, merchant_ship, monkey, tactician, treasure_map,
+            wharf,
+        ],
+        games=200,
+    ),
+    Scenario(
+        name="alchemy_possession",
+        make_players=lambda: [
+            kingdom_bot(
+                "possession",
+                [university, scrying_pool, alchemist, possession, golem, familiar],
+                [(potion, 2), (possession, 2), (familiar, 1), (alchemist, 2), (university, 1)],
+            ),
+            kingdom_bot(
+                "familiar",
+                [scrying_pool, alchemist, apothecary, familiar, herbalist],
+                [(potion, 1), (familiar, 2), (scrying_pool, 2), (apothecary, 1), (herbalist, 1)],
+            ),
+        ],
+        expansions=[alchemy_set],
+        kingdom_cards=[
+            alchemist, apothecary, familiar, golem, herbalist, possession, scrying_pool, transmute, university,
+            vineyard,
+        ],
+        games=100,
+    ),
+    Scenario(
+        name="intrigue_4_players",
+        make_players=lambda: [
+            kingdom_bot("minion", [shanty_town, conspirator, minion], [(minion, 4), (shanty_town, 2)]),
+            kingdom_bot("torturer", [shanty_town, torturer, masquerade], [(torturer, 2), (masquerade, 1)]),
+            kingdom_bot("courtyard", [conspirator, courtyard, bridge], [(courtyard, 2), (bridge, 2), (conspirator, 1)]),
+            kingdom_bot("duke", [baron, nobles], [(duke, 4), (baron, 1), (nobles, 2)]),
+        ],
+        expansions=[intrigue_set],
+        kingdom_cards=[
+            baron, bridge, conspirator, courtyard, duke, masquerade, minion, nobles, shanty_town, torturer,
+        ],
+        games=100,
+    ),
+]
+
+
+def play_games(game: Game, players: list[Player], games: int, seed: int) -> int:
+    """
+    Play seeded games and return their total number of turns. Every game
+    starts from the given order of the players.
+
+    """
+    turns = 0
+    for iteration in range(games):
+        game.seed = get_game_seed(seed, iteration)
+        game.rng.seed(game.seed)
+        game.players = players[:]
+        turns += game.play().turns
+    return turns
+
+
+def run_scenario(scenario: Scenario, games: int|None = None, seed: int = 0, repeat: int = 1) -> dict[str, Any]:
+    """
+    Benchmark a scenario. The time is the fastest of repeat runs of the games.
+    Peak memory is traced over a separate run of a few games, because tracing
+    slows the engine down.
+
+    """
+    games = games if games is not None else scenario.games
+    game = scenario.make_game()
+    players = game.players[:]
+    deciders = [CountingDecider(player.decider) for player in game.players]
+    for player, decider in zip(game.players, deciders):
+        player.decider = decider  # type: ignore[assignment]
+
+    seconds = float("inf")
+    for _ in range(repeat):
+        for decider in deciders:
+            decider.decisions = 0
+        gc.collect()
+        start = time.perf_counter()
+        turns = play_games(game, players, games, seed)
+        seconds = min(seconds, time.perf_counter() - start)
+    decisions = sum(decider.decisions for decider in deciders)
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    play_games(game, players, min(games, MEMORY_GAMES), seed)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "players": [player.player_id for player in players],
+        "games": games,
+        "turns": turns,
+        "decisions": decisions,
+        "seconds": round(seconds, 6),
+        "games_per_sec": round(games / seconds, 3),
+        "decisions_per_sec": round(decisions / seconds, 3),
+        "peak_memory_kb": round((peak - baseline) / 1024, 1),
+    }
+
+
+def get_max_rss_kb() -> int|None:
+    try:
+        import resource
+    except ImportError:
+        # not available on windows
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+
+def run_benchmarks(
+    scenarios: list[Scenario],
+    games: int|None = None,
+    seed: int = 0,
+    repeat: int = 1,
+    report: Callable[[str], None]|None = None,
+) -> dict[str, Any]:
+    """
+    Benchmark the scenarios and collect the results with information about
+    the environment.
+
+    """
+    results: dict[str, Any] = {}
+    for scenario in scenarios:
+        results[scenario.name] = result = run_scenario(scenario, games, seed, repeat)
+        if report is not None:
+            report(
+                f"{scenario.name:<22} {result['games_per_sec']:>10.1f} games/s"
+                f" {result['decisions_per_sec']:>12.1f} decisions/s"
+                f" {result['peak_memory_kb']:>10.1f} KiB peak"
+            )
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "max_rss_kb": get_max_rss_kb(),
+        "scenarios": results,
+    }
+
+
+def compare_results(old: dict[str, Any], new: dict[str, Any]) -> list[str]:
+    """
+    Describe the change in throughput of each scenario between two results.
+
+    """
+    lines: list[str] = []
+    for name, result in new["scenarios"].items():
+        previous = old["scenarios"].get(name)
+        if previous is None:
+            continue
+        change = result["games_per_sec"] / previous["games_per_sec"] - 1
+        line = f"{name:<22} {change:>+8.1%} games/s"
+        if (result["games"], result["turns"]) != (previous["games"], previous["turns"]):
+            line += " (games differ)"
+        lines.append(line)
+    return lines
+
+
+def main(argv: list[str]|None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m pyminion.bench", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, help="number of games of every scenario, instead of its default")
+    parser.add_argument("--scenario", action="append", choices=[s.name for s in SCENARIOS], help="scenario to run, can be repeated")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="report the fastest of this many runs")
+    parser.add_argument("--output", help="write the results to this JSON file instead of stdout")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare with")
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in SCENARIOS if args.scenario is None or s.name in args.scenario]
+
+    def report(line: str) -> None:
+        print(line, file=sys.stderr)
+
+    results = run_benchmarks(scenarios, args.games, args.seed, args.repeat, report)
+
+    if args.compare:
+        with open(args.compare) as file:
+            for line in compare_results(json.load(file), results):
+                report(line)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -41,7 +41,7 @@ class BotDecider:
         game: "Game",
     ) -> Card|None:
         for card in self.action_priority(player, game):
-            if card in player.hand.cards:
+            if card in player.hand:
                 return card
 
         return None
@@ -1,7 +1,7 @@
 from typing import Iterator
 
 from pyminion.bots.optimized_bot import OptimizedBot, OptimizedBotDecider
-from pyminion.core import CardType, Card
+from pyminion.core import Card
 from pyminion.expansions.base import (
     bandit,
     duchy,
@@ -41,9 +41,7 @@ class BanditBotDecider(OptimizedBotDecider):
         num_province = game.supply.pile_length(pile_name="Province")
         num_smithy = player.get_card_count(card=smithy)
         num_bandit = player.get_card_count(card=bandit)
-        num_treasure = len(
-            [card for card in player.get_all_cards() if CardType.Treasure in card.type]
-        )
+        num_treasure = player.get_treasure_count()
 
         if deck_money > 15 and money >= 8:
             yield province
@@ -2,7 +2,7 @@ import logging
 from typing import Iterator
 
 from pyminion.bots.bot import Bot, BotDecider
-from pyminion.core import CardType, Card
+from pyminion.core import Card
 from pyminion.expansions.base import duchy, estate, gold, province, silver, smithy
 from pyminion.player import Player
 from pyminion.game import Game
@@ -32,9 +32,7 @@ class BigMoneyUltimateDecider(BotDecider):
         deck_money = player.get_deck_money()
         num_province = game.supply.pile_length(pile_name="Province")
         num_smithy = player.get_card_count(card=smithy)
-        num_treasure = len(
-            [card for card in player.get_all_cards() if CardType.Treasure in card.type]
-        )
+        num_treasure = player.get_treasure_count()
 
         if deck_money > 15 and money >= 8:
             yield province
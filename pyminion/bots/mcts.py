@@ -0,0 +1,308 @@
+import math
+import random
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from pyminion.bots.examples.big_money import BigMoneyDecider
+from pyminion.bots.optimized_bot import OptimizedBot, OptimizedBotDecider
+from pyminion.bots.rollout_bot import (
+    TurnContinuation,
+    action_options,
+    buy_options,
+    continue_action_phase,
+    continue_buy_phase,
+    play_out,
+)
+from pyminion.core import KEY_MASK, Card
+from pyminion.decider import Decider
+from pyminion.encoding import get_player_zones
+from pyminion.player import Player
+
+if TYPE_CHECKING:
+    from pyminion.game import Game
+
+
+# kinds of decisions that are searched
+ACTION_DECISION = 0
+BUY_DECISION = 1
+
+
+def information_set_key(kind: int, player: Player, game: "Game") -> int:
+    """
+    Hash of what the player knows when making a decision: the cards in each
+    of their zones, their turn state, the cards each opponent owns and the
+    counts of the supply piles and the trash. The order of decks and the
+    hands of opponents are hidden, so they are not part of the key.
+
+    Zones are hashed by their keys (see AbstractDeck.get_key), which are O(1)
+    for players with counted zones.
+
+    """
+    state = player.state
+    values = [kind, game.card_cost_reduction, state.actions, state.money, state.potions, state.buys]
+    values.extend(zone.get_key() for zone in get_player_zones(player))
+    for opponent in game.get_opponents(player):
+        # zone keys add up to the key of all the cards of the opponent
+        values.append(sum(zone.get_key() for zone in get_player_zones(opponent)) & KEY_MASK)
+    values.extend(len(pile) for pile in game.supply.piles)
+    values.append(game.trash.get_key())
+    return hash(tuple(values))
+
+
+class Node:
+    """
+    Statistics of the options of a decision in the search tree.
+
+    """
+
+    __slots__ = ("options", "visits", "child_visits", "child_values")
+
+    def __init__(self, options: list[Card|None]):
+        self.options = options
+        self.visits = 0
+        self.child_visits = [0] * len(options)
+        self.child_values = [0.0] * len(options)
+
+    def select(self, exploration: float) -> int:
+        """
+        Index of the option to try next: every option once, then the option
+        with the highest upper confidence bound (UCB1).
+
+        """
+        for i, visits in enumerate(self.child_visits):
+            if visits == 0:
+                return i
+
+        log_visits = math.log(self.visits)
+        best = 0
+        best_bound = -math.inf
+        for i, visits in enumerate(self.child_visits):
+            bound = self.child_values[i] / visits + exploration * math.sqrt(log_visits / visits)
+            if bound > best_bound:
+                best = i
+                best_bound = bound
+        return best
+
+    def update(self, index: int, value: float) -> None:
+        self.visits += 1
+        self.child_visits[index] += 1
+        self.child_values[index] += value
+
+
+class _TreeDecider:
+    """
+    Makes the decisions of the searching player during one iteration of the
+    search. Actions and buys follow the tree while the decisions are in the
+    transposition table, one new node is added per iteration and the policy
+    makes all other decisions.
+
+    """
+
+    def __init__(self, search: "MCTSDecider"):
+        self.search = search
+        self.policy = search.policy
+        self.path: list[tuple[Node, int]] = []
+        self.expanded = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.policy, name)
+
+    def action_phase_decision(
+        self,
+        valid_actions: list[Card],
+        player: Player,
+        game: "Game",
+    ) -> Card|None:
+        if self.expanded:
+            return self.policy.action_phase_decision(valid_actions, player, game)
+        return self.select(ACTION_DECISION, action_options(valid_actions), player, game)
+
+    def buy_phase_decision(
+        self,
+        valid_cards: list[Card],
+        player: Player,
+        game: "Game",
+    ) -> Card|None:
+        if self.expanded:
+            return self.policy.buy_phase_decision(valid_cards, player, game)
+        return self.select(BUY_DECISION, buy_options(valid_cards), player, game)
+
+    def select(self, kind: int, options: list[Card|None], player: Player, game: "Game") -> Card|None:
+        if len(options) == 1:
+            return options[0]
+
+        key = information_set_key(kind, player, game)
+        node = self.search.table.get(key)
+        if node is None or node.options != options:
+            node = self.search.add_node(key, options)
+            self.expanded = True
+        else:
+            self.search.use_node(key, node)
+
+        index = node.select(self.search.exploration)
+        self.path.append((node, index))
+        return node.options[index]
+
+
+class MCTSDecider(OptimizedBotDecider):
+    """
+    Chooses actions to play and cards to buy with information set Monte Carlo
+    tree search (ISMCTS).
+
+    Each iteration of the search plays out a determinized copy of the game, in
+    which the order of the decks and the hands of the opponents are guessed,
+    so the search does not use hidden information. The actions and buys of
+    this player follow the tree while the opponents follow the policy.
+
+    Nodes are stored in a transposition table keyed by a hash of what the
+    player knows at a decision (see information_set_key), so decisions that
+    are reached in different ways share statistics and the next decision of
+    a turn starts from the statistics gathered by the previous one. When the
+    table holds max_nodes nodes, the least recently used node is evicted.
+
+    Other decisions are made like OptimizedBotDecider.
+
+    Attributes:
+        policy: decider used by all players outside of the tree. Defaults to big money.
+        iterations: number of iterations per decision.
+        time_limit: if set, the number of seconds after which a decision stops searching.
+        exploration: exploration constant of the UCB1 formula.
+        max_nodes: maximum number of nodes in the transposition table.
+        max_turns: number of turns after which a playout is stopped and
+            the player with the most victory points wins.
+        seed: seed of the random number generator used to seed playouts.
+
+    """
+
+    def __init__(
+        self,
+        policy: Decider|None = None,
+        iterations: int = 200,
+        time_limit: float|None = None,
+        exploration: float = 0.7,
+        max_nodes: int = 100_000,
+        max_turns: int = 100,
+        seed: int|None = None,
+    ):
+        if max_nodes < 1:
+            raise ValueError("max_nodes must be at least 1")
+        self.policy = policy if policy else BigMoneyDecider()
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.max_nodes = max_nodes
+        self.max_turns = max_turns
+        self.rng = random.Random(seed)
+        self.table: OrderedDict[int, Node] = OrderedDict()
+        self._game: "Game|None" = None
+        self._game_start = 0
+
+    def action_phase_decision(
+        self,
+        valid_actions: list[Card],
+        player: Player,
+        game: "Game",
+    ) -> Card|None:
+        options = action_options(valid_actions)
+        return self.search(ACTION_DECISION, options, continue_action_phase, player, game)
+
+    def buy_phase_decision(
+        self,
+        valid_cards: list[Card],
+        player: Player,
+        game: "Game",
+    ) -> Card|None:
+        options = buy_options(valid_cards)
+        return self.search(BUY_DECISION, options, continue_buy_phase, player, game)
+
+    def add_node(self, key: int, options: list[Card|None]) -> Node:
+        """
+        Add a node to the transposition table.
+
+        """
+        node = Node(options)
+        self.use_node(key, node)
+        return node
+
+    def use_node(self, key: int, node: Node) -> None:
+        """
+        Mark a node as most recently used, adding it back to the transposition
+        table if it was evicted. If the table is full, the least recently used
+        nodes are evicted.
+
+        """
+        self.table[key] = node
+        self.table.move_to_end(key)
+        while len(self.table) > self.max_nodes:
+            self.table.popitem(last=False)
+
+    def search(
+        self,
+        kind: int,
+        options: list[Card|None],
+        continuation: TurnContinuation,
+        player: Player,
+        game: "Game",
+    ) -> Card|None:
+        """
+        Search the decision and return the option that was tried most often.
+
+        """
+        if len(options) == 1:
+            return options[0]
+
+        # statistics of another game do not apply, including an earlier game
+        # played on the same game object
+        if game is not self._game or game.start_count != self._game_start:
+            self.table.clear()
+            self._game = game
+            self._game_start = game.start_count
+
+        key = information_set_key(kind, player, game)
+        root = self.table.get(key)
+        if root is None or root.options != options:
+            root = Node(options)
+
+        deadline = None if self.time_limit is None else time.monotonic() + self.time_limit
+        for iteration in range(self.iterations):
+            if iteration > 0 and deadline is not None and time.monotonic() >= deadline:
+                break
+
+            # keep the root from being evicted by the nodes of this search
+            self.use_node(key, root)
+
+            index = root.select(self.exploration)
+            tree = _TreeDecider(self)
+            value = play_out(
+                game,
+                player,
+                root.options[index],
+                continuation,
+                self.policy,
+                self.rng.getrandbits(64),
+                self.max_turns,
+                decider=tree,
+            )
+
+            root.update(index, value)
+            for node, node_index in tree.path:
+                node.update(node_index, value)
+
+        best = max(range(len(root.options)), key=lambda i: root.child_visits[i])
+        return root.options[best]
+
+
+class MCTSBot(OptimizedBot):
+    """
+    Bot that searches its actions and buys with information set Monte Carlo tree search.
+
+    """
+
+    def __init__(
+        self,
+        decider: MCTSDecider|None = None,
+        player_id: str = "mcts_bot",
+    ):
+        decider = decider if decider else MCTSDecider()
+        super().__init__(decider=decider, player_id=player_id)
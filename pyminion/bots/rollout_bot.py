@@ -0,0 +1,409 @@
+import multiprocessing
+import pickle
+import random
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+from pyminion.bots.examples.big_money import BigMoneyDecider
+from pyminion.bots.optimized_bot import OptimizedBot, OptimizedBotDecider
+from pyminion.core import Card
+from pyminion.decider import Decider
+from pyminion.player import Player
+
+if TYPE_CHECKING:
+    from pyminion.game import Game
+
+
+# value of a victory point of margin over the best opponent in a playout,
+# small enough to only matter between options that win about equally often
+MARGIN_WEIGHT = 0.001
+
+# plays the rest of the turn in a copy of the game once a decision is made.
+# arguments are the copied game, the copied player and the chosen option.
+TurnContinuation = Callable[["Game", Player, Card|None], None]
+
+
+def action_options(valid_actions: list[Card]) -> list[Card|None]:
+    """
+    The options of an action phase decision: each action in hand or no action.
+
+    """
+    # cards are singletons, so each card in hand is one option
+    options: list[Card|None] = list(dict.fromkeys(valid_actions))
+    options.append(None)
+    return options
+
+
+def buy_options(valid_cards: list[Card]) -> list[Card|None]:
+    """
+    The options of a buy phase decision: each card that can be bought or no card.
+
+    """
+    options: list[Card|None] = list(valid_cards)
+    options.append(None)
+    return options
+
+
+def continue_action_phase(game: "Game", player: Player, card: Card|None) -> None:
+    """
+    Play the rest of the turn after the player chose an action to play, or None.
+
+    """
+    if card is not None:
+        player.play(card, game)
+        player.start_action_phase(game)
+    player.start_treasure_phase(game)
+    player.start_buy_phase(game)
+    _end_turn(game, player)
+
+
+def continue_buy_phase(game: "Game", player: Player, card: Card|None) -> None:
+    """
+    Play the rest of the turn after the player chose a card to buy, or None.
+
+    """
+    if card is not None:
+        player.buy(card, game)
+        player.start_buy_phase(game)
+    else:
+        game.effect_registry.on_buy_phase_end(player, game)
+    _end_turn(game, player)
+
+
+def _end_turn(game: "Game", player: Player) -> None:
+    player.start_cleanup_phase(game)
+    player.end_turn(game)
+    game.card_cost_reduction = 0
+
+
+def determinize(game: "Game", player: Player, rng: random.Random) -> None:
+    """
+    Replace the information that is hidden from the player with a random guess
+    that is consistent with what the player knows: the order of every deck and
+    the cards in the hands of the opponents.
+
+    """
+    for other in game.players:
+        if other is player:
+            rng.shuffle(other.deck.cards)
+            continue
+
+        # the cards in an opponent's hand could be any of their unseen cards.
+        # cards leave and enter the hand one by one, so effects of cards in
+        # hand (like the reaction of Moat) follow the guessed hand
+        hand = other.hand
+        hand_size = len(hand)
+        unseen = hand.cards + other.deck.cards
+        rng.shuffle(unseen)
+        while hand.cards:
+            hand.pop()
+        other.deck.cards = unseen[hand_size:]
+        for card in unseen[:hand_size]:
+            hand.add(card)
+
+
+def play_out(
+    game: "Game",
+    player: Player,
+    option: Card|None,
+    continuation: TurnContinuation,
+    policy: Decider,
+    seed: int,
+    max_turns: int,
+    decider: Decider|None = None,
+) -> float:
+    """
+    Play out a game from a decision of the player, with every player using the
+    policy, and return the result for the player: 1 for a win, 0.5 for a tie
+    and 0 for a loss, plus MARGIN_WEIGHT per victory point the player is ahead
+    of the best opponent. If the game does not end within max_turns more turns,
+    the player with the most victory points wins.
+
+    If decider is given, it makes the later decisions of the player instead of
+    the policy.
+
+    The game itself is left unchanged. The playout starts from a determinized
+    copy of the game, so it does not use information hidden from the player.
+    Extra turns that are pending at the time of the decision are not played.
+
+    """
+    clone = game.clone()
+    clone.headless = True
+    for clone_player in clone.players:
+        clone_player.decider = policy
+        clone_player.headless = True
+
+    player = clone.players[game.players.index(player)]
+    possessor = player.possessing_player
+    # decisions of a possessed player are made for the possessing player
+    me = possessor if possessor is not None else player
+    if decider is not None:
+        player.decider = decider
+        me.decider = decider
+
+    # the hand of the player making the decision is always known
+    clone.rng.seed(seed)
+    determinize(clone, player, clone.rng)
+
+    continuation(clone, player, option)
+
+    if possessor is not None:
+        # finish the possession turn like Player.possess and continue
+        # after the possessing player
+        if len(player.possession_trash) > 0:
+            player.possession_trash.move_to(player.discard_pile)
+        player.possessing_player = None
+        player.decider = policy
+        possessor.take_possession_turn = False
+    elif player.take_possession_turn:
+        player.possess(clone)
+        clone.card_cost_reduction = 0
+    player.take_extra_turn = False
+
+    index = clone.players.index(me) + 1
+    turns = 0
+    while not clone.is_over() and turns < max_turns:
+        next_player = clone.players[index % len(clone.players)]
+        clone.current_player = next_player
+        clone.play_turn(next_player)
+        index += 1
+        turns += 1
+
+    winners = clone.get_winners()
+    if me not in winners:
+        result = 0.0
+    else:
+        result = 1.0 if len(winners) == 1 else 0.5
+
+    # the victory point margin separates options that win or lose equally often
+    score = me.get_victory_points()
+    best_opponent_score = max(p.get_victory_points() for p in clone.get_opponents(me)) if len(clone.players) > 1 else 0
+    return result + (score - best_opponent_score) * MARGIN_WEIGHT
+
+
+# decision the worker of a process pool is playing out, and its pickled form
+_worker_decision: tuple["Game", Player, list[Card|None], TurnContinuation, Decider, int]|None = None
+_worker_data: bytes|None = None
+
+
+def _run_rollouts(task: tuple[bytes, int, int, int, float|None]) -> tuple[int, float, int]:
+    """
+    Play out an option of a pickled decision up to a number of times or until
+    the deadline, at least once. Returns the option index, the total value and
+    the number of rollouts.
+
+    """
+    global _worker_decision, _worker_data
+    data, option_index, count, seed, deadline = task
+    # the tasks of a decision carry the same decision, which is only loaded once
+    if data != _worker_data:
+        _worker_decision = pickle.loads(data)
+        _worker_data = data
+    assert _worker_decision is not None
+    game, player, options, continuation, policy, max_turns = _worker_decision
+    rng = random.Random(seed)
+
+    total = 0.0
+    done = 0
+    while done < count and (done == 0 or deadline is None or time.monotonic() < deadline):
+        total += play_out(
+            game, player, options[option_index], continuation, policy, rng.getrandbits(64), max_turns
+        )
+        done += 1
+    return option_index, total, done
+
+
+class RolloutBotDecider(OptimizedBotDecider):
+    """
+    Chooses actions to play and cards to buy by playing out each option.
+
+    Every option, including playing or buying nothing, is played out a number
+    of times with all players following a fast default policy, and the option
+    with the highest average result is chosen. Other decisions are made like
+    OptimizedBotDecider.
+
+    Attributes:
+        policy: decider used by all players in playouts. Defaults to big money.
+        rollouts: number of playouts of each option per decision.
+        time_limit: if set, the number of seconds after which a decision stops
+            playing out options. Each option is played out at least once.
+        max_turns: number of turns after which a playout is stopped and
+            the player with the most victory points wins.
+        processes: number of processes playing out options. If greater than 1,
+            a process pool is created on the first decision and kept until
+            close() is called. Otherwise options are played out in this process.
+        seed: seed of the random number generator used to seed playouts.
+        pool: process pool to play out options on instead of creating one,
+            e.g. to share it between deciders. It is not closed by the decider.
+            The playouts of each option are still split into processes tasks.
+
+    Processes of a pool cannot start processes of their own, so when the
+    decider runs in a worker of a Simulator or Tournament, options are played
+    out in the worker itself.
+
+    """
+
+    def __init__(
+        self,
+        policy: Decider|None = None,
+        rollouts: int = 20,
+        time_limit: float|None = None,
+        max_turns: int = 100,
+        processes: int = 1,
+        seed: int|None = None,
+        pool: Any = None,
+    ):
+        self.policy = policy if policy else BigMoneyDecider()
+        self.rollouts = rollouts
+        self.time_limit = time_limit
+        self.max_turns = max_turns
+        self.processes = processes
+        self.rng = random.Random(seed)
+        self.pool = pool
+        self._pool: Any = None
+
+    def __enter__(self) -> "RolloutBotDecider":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # process pools cannot be pickled, a copy of the decider makes its own
+        state = self.__dict__.copy()
+        state["pool"] = None
+        state["_pool"] = None
+        return state
+
+    def close(self) -> None:
+        """
+        Shut down the process pool created by the decider.
+
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def _get_pool(self) -> Any:
+        if self.pool is not None:
+            return self.pool
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(processes=self.processes)
+        return self._pool
+
+    def action_phase_decision(
+        self,
+        valid_actions: list[Card],
+        player: Player,
+        game: "Game",
+    ) -> Card|None:
+        return self.choose(action_options(valid_actions), continue_action_phase, player, game)
+
+    def buy_phase_decision(
+        self,
+        valid_cards: list[Card],
+        player: Player,
+        game: "Game",
+    ) -> Card|None:
+        return self.choose(buy_options(valid_cards), continue_buy_phase, player, game)
+
+    def choose(
+        self,
+        options: list[Card|None],
+        continuation: TurnContinuation,
+        player: Player,
+        game: "Game",
+    ) -> Card|None:
+        """
+        Play out each option and return the option with the highest average result.
+
+        """
+        if len(options) == 1:
+            return options[0]
+
+        deadline = None if self.time_limit is None else time.monotonic() + self.time_limit
+        parallel = self.pool is not None or self.processes > 1
+        if parallel and not multiprocessing.current_process().daemon:
+            totals, counts = self._play_out_parallel(options, continuation, player, game, deadline)
+        else:
+            totals, counts = self._play_out(options, continuation, player, game, deadline)
+
+        best = max(range(len(options)), key=lambda i: totals[i] / counts[i])
+        return options[best]
+
+    def _play_out(
+        self,
+        options: list[Card|None],
+        continuation: TurnContinuation,
+        player: Player,
+        game: "Game",
+        deadline: float|None,
+    ) -> tuple[list[float], list[int]]:
+        totals = [0.0] * len(options)
+        counts = [0] * len(options)
+
+        # options are played out in rounds, so all options have about the same
+        # number of playouts when the time runs out. all options of a round are
+        # played out with the same seed, which makes their results comparable
+        for playout_round in range(self.rollouts):
+            seed = self.rng.getrandbits(64)
+            for i, option in enumerate(options):
+                if playout_round > 0 and deadline is not None and time.monotonic() >= deadline:
+                    return totals, counts
+                totals[i] += play_out(
+                    game, player, option, continuation, self.policy, seed, self.max_turns
+                )
+                counts[i] += 1
+
+        return totals, counts
+
+    def _play_out_parallel(
+        self,
+        options: list[Card|None],
+        continuation: TurnContinuation,
+        player: Player,
+        game: "Game",
+        deadline: float|None,
+    ) -> tuple[list[float], list[int]]:
+        totals = [0.0] * len(options)
+        counts = [0] * len(options)
+
+        # the players of the copy sent to the workers all use the policy, so
+        # the deciders of the game do not need to be pickled
+        clone = game.clone()
+        for clone_player in clone.players:
+            clone_player.decider = self.policy
+        clone_player = clone.players[game.players.index(player)]
+        data = pickle.dumps((clone, clone_player, options, continuation, self.policy, self.max_turns))
+
+        # split the playouts of each option into a task per process.
+        # the tasks of all options share seeds like the rounds of _play_out
+        num_tasks = min(self.processes, self.rollouts)
+        seeds = [self.rng.getrandbits(64) for _ in range(num_tasks)]
+        tasks: list[tuple[bytes, int, int, int, float|None]] = []
+        for i in range(len(options)):
+            for t in range(num_tasks):
+                count = self.rollouts // num_tasks + (1 if t < self.rollouts % num_tasks else 0)
+                tasks.append((data, i, count, seeds[t], deadline))
+
+        for i, total, count in self._get_pool().imap_unordered(_run_rollouts, tasks):
+            totals[i] += total
+            counts[i] += count
+
+        return totals, counts
+
+
+class RolloutBot(OptimizedBot):
+    """
+    Bot that plays out its options to decide what to play and buy.
+
+    """
+
+    def __init__(
+        self,
+        decider: RolloutBotDecider|None = None,
+        player_id: str = "rollout_bot",
+    ):
+        decider = decider if decider else RolloutBotDecider()
+        super().__init__(decider=decider, player_id=player_id)
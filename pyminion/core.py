@@ -1,7 +1,9 @@
 from collections import Counter
 from enum import Enum, unique
+import hashlib
 import logging
 import random
+import sys
 from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
 
 from pyminion.exceptions import EmptyPile, InsufficientActions, PileNotFound
@@ -13,6 +15,19 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger()
 
+# hash keys are 64 bit
+KEY_MASK = (1 << 64) - 1
+
+
+def get_name_key(name: str) -> int:
+    """
+    Random looking 64 bit key of a name, such as the name of a card, used to
+    hash game state. The key only depends on the name, so it is the same in
+    every process.
+
+    """
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), "little")
+
 
 class Cost:
     """
@@ -133,6 +148,7 @@ class Card:
 
     def __init__(self, name: str, cost: int|Cost, type: tuple[CardType, ...]):
         self.name = name
+        self.hash_key = get_name_key(name)
         if isinstance(cost, int):
             self._base_cost = Cost(cost)
         else:
@@ -142,6 +158,23 @@ class Card:
     def __repr__(self):
         return f"{self.name}"
 
+    def __reduce_ex__(self, protocol):
+        # Cards are module level singletons that are compared by identity,
+        # so pickle them by reference to keep identity in other processes
+        module = sys.modules.get(type(self).__module__)
+        if module is not None:
+            for name, obj in vars(module).items():
+                if obj is self:
+                    return name
+        return super().__reduce_ex__(protocol)
+
+    def __copy__(self) -> "Card":
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "Card":
+        # copies of the game state share the card singletons
+        return self
+
     @property
     def base_cost(self) -> Cost:
         return self._base_cost
@@ -222,7 +255,8 @@ class Action(Card):
         Specific play method unique to each action card
 
         """
-        logger.info(f"{player} plays {self}")
+        if not game.headless:
+            logger.info(f"{player} plays {self}")
 
         if generic_play:
             self.generic_play(player)
@@ -304,23 +338,77 @@ class AbstractDeck:
     def __repr__(self):
         return str(DeckCounter(self.cards))
 
+    def __getstate__(self) -> dict[str, Any]:
+        # callbacks are bound to a specific game in Game.start and are not picklable
+        state = self.__dict__.copy()
+        state["on_add"] = None
+        state["on_remove"] = None
+        return state
+
     def __len__(self) -> int:
         return len(self.cards)
 
     def __iter__(self) -> Iterator[Card]:
         return iter(self.cards)
 
+    def copy(self) -> "AbstractDeck":
+        """
+        Returns a copy of the zone holding the same cards.
+        Callbacks are not copied since they are bound to a specific game.
+
+        """
+        zone = object.__new__(type(self))
+        zone.__dict__ = self.__dict__.copy()
+        zone._unshare_cards()
+        zone.on_add = None
+        zone.on_remove = None
+        return zone
+
+    def _unshare_cards(self) -> None:
+        # a fresh copy shares its card list with the original until this is called
+        self.cards = self.cards[:]
+
+    def __contains__(self, card: Card) -> bool:
+        return card in self.cards
+
+    def count(self, card: Card) -> int:
+        return self.cards.count(card)
+
+    def get_key(self) -> int:
+        """
+        64 bit hash of the cards in the zone, regardless of their order.
+        The key is the sum of the hash keys of the cards, so zones holding
+        the same cards have the same key.
+
+        """
+        return sum(card.hash_key for card in self.cards) & KEY_MASK
+
     def add(self, card: Card) -> None:
         self.cards.append(card)
         if self.on_add is not None:
             self.on_add(card)
 
+    def insert(self, index: int, card: Card) -> None:
+        self.cards.insert(index, card)
+        if self.on_add is not None:
+            self.on_add(card)
+
     def remove(self, card: Card) -> Card:
         self.cards.remove(card)
         if self.on_remove is not None:
             self.on_remove(card)
         return card
 
+    def pop(self) -> Card:
+        """
+        Remove the last card.
+
+        """
+        card = self.cards.pop()
+        if self.on_remove is not None:
+            self.on_remove(card)
+        return card
+
     def move_to(self, destination: "AbstractDeck") -> None:
         if destination.on_add is None and self.on_remove is None:
             destination.cards += self.cards
@@ -346,9 +434,22 @@ class Deck(AbstractDeck):
             on_add: Callable[[Card], None]|None = None,
             on_remove: Callable[[Card], None]|None = None,
             on_shuffle: Callable[[], None]|None = None,
+            rng: random.Random|None = None,
     ):
         super().__init__(cards, on_add, on_remove)
         self.on_shuffle = on_shuffle
+        self.rng = rng
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = super().__getstate__()
+        state["on_shuffle"] = None
+        return state
+
+    def copy(self) -> "Deck":
+        deck = super().copy()
+        assert isinstance(deck, Deck)
+        deck.on_shuffle = None
+        return deck
 
     def draw(self) -> Card:
         drawn_card = self.cards.pop()
@@ -357,7 +458,10 @@ class Deck(AbstractDeck):
         return drawn_card
 
     def shuffle(self) -> None:
-        random.shuffle(self.cards)
+        if self.rng is None:
+            random.shuffle(self.cards)
+        else:
+            self.rng.shuffle(self.cards)
         if self.on_shuffle is not None:
             self.on_shuffle()
 
@@ -377,6 +481,103 @@ class Hand(AbstractDeck):
         super().__init__(cards, on_add, on_remove)
 
 
+class CountedZone:
+    """
+    Mixin that keeps a count of each card in a zone next to its list of cards,
+    so membership tests and card counts are O(1).
+
+    The list of cards keeps the order of the zone. Counted zones must only be
+    changed through their methods or by assigning a new list to cards.
+
+    The key of the zone (see AbstractDeck.get_key) is updated along with the
+    counts, so getting it is O(1).
+
+    """
+
+    _cards: list[Card]
+    counts: Counter[Card]
+    on_add: Callable[[Card], None]|None
+    on_remove: Callable[[Card], None]|None
+
+    # sum of the hash keys of the cards, masked when the key is read
+    _key_sum: int
+
+    @property
+    def cards(self) -> list[Card]:
+        return self._cards
+
+    @cards.setter
+    def cards(self, cards: list[Card]) -> None:
+        self._cards = cards
+        self.counts = Counter(cards)
+        self._key_sum = sum(card.hash_key for card in cards)
+
+    def __contains__(self, card: Card) -> bool:
+        return card in self.counts
+
+    def _unshare_cards(self) -> None:
+        # copying the counts is cheaper than counting the cards again
+        self._cards = self._cards[:]
+        self.counts = self.counts.copy()
+
+    def count(self, card: Card) -> int:
+        return self.counts[card]
+
+    def get_key(self) -> int:
+        return self._key_sum & KEY_MASK
+
+    def _count_removed(self, card: Card) -> None:
+        self._key_sum -= card.hash_key
+        count = self.counts[card]
+        if count == 1:
+            del self.counts[card]
+        else:
+            self.counts[card] = count - 1
+
+    def add(self, card: Card) -> None:
+        self._cards.append(card)
+        self.counts[card] += 1
+        self._key_sum += card.hash_key
+        if self.on_add is not None:
+            self.on_add(card)
+
+    def insert(self, index: int, card: Card) -> None:
+        self._cards.insert(index, card)
+        self.counts[card] += 1
+        self._key_sum += card.hash_key
+        if self.on_add is not None:
+            self.on_add(card)
+
+    def remove(self, card: Card) -> Card:
+        if card not in self.counts:
+            raise ValueError(f"{card} is not in {type(self).__name__}")
+        self._cards.remove(card)
+        self._count_removed(card)
+        if self.on_remove is not None:
+            self.on_remove(card)
+        return card
+
+    def pop(self) -> Card:
+        card = self._cards.pop()
+        self._count_removed(card)
+        if self.on_remove is not None:
+            self.on_remove(card)
+        return card
+
+
+class CountedDeck(CountedZone, Deck):
+    def draw(self) -> Card:
+        return self.pop()
+
+
+class CountedDiscardPile(CountedZone, DiscardPile):
+    pass
+
+
+class CountedHand(CountedZone, Hand):
+    pass
+
+
 class Pile(AbstractDeck):
     def __init__(self, cards: list[Card]):
         super().__init__(cards)
@@ -391,11 +592,22 @@ class Pile(AbstractDeck):
                 all_names.add(name)
 
         self.name = "/".join(unique_names)
+        self.card_names = unique_names
+
+        # set when the pile is added to a supply, which is notified when the pile empties or refills
+        self.supply: Supply|None = None
+
+    def add(self, card: Card) -> None:
+        super().add(card)
+        if len(self.cards) == 1 and self.supply is not None:
+            self.supply.on_pile_refilled(self)
 
     def remove(self, card: Card) -> Card:
         if len(self.cards) < 1:
             raise EmptyPile(f"{self.name} pile is empty, cannot gain card")
         super().remove(card)
+        if len(self.cards) == 0 and self.supply is not None:
+            self.supply.on_pile_emptied(self)
         return card
 
 
@@ -413,6 +625,9 @@ class Supply:
     """
     Collection of card piles that make up the game's supply.
 
+    Attributes:
+        end_pile_names: Names of the piles that end the game as soon as they are empty.
+
     """
 
     def __init__(
@@ -420,12 +635,27 @@ class Supply:
             basic_score_piles: list[Pile],
             basic_treasure_piles: list[Pile],
             kingdom_piles: list[Pile],
+            end_pile_names: Iterable[str] = ("Province",),
     ):
         self.basic_score_piles = basic_score_piles
         self.basic_treasure_piles = basic_treasure_piles
         self.kingdom_piles = kingdom_piles
         self.piles = basic_score_piles + basic_treasure_piles + kingdom_piles
 
+        # index piles by their name and by the name of each card in them,
+        # so cards of split piles find their pile
+        self.pile_index: dict[str, Pile] = {}
+        self.end_pile_names = set(end_pile_names)
+        self.empty_piles = 0
+        self.empty_end_piles = 0
+        for pile in self.piles:
+            pile.supply = self
+            self.pile_index[pile.name] = pile
+            for name in pile.card_names:
+                self.pile_index[name] = pile
+            if len(pile) == 0:
+                self.on_pile_emptied(pile)
+
     def __repr__(self):
         return str(self.available_cards())
 
@@ -453,15 +683,47 @@ class Supply:
         s += "  ".join(f'{self._get_pile_str(pile, max_len, player, game)}' for pile in kingdom_bottom) + "\n"
         return s
 
-    def get_pile(self, pile_name: str) -> Pile:
+    def copy(self) -> "Supply":
         """
-        Get a pile by name.
+        Returns a copy of the supply with copies of all its piles.
 
         """
+        supply = object.__new__(Supply)
+        supply.__dict__.update(self.__dict__)
+
+        pile_copies: dict[int, Pile] = {}
         for pile in self.piles:
-            if pile.name == pile_name:
-                return pile
-        raise PileNotFound(f"{pile_name} pile is not valid")
+            pile_copy = pile.copy()
+            assert isinstance(pile_copy, Pile)
+            pile_copy.supply = supply
+            pile_copies[id(pile)] = pile_copy
+
+        supply.basic_score_piles = [pile_copies[id(pile)] for pile in self.basic_score_piles]
+        supply.basic_treasure_piles = [pile_copies[id(pile)] for pile in self.basic_treasure_piles]
+        supply.kingdom_piles = [pile_copies[id(pile)] for pile in self.kingdom_piles]
+        supply.piles = [pile_copies[id(pile)] for pile in self.piles]
+        supply.pile_index = {name: pile_copies[id(pile)] for name, pile in self.pile_index.items()}
+        return supply
+
+    def on_pile_emptied(self, pile: Pile) -> None:
+        self.empty_piles += 1
+        if pile.name in self.end_pile_names:
+            self.empty_end_piles += 1
+
+    def on_pile_refilled(self, pile: Pile) -> None:
+        self.empty_piles -= 1
+        if pile.name in self.end_pile_names:
+            self.empty_end_piles -= 1
+
+    def get_pile(self, pile_name: str) -> Pile:
+        """
+        Get a pile by name or by the name of a card in the pile.
+
+        """
+        pile = self.pile_index.get(pile_name)
+        if pile is None:
+            raise PileNotFound(f"{pile_name} pile is not valid")
+        return pile
 
     def gain_card(self, card: Card) -> Card:
         """
@@ -496,11 +758,14 @@ class Supply:
         Returns the number of empty piles in the supply.
 
         """
-        empty_piles: int = 0
-        for pile in self.piles:
-            if len(pile) == 0:
-                empty_piles += 1
-        return empty_piles
+        return self.empty_piles
+
+    def num_empty_end_piles(self) -> int:
+        """
+        Returns the number of empty piles in the supply that end the game when empty.
+
+        """
+        return self.empty_end_piles
 
     def pile_length(self, pile_name: str) -> int:
         """
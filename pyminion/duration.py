@@ -62,6 +62,9 @@ class BasicNextTurnEffect(PlayerGameEffect):
         else:
             return EffectAction.Other
 
+    def get_player(self) -> Player|None:
+        return self.player
+
     def is_triggered(self, player: Player, game: "Game") -> bool:
         return player is self.player
 
@@ -105,6 +108,9 @@ class RemovePersistentCardsEffect(PlayerGameEffect):
     def get_action(self) -> EffectAction:
         return EffectAction.First
 
+    def get_player(self) -> Player|None:
+        return self.player
+
     def is_triggered(self, player: Player, game: "Game") -> bool:
         return player is self.player
 
@@ -126,6 +132,9 @@ class GetSetAsideCardEffect(PlayerGameEffect):
     def get_action(self) -> EffectAction:
         return EffectAction.HandAddCards
 
+    def get_player(self) -> Player|None:
+        return self.player
+
     def is_triggered(self, player: Player, game: "Game") -> bool:
         return player is self.player
 
@@ -134,10 +143,11 @@ class GetSetAsideCardEffect(PlayerGameEffect):
             player.set_aside.remove(card)
             player.hand.add(card)
 
-        if len(self.cards) == 1:
-            logger.info(f"{player} puts card in hand: {self.cards[0]}")
-        else:
-            logger.info(f"{player} puts cards in hand: {self.cards}")
+        if not game.headless:
+            if len(self.cards) == 1:
+                logger.info(f"{player} puts card in hand: {self.cards[0]}")
+            else:
+                logger.info(f"{player} puts cards in hand: {self.cards}")
 
         game.effect_registry.unregister_turn_start_effect(self.get_id())
 
@@ -1,10 +1,15 @@
+import copy
+import importlib
+import marshal
 from enum import IntEnum, unique
-from typing import TYPE_CHECKING, Callable, Sequence
+from types import CellType, FunctionType
+from typing import TYPE_CHECKING, Any, Callable, Generic, Sequence, TypeVar
 
 if TYPE_CHECKING:
     from pyminion.core import AbstractDeck, Card
     from pyminion.game import Game
     from pyminion.player import Player
+    from pyminion.replay import GameRecorder
 
 
 PlayerGameEffectHandler = Callable[["Player", "Game"], None]
@@ -24,18 +29,18 @@ class EffectAction(IntEnum):
 
 
 class Effect:
-    _next_id = 0
-
-    @staticmethod
-    def reset_id() -> None:
-        Effect._next_id = 0
-
     def __init__(self, name: str):
-        self._id = Effect._next_id
-        Effect._next_id += 1
+        # assigned by the effect registry the effect is first registered with
+        self._id: int|None = None
         self._name = name
 
     def get_id(self) -> int:
+        """
+        The id of the effect, which is unique within its game. Effects get
+        their id when they are first registered.
+
+        """
+        assert self._id is not None, f"Effect {self._name} is not registered"
         return self._id
 
     def get_name(self) -> str:
@@ -44,6 +49,129 @@ class Effect:
     def get_action(self) -> EffectAction:
         raise NotImplementedError("Effect get_action is not implemented")
 
+    def get_player(self) -> "Player|None":
+        """
+        The only player this effect can be triggered for, or None if it can be
+        triggered for any player. For attack effects this is the defending player.
+        The effect registry only dispatches events of this player to the effect.
+
+        """
+        return None
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "Effect":
+        # effects made from functions keep their state in closures, which
+        # copy.deepcopy would share with the original
+        effect = object.__new__(type(self))
+        memo[id(self)] = effect
+        state = effect.__dict__
+        for name, value in vars(self).items():
+            value_type = type(value)
+            if value_type in _IMMUTABLE_TYPES:
+                state[name] = value
+            elif value_type is FunctionType:
+                state[name] = _copy_function(value, memo)
+            else:
+                state[name] = copy.deepcopy(value, memo)
+        return effect
+
+    def __getstate__(self) -> dict[str, Any]:
+        # functions made inside cards cannot be pickled by name, so they are
+        # pickled along with their code. This lets games in progress be sent
+        # to other processes of the same python version.
+        return {
+            name: _PickledFunction(value) if type(value) is FunctionType else value
+            for name, value in vars(self).items()
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        # copy.copy passes the state on without pickling it
+        for name, value in state.items():
+            self.__dict__[name] = value.func if type(value) is _PickledFunction else value
+
+
+_IMMUTABLE_TYPES = frozenset((type(None), bool, int, str, EffectAction))
+
+
+def _copy_function(func: FunctionType, memo: dict[int, Any]) -> FunctionType:
+    """
+    Copy a function along with the variables it closes over.
+
+    """
+    if func.__closure__ is None:
+        return func
+    if id(func) in memo:
+        return memo[id(func)]
+
+    cells = []
+    for cell in func.__closure__:
+        try:
+            contents = cell.cell_contents
+        except ValueError:
+            # the variable is not assigned yet
+            cells.append(CellType())
+            continue
+        if isinstance(contents, FunctionType):
+            cells.append(CellType(_copy_function(contents, memo)))
+        else:
+            cells.append(CellType(copy.deepcopy(contents, memo)))
+
+    func_copy = FunctionType(func.__code__, func.__globals__, func.__name__, func.__defaults__, tuple(cells))
+    func_copy.__kwdefaults__ = func.__kwdefaults__
+    memo[id(func)] = func_copy
+    return func_copy
+
+
+class _EmptyCell:
+    """
+    Marks a variable of a pickled function that is not assigned yet.
+
+    """
+
+
+class _PickledFunction:
+    """
+    Pickles a function by its code and the variables it closes over.
+
+    """
+
+    def __init__(self, func: FunctionType):
+        self.func = func
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        func = self.func
+        cells: list[Any] = []
+        for cell in func.__closure__ or ():
+            try:
+                contents = cell.cell_contents
+            except ValueError:
+                cells.append(_EmptyCell)
+                continue
+            cells.append(_PickledFunction(contents) if type(contents) is FunctionType else contents)
+        return _load_function, (
+            marshal.dumps(func.__code__),
+            func.__module__,
+            func.__name__,
+            func.__defaults__,
+            func.__kwdefaults__,
+            cells,
+        )
+
+
+def _load_function(
+    code: bytes,
+    module: str,
+    name: str,
+    defaults: tuple[Any, ...]|None,
+    kwdefaults: dict[str, Any]|None,
+    cells: list[Any],
+) -> FunctionType:
+    closure = tuple(CellType() if contents is _EmptyCell else CellType(contents) for contents in cells)
+    func = FunctionType(
+        marshal.loads(code), importlib.import_module(module).__dict__, name, defaults, closure or None
+    )
+    func.__kwdefaults__ = kwdefaults
+    return func
+
 
 class PlayerGameEffect(Effect):
     def __init__(self, name: str):
@@ -63,10 +191,12 @@ class FuncPlayerGameEffect(PlayerGameEffect):
         action: EffectAction,
         handler_func: PlayerGameEffectHandler,
         is_triggered_func: PlayerGameEffectTriggerHandler | None = None,
+        player: "Player|None" = None,
     ):
         super().__init__(name)
         self._action = action
         self.handler_func = handler_func
+        self.player = player
 
         self.is_triggered_func: PlayerGameEffectTriggerHandler
         if is_triggered_func is None:
@@ -77,7 +207,12 @@ class FuncPlayerGameEffect(PlayerGameEffect):
     def get_action(self) -> EffectAction:
         return self._action
 
+    def get_player(self) -> "Player|None":
+        return self.player
+
     def is_triggered(self, player: "Player", game: "Game") -> bool:
+        if self.player is not None and player is not self.player:
+            return False
         return self.is_triggered_func(player, game)
 
     def handler(self, player: "Player", game: "Game") -> None:
@@ -104,10 +239,12 @@ class FuncPlayerCardGameEffect(PlayerCardGameEffect):
         action: EffectAction,
         handler_func: PlayerCardGameEffectHandler,
         is_triggered_func: PlayerCardGameEffectTriggerHandler | None = None,
+        player: "Player|None" = None,
     ):
         super().__init__(name)
         self._action = action
         self.handler_func = handler_func
+        self.player = player
 
         self.is_triggered_func: PlayerCardGameEffectTriggerHandler
         if is_triggered_func is None:
@@ -118,7 +255,12 @@ class FuncPlayerCardGameEffect(PlayerCardGameEffect):
     def get_action(self) -> EffectAction:
         return self._action
 
+    def get_player(self) -> "Player|None":
+        return self.player
+
     def is_triggered(self, player: "Player", card: "Card", game: "Game") -> bool:
+        if self.player is not None and player is not self.player:
+            return False
         return self.is_triggered_func(player, card, game)
 
     def handler(self, player: "Player", card: "Card", game: "Game") -> None:
@@ -163,6 +305,184 @@ class AttackEffect(Effect):
         raise NotImplementedError("AttackEffect handler is not implemented")
 
 
+E = TypeVar("E", bound=Effect)
+
+
+# order in which effects are resolved, by the action they perform. Effects
+# that add or remove cards from the hand share a group and may have to be
+# ordered by the player.
+_FIRST_GROUP = 0
+_OTHER_GROUP = 1
+_ORDER_GROUP = 2
+_LAST_GROUP = 3
+_ACTION_GROUPS = {
+    EffectAction.First: _FIRST_GROUP,
+    EffectAction.Other: _OTHER_GROUP,
+    EffectAction.HandAddCards: _ORDER_GROUP,
+    EffectAction.HandRemoveCards: _ORDER_GROUP,
+    EffectAction.HandAddRemoveCards: _ORDER_GROUP,
+    EffectAction.Last: _LAST_GROUP,
+}
+_NUM_GROUPS = 4
+_FIRST_MASK = 1 << _FIRST_GROUP
+_OTHER_MASK = 1 << _OTHER_GROUP
+_ORDER_MASK = 1 << _ORDER_GROUP
+_LAST_MASK = 1 << _LAST_GROUP
+
+
+class EffectIndex(Generic[E]):
+    """
+    The effects registered for one type of event.
+
+    Besides the list of effects in registration order, effects are bucketed by
+    the player they can be triggered for (see Effect.get_player) and by the
+    group of their action, so dispatching an event only visits effects that
+    could be triggered for the player.
+
+    """
+
+    def __init__(self):
+        self.effects: list[E] = []
+        self._buckets: dict["Player|None", list[list[E]]] = {}
+        self._group_masks: dict["Player|None", int] = {}
+        self._order: dict[E, int] = {}
+        self._next_order = 0
+
+    def __len__(self) -> int:
+        return len(self.effects)
+
+    def add(self, effect: E) -> None:
+        self.effects.append(effect)
+        self._order[effect] = self._next_order
+        self._next_order += 1
+
+        player = effect.get_player()
+        buckets = self._buckets.get(player)
+        if buckets is None:
+            buckets = [[] for _ in range(_NUM_GROUPS)]
+            self._buckets[player] = buckets
+            self._group_masks[player] = 0
+        group = _ACTION_GROUPS[effect.get_action()]
+        buckets[group].append(effect)
+        self._group_masks[player] |= 1 << group
+
+    def remove(self, id: int) -> None:
+        for i, effect in enumerate(self.effects):
+            if effect.get_id() == id:
+                self.effects.pop(i)
+                break
+        else:
+            return
+
+        del self._order[effect]
+        player = effect.get_player()
+        buckets = self._buckets[player]
+        group = _ACTION_GROUPS[effect.get_action()]
+        bucket = buckets[group]
+        for i, bucket_effect in enumerate(bucket):
+            if bucket_effect is effect:
+                bucket.pop(i)
+                break
+        if not bucket:
+            self._group_masks[player] &= ~(1 << group)
+        if not any(buckets):
+            del self._buckets[player]
+            del self._group_masks[player]
+
+    def clear(self) -> None:
+        self.effects.clear()
+        self._buckets.clear()
+        self._group_masks.clear()
+        self._order.clear()
+        self._next_order = 0
+
+    def has_candidates(self, player: "Player") -> bool:
+        """
+        Returns True if any effect could be triggered for the player.
+
+        """
+        return None in self._buckets or player in self._buckets
+
+    def get_group_mask(self, player: "Player") -> int:
+        """
+        Returns a bit mask of the action groups that have effects which could
+        be triggered for the player. Bit n is set for group n.
+
+        """
+        return self._group_masks.get(None, 0) | self._group_masks.get(player, 0)
+
+    def find_triggered(
+        self,
+        player: "Player",
+        group: int,
+        handled: set[Effect],
+        args: tuple,
+        out: list[Effect]|None = None,
+    ) -> E|None:
+        """
+        Find the first effect in an action group, in registration order, that
+        is triggered with args and was not handled yet. If out is given, all
+        such effects are appended to it instead and None is returned.
+
+        """
+        shared_buckets = self._buckets.get(None)
+        player_buckets = self._buckets.get(player)
+        shared = shared_buckets[group] if shared_buckets is not None else _NO_EFFECTS
+        own = player_buckets[group] if player_buckets is not None else _NO_EFFECTS
+
+        if not own or not shared:
+            effects = own or shared
+            if out is None and not handled:
+                # the common first lookup of an event. Spelled out per event signature
+                # because calling with *args builds a new argument tuple for every effect
+                if len(args) == 4:
+                    a0, a1, a2, a3 = args
+                    for effect in effects:
+                        if effect.is_triggered(a0, a1, a2, a3):
+                            return effect
+                elif len(args) == 3:
+                    a0, a1, a2 = args
+                    for effect in effects:
+                        if effect.is_triggered(a0, a1, a2):
+                            return effect
+                else:
+                    a0, a1 = args
+                    for effect in effects:
+                        if effect.is_triggered(a0, a1):
+                            return effect
+                return None
+
+            for effect in effects:
+                if effect not in handled and effect.is_triggered(*args):
+                    if out is None:
+                        return effect
+                    out.append(effect)
+            return None
+
+        # walk both buckets merged by registration order, without building the merged list
+        i = 0
+        j = 0
+        num_shared = len(shared)
+        num_own = len(own)
+        while i < num_shared or j < num_own:
+            if j == num_own or (i < num_shared and self._order[shared[i]] < self._order[own[j]]):
+                effect = shared[i]
+                i += 1
+            else:
+                effect = own[j]
+                j += 1
+
+            if effect not in handled and effect.is_triggered(*args):
+                if out is None:
+                    return effect
+                out.append(effect)
+
+        return None
+
+
+_NO_EFFECTS: list = []
+
+
 class EffectRegistry:
     """
     Registry for effects to be triggered on various game events.
@@ -170,42 +490,84 @@ class EffectRegistry:
     """
 
     def __init__(self):
-        self.attack_effects: list[AttackEffect] = []
-        self.buy_effects: list[PlayerCardGameDeckEffect] = []
-        self.discard_effects: list[PlayerCardGameDeckEffect] = []
-        self.gain_effects: list[PlayerCardGameDeckEffect] = []
-        self.hand_add_effects: list[PlayerCardGameEffect] = []
-        self.hand_remove_effects: list[PlayerCardGameEffect] = []
-        self.play_effects: list[PlayerCardGameEffect] = []
-        self.reveal_effects: list[PlayerCardGameEffect] = []
-        self.shuffle_effects: list[PlayerGameEffect] = []
-        self.trash_effects: list[PlayerCardGameEffect] = []
-        self.turn_start_effects: list[PlayerGameEffect] = []
-        self.turn_end_effects: list[PlayerGameEffect] = []
-        self.buy_phase_end_effects: list[PlayerGameEffect] = []
-        self.cleanup_phase_start_effects: list[PlayerGameEffect] = []
+        self._attack_index: EffectIndex[AttackEffect] = EffectIndex()
+        self._buy_index: EffectIndex[PlayerCardGameDeckEffect] = EffectIndex()
+        self._discard_index: EffectIndex[PlayerCardGameDeckEffect] = EffectIndex()
+        self._gain_index: EffectIndex[PlayerCardGameDeckEffect] = EffectIndex()
+        self._hand_add_index: EffectIndex[PlayerCardGameEffect] = EffectIndex()
+        self._hand_remove_index: EffectIndex[PlayerCardGameEffect] = EffectIndex()
+        self._play_index: EffectIndex[PlayerCardGameEffect] = EffectIndex()
+        self._reveal_index: EffectIndex[PlayerCardGameEffect] = EffectIndex()
+        self._shuffle_index: EffectIndex[PlayerGameEffect] = EffectIndex()
+        self._trash_index: EffectIndex[PlayerCardGameEffect] = EffectIndex()
+        self._turn_start_index: EffectIndex[PlayerGameEffect] = EffectIndex()
+        self._turn_end_index: EffectIndex[PlayerGameEffect] = EffectIndex()
+        self._buy_phase_end_index: EffectIndex[PlayerGameEffect] = EffectIndex()
+        self._cleanup_phase_start_index: EffectIndex[PlayerGameEffect] = EffectIndex()
+
+        # scratch buffers of _handle_effects, one per level of nested events
+        self._handled_stack: list[set[Effect]] = []
+        self._order_stack: list[list[Effect]] = []
+        self._depth = 0
+
+        # records the events of the game if set
+        self.recorder: GameRecorder|None = None
+
+        # id of the next registered effect, kept across resets so effects
+        # from an earlier game never share an id with new ones
+        self._next_id = 0
+
+        # registered effects in registration order
+        self.attack_effects = self._attack_index.effects
+        self.buy_effects = self._buy_index.effects
+        self.discard_effects = self._discard_index.effects
+        self.gain_effects = self._gain_index.effects
+        self.hand_add_effects = self._hand_add_index.effects
+        self.hand_remove_effects = self._hand_remove_index.effects
+        self.play_effects = self._play_index.effects
+        self.reveal_effects = self._reveal_index.effects
+        self.shuffle_effects = self._shuffle_index.effects
+        self.trash_effects = self._trash_index.effects
+        self.turn_start_effects = self._turn_start_index.effects
+        self.turn_end_effects = self._turn_end_index.effects
+        self.buy_phase_end_effects = self._buy_phase_end_index.effects
+        self.cleanup_phase_start_effects = self._cleanup_phase_start_index.effects
 
     def reset(self) -> None:
         """
         Reset the registry for a new game.
 
         """
-        Effect.reset_id()
-
-        self.attack_effects.clear()
-        self.buy_effects.clear()
-        self.discard_effects.clear()
-        self.gain_effects.clear()
-        self.hand_add_effects.clear()
-        self.hand_remove_effects.clear()
-        self.play_effects.clear()
-        self.reveal_effects.clear()
-        self.shuffle_effects.clear()
-        self.trash_effects.clear()
-        self.turn_start_effects.clear()
-        self.turn_end_effects.clear()
-        self.buy_phase_end_effects.clear()
-        self.cleanup_phase_start_effects.clear()
+        self._attack_index.clear()
+        self._buy_index.clear()
+        self._discard_index.clear()
+        self._gain_index.clear()
+        self._hand_add_index.clear()
+        self._hand_remove_index.clear()
+        self._play_index.clear()
+        self._reveal_index.clear()
+        self._shuffle_index.clear()
+        self._trash_index.clear()
+        self._turn_start_index.clear()
+        self._turn_end_index.clear()
+        self._buy_phase_end_index.clear()
+        self._cleanup_phase_start_index.clear()
+
+    def clone(self, memo: dict[int, Any]) -> "EffectRegistry":
+        """
+        Returns a copy of the registry holding deep copies of the registered effects.
+        memo is passed on to copy.deepcopy, so it can map the objects effects refer to,
+        like players, to their copies. Effects keep their ids.
+
+        """
+        registry = EffectRegistry()
+        registry._next_id = self._next_id
+        for name, index in vars(self).items():
+            if isinstance(index, EffectIndex):
+                registry_index = getattr(registry, name)
+                for effect in index.effects:
+                    registry_index.add(copy.deepcopy(effect, memo))
+        return registry
 
     def _need_player_order(self, effects: Sequence[Effect]) -> bool:
         # if there is only one effect left, no need to prompt player
@@ -230,588 +592,434 @@ class EffectRegistry:
 
         return False
 
-    def _handle_player_game_effects(
+    def _handle_effects(
         self,
-        effects: list[PlayerGameEffect],
+        index: EffectIndex,
         player: "Player",
         game: "Game",
-    ) -> None:
-        if len(effects) == 0:
-            return
-
-        handled_ids: set[int] = set()
-
-        # one effect may change others, so after handling each effect we need to
-        # reevaluate which other effects need to be handled
-        effect_ids = set(e.get_id() for e in effects if e.is_triggered(player, game))
-        while not effect_ids.issubset(handled_ids):
-            handled_effect = False
-
-            # handle effects that happen before others
-            for effect in effects:
-                if effect.get_id() not in handled_ids and effect.get_action() == EffectAction.First and effect.is_triggered(player, game):
-                    effect.handler(player, game)
-                    handled_ids.add(effect.get_id())
-                    handled_effect = True
-                    break
-
-            # handle all effects where order doesn't matter
-            if not handled_effect:
-                for effect in effects:
-                    if effect.get_id() not in handled_ids and effect.get_action() == EffectAction.Other and effect.is_triggered(player, game):
-                        effect.handler(player, game)
-                        handled_ids.add(effect.get_id())
-                        handled_effect = True
-                        break
-
-            # if there were no "other" effects to handle, check if there were non-"other" effects
-            if not handled_effect:
-                # build data structures of non-"other" effects that are triggered
-                order_effects: list[PlayerGameEffect] = [
-                    effect for effect in effects
-                    if effect.get_id() not in handled_ids and effect.get_action() in {EffectAction.HandAddCards, EffectAction.HandRemoveCards, EffectAction.HandAddRemoveCards} and effect.is_triggered(player, game)
-                ]
-
-                if len(order_effects) > 0:
-                    if self._need_player_order(order_effects):
-                        # ask user to specify next effect to execute
-                        effect_index = player.decider.effects_order_decision(
-                            order_effects,
-                            player,
-                            game,
-                        )
-                    else:
-                        effect_index = 0
-
-                    effect = order_effects[effect_index]
-                    effect.handler(player, game)
-                    handled_ids.add(effect.get_id())
-                    handled_effect = True
-
-            # handle effects that happen after others
-            if not handled_effect:
-                for effect in effects:
-                    if effect.get_id() not in handled_ids and effect.get_action() == EffectAction.Last and effect.is_triggered(player, game):
-                        effect.handler(player, game)
-                        handled_ids.add(effect.get_id())
-                        handled_effect = True
-                        break
-
-            # reevaluate which effects need to be handled
-            effect_ids = set(e.get_id() for e in effects if e.is_triggered(player, game))
-
-    def _handle_player_card_game_effects(
-        self,
-        effects: list[PlayerCardGameEffect],
-        player: "Player",
-        card: "Card",
-        game: "Game",
-    ) -> None:
-        if len(effects) == 0:
-            return
-
-        handled_ids: set[int] = set()
-
-        # one effect may change others, so after handling each effect we need to
-        # reevaluate which other effects need to be handled
-        effect_ids = set(e.get_id() for e in effects if e.is_triggered(player, card, game))
-        while not effect_ids.issubset(handled_ids):
-            handled_effect = False
-
-            # handle effects that happen before others
-            for effect in effects:
-                if effect.get_id() not in handled_ids and effect.get_action() == EffectAction.First and effect.is_triggered(player, card, game):
-                    effect.handler(player, card, game)
-                    handled_ids.add(effect.get_id())
-                    handled_effect = True
-                    break
-
-            # handle all effects where order doesn't matter
-            if not handled_effect:
-                for effect in effects:
-                    if effect.get_id() not in handled_ids and effect.get_action() == EffectAction.Other and effect.is_triggered(player, card, game):
-                        effect.handler(player, card, game)
-                        handled_ids.add(effect.get_id())
-                        handled_effect = True
-                        break
-
-            # if there were no "other" effects to handle, check if there were non-"other" effects
-            if not handled_effect:
-                # build data structures of non-"other" effects that are triggered
-                order_effects: list[PlayerCardGameEffect] = [
-                    effect for effect in effects
-                    if effect.get_id() not in handled_ids and effect.get_action() in {EffectAction.HandAddCards, EffectAction.HandRemoveCards, EffectAction.HandAddRemoveCards} and effect.is_triggered(player, card, game)
-                ]
-
-                if len(order_effects) > 0:
-                    if self._need_player_order(order_effects):
-                        # ask user to specify next effect to execute
-                        effect_index = player.decider.effects_order_decision(
-                            order_effects,
-                            player,
-                            game,
-                        )
-                    else:
-                        effect_index = 0
-
-                    effect = order_effects[effect_index]
-                    effect.handler(player, card, game)
-                    handled_ids.add(effect.get_id())
-                    handled_effect = True
-
-            # handle effects that happen after others
-            if not handled_effect:
-                for effect in effects:
-                    if effect.get_id() not in handled_ids and effect.get_action() == EffectAction.Last and effect.is_triggered(player, card, game):
-                        effect.handler(player, card, game)
-                        handled_ids.add(effect.get_id())
-                        handled_effect = True
-                        break
-
-            # reevaluate which effects need to be handled
-            effect_ids = set(e.get_id() for e in effects if e.is_triggered(player, card, game))
-
-    def _handle_player_card_game_deck_effects(
-        self,
-        effects: list[PlayerCardGameDeckEffect],
-        player: "Player",
-        card: "Card",
-        game: "Game",
-        deck: "AbstractDeck",
-    ) -> None:
-        if len(effects) == 0:
-            return
-
-        handled_ids: set[int] = set()
-
-        # one effect may change others, so after handling each effect we need to
-        # reevaluate which other effects need to be handled
-        effect_ids = set(e.get_id() for e in effects if e.is_triggered(player, card, game, deck))
-        while not effect_ids.issubset(handled_ids):
-            handled_effect = False
-
-            # handle effects that happen before others
-            for effect in effects:
-                if effect.get_id() not in handled_ids and effect.get_action() == EffectAction.First and effect.is_triggered(player, card, game, deck):
-                    effect.handler(player, card, game, deck)
-                    handled_ids.add(effect.get_id())
-                    handled_effect = True
-                    break
-
-            # handle all effects where order doesn't matter
-            if not handled_effect:
-                for effect in effects:
-                    if effect.get_id() not in handled_ids and effect.get_action() == EffectAction.Other and effect.is_triggered(player, card, game, deck):
-                        effect.handler(player, card, game, deck)
-                        handled_ids.add(effect.get_id())
-                        handled_effect = True
-                        break
-
-            # if there were no "other" effects to handle, check if there were non-"other" effects
-            if not handled_effect:
-                # build data structures of non-"other" effects that are triggered
-                order_effects: list[PlayerCardGameDeckEffect] = [
-                    effect for effect in effects
-                    if effect.get_id() not in handled_ids and effect.get_action() in {EffectAction.HandAddCards, EffectAction.HandRemoveCards, EffectAction.HandAddRemoveCards} and effect.is_triggered(player, card, game, deck)
-                ]
-
-                if len(order_effects) > 0:
-                    if self._need_player_order(order_effects):
-                        # ask user to specify next effect to execute
-                        effect_index = player.decider.effects_order_decision(
-                            order_effects,
-                            player,
-                            game,
-                        )
-                    else:
-                        effect_index = 0
-
-                    effect = order_effects[effect_index]
-                    effect.handler(player, card, game, deck)
-                    handled_ids.add(effect.get_id())
-                    handled_effect = True
-
-            # handle effects that happen after others
-            if not handled_effect:
-                for effect in effects:
-                    if effect.get_id() not in handled_ids and effect.get_action() == EffectAction.Last and effect.is_triggered(player, card, game, deck):
-                        effect.handler(player, card, game, deck)
-                        handled_ids.add(effect.get_id())
-                        handled_effect = True
-                        break
-
-            # reevaluate which effects need to be handled
-            effect_ids = set(e.get_id() for e in effects if e.is_triggered(player, card, game, deck))
-
-    def _unregister_effect_by_id(
-            self,
-            id: int,
-            effect_list: list[PlayerGameEffect]|list[PlayerCardGameEffect]|list[PlayerCardGameDeckEffect]|list[AttackEffect],
-    ) -> None:
-        i = 0
-        while i < len(effect_list):
-            effect = effect_list[i]
-            if effect.get_id() == id:
-                effect_list.pop(i)
-                return
-            i += 1
+        args: tuple,
+        extra_index: EffectIndex|None = None,
+    ) -> bool:
+        """
+        Handle the triggered effects of an event, one at a time.
+        Effects are handled for the player, who orders them if needed, and are
+        triggered and handled with args. The effects of extra_index are handled
+        as if they were registered after those of index.
+        Returns False if any handler returned False.
+
+        """
+        # handlers may trigger other events, so every level of nesting gets its own scratch buffers
+        depth = self._depth
+        if depth == len(self._handled_stack):
+            self._handled_stack.append(set())
+            self._order_stack.append([])
+        handled = self._handled_stack[depth]
+        order_effects = self._order_stack[depth]
+        self._depth = depth + 1
+
+        try:
+            result = True
+            while True:
+                # handle effects that happen before others, then all effects where order doesn't matter.
+                # one effect may change others, so the triggered effects are looked up again after
+                # each handled effect. Effects that were already handled are never evaluated again.
+                mask = index.get_group_mask(player)
+                extra_mask = extra_index.get_group_mask(player) if extra_index is not None else 0
+
+                effect = None
+                if mask & _FIRST_MASK:
+                    effect = index.find_triggered(player, _FIRST_GROUP, handled, args)
+                if effect is None and extra_mask & _FIRST_MASK:
+                    effect = extra_index.find_triggered(player, _FIRST_GROUP, handled, args)
+                if effect is None and mask & _OTHER_MASK:
+                    effect = index.find_triggered(player, _OTHER_GROUP, handled, args)
+                if effect is None and extra_mask & _OTHER_MASK:
+                    effect = extra_index.find_triggered(player, _OTHER_GROUP, handled, args)
+
+                # if there were no "other" effects to handle, check if there were non-"other" effects
+                if effect is None and (mask | extra_mask) & _ORDER_MASK:
+                    if mask & _ORDER_MASK:
+                        index.find_triggered(player, _ORDER_GROUP, handled, args, order_effects)
+                    if extra_mask & _ORDER_MASK:
+                        extra_index.find_triggered(player, _ORDER_GROUP, handled, args, order_effects)
+                    if len(order_effects) > 0:
+                        if self._need_player_order(order_effects):
+                            # ask user to specify next effect to execute
+                            effect_index = player.decider.effects_order_decision(
+                                order_effects,
+                                player,
+                                game,
+                            )
+                        else:
+                            effect_index = 0
+                        effect = order_effects[effect_index]
+                        order_effects.clear()
+
+                # handle effects that happen after others
+                if effect is None and mask & _LAST_MASK:
+                    effect = index.find_triggered(player, _LAST_GROUP, handled, args)
+                if effect is None and extra_mask & _LAST_MASK:
+                    effect = extra_index.find_triggered(player, _LAST_GROUP, handled, args)
+
+                if effect is None:
+                    return result
+
+                handled.add(effect)
+                if effect.handler(*args) is False:
+                    result = False
+        finally:
+            handled.clear()
+            order_effects.clear()
+            self._depth = depth
 
     def on_attack(self, attacking_player: "Player", defending_player: "Player", attack_card: "Card", game: "Game") -> bool:
         """
         Trigger attacking effects.
+        Returns False if the defending player is unaffected by the attack.
 
         """
-        if len(self.attack_effects) == 0:
+        if not self._attack_index.has_candidates(defending_player):
             return True
-
-        attacked = True
-
-        handled_ids: set[int] = set()
-
-        # one effect may change others, so after handling each effect we need to
-        # reevaluate which other effects need to be handled
-        effect_ids = set(e.get_id() for e in self.attack_effects if e.is_triggered(attacking_player, defending_player, attack_card, game))
-        while not effect_ids.issubset(handled_ids):
-            handled_effect = False
-
-            # handle effects that happen before others
-            for effect in self.attack_effects:
-                if effect.get_id() not in handled_ids and effect.get_action() == EffectAction.First and effect.is_triggered(attacking_player, defending_player, attack_card, game):
-                    attacked &= effect.handler(attacking_player, defending_player, attack_card, game)
-                    handled_ids.add(effect.get_id())
-                    handled_effect = True
-                    break
-
-            # handle all effects where order doesn't matter
-            if not handled_effect:
-                for effect in self.attack_effects:
-                    if effect.get_id() not in handled_ids and effect.get_action() == EffectAction.Other and effect.is_triggered(attacking_player, defending_player, attack_card, game):
-                        attacked &= effect.handler(attacking_player, defending_player, attack_card, game)
-                        handled_ids.add(effect.get_id())
-                        handled_effect = True
-                        break
-
-            # if there were no "other" effects to handle, check if there were non-"other" effects
-            if not handled_effect:
-                # build data structures of non-"other" effects that are triggered
-                order_effects: list[AttackEffect] = [
-                    effect for effect in self.attack_effects
-                    if effect.get_id() not in handled_ids and effect.get_action() in {EffectAction.HandAddCards, EffectAction.HandRemoveCards, EffectAction.HandAddRemoveCards} and effect.is_triggered(attacking_player, defending_player, attack_card, game)
-                ]
-
-                if len(order_effects) > 0:
-                    if self._need_player_order(order_effects):
-                        # ask user to specify next effect to execute
-                        effect_index = defending_player.decider.effects_order_decision(
-                            order_effects,
-                            defending_player,
-                            game,
-                        )
-                    else:
-                        effect_index = 0
-
-                    effect = order_effects[effect_index]
-                    attacked &= effect.handler(attacking_player, defending_player, attack_card, game)
-                    handled_ids.add(effect.get_id())
-                    handled_effect = True
-
-            # handle effects that happen after others
-            if not handled_effect:
-                for effect in self.attack_effects:
-                    if effect.get_id() not in handled_ids and effect.get_action() == EffectAction.Last and effect.is_triggered(attacking_player, defending_player, attack_card, game):
-                        attacked &= effect.handler(attacking_player, defending_player, attack_card, game)
-                        handled_ids.add(effect.get_id())
-                        handled_effect = True
-                        break
-
-            # reevaluate which effects need to be handled
-            effect_ids = set(e.get_id() for e in self.attack_effects if e.is_triggered(attacking_player, defending_player, attack_card, game))
-
-        return attacked
+        return self._handle_effects(
+            self._attack_index,
+            defending_player,
+            game,
+            (attacking_player, defending_player, attack_card, game),
+        )
 
     def on_buy(self, player: "Player", card: "Card", game: "Game", deck: "AbstractDeck") -> None:
         """
         Trigger buying effects.
 
         """
-        self._handle_player_card_game_deck_effects(self.gain_effects + self.buy_effects, player, card, game, deck)
+        if self.recorder is not None:
+            self.recorder.on_buy(player, card)
+        if self._gain_index.has_candidates(player) or self._buy_index.has_candidates(player):
+            self._handle_effects(self._gain_index, player, game, (player, card, game, deck), self._buy_index)
 
     def on_discard(self, player: "Player", card: "Card", game: "Game", deck: "AbstractDeck") -> None:
         """
         Trigger discarding effects.
 
         """
-        self._handle_player_card_game_deck_effects(self.discard_effects, player, card, game, deck)
+        if self.recorder is not None:
+            self.recorder.on_discard(player, card)
+        if self._discard_index.has_candidates(player):
+            self._handle_effects(self._discard_index, player, game, (player, card, game, deck))
 
     def on_gain(self, player: "Player", card: "Card", game: "Game", deck: "AbstractDeck") -> None:
         """
         Trigger gaining effects.
 
         """
-        self._handle_player_card_game_deck_effects(self.gain_effects, player, card, game, deck)
+        if self.recorder is not None:
+            self.recorder.on_gain(player, card)
+        if self._gain_index.has_candidates(player):
+            self._handle_effects(self._gain_index, player, game, (player, card, game, deck))
 
     def on_hand_add(self, player: "Player", card: "Card", game: "Game") -> None:
         """
         Trigger hand adding effects.
 
         """
-        self._handle_player_card_game_effects(self.hand_add_effects, player, card, game)
+        if self.recorder is not None:
+            self.recorder.on_hand_add(player, card)
+        if self._hand_add_index.has_candidates(player):
+            self._handle_effects(self._hand_add_index, player, game, (player, card, game))
 
     def on_hand_remove(self, player: "Player", card: "Card", game: "Game") -> None:
         """
         Trigger hand removing effects.
 
         """
-        self._handle_player_card_game_effects(self.hand_remove_effects, player, card, game)
+        if self._hand_remove_index.has_candidates(player):
+            self._handle_effects(self._hand_remove_index, player, game, (player, card, game))
 
     def on_play(self, player: "Player", card: "Card", game: "Game") -> None:
         """
         Trigger playing effects.
 
         """
-        self._handle_player_card_game_effects(self.play_effects, player, card, game)
+        if self.recorder is not None:
+            self.recorder.on_play(player, card)
+        if self._play_index.has_candidates(player):
+            self._handle_effects(self._play_index, player, game, (player, card, game))
 
     def on_reveal(self, player: "Player", card: "Card", game: "Game") -> None:
         """
         Trigger revealing effects.
 
         """
-        self._handle_player_card_game_effects(self.reveal_effects, player, card, game)
+        if self.recorder is not None:
+            self.recorder.on_reveal(player, card)
+        if self._reveal_index.has_candidates(player):
+            self._handle_effects(self._reveal_index, player, game, (player, card, game))
 
     def on_shuffle(self, player: "Player", game: "Game") -> None:
         """
         Trigger shuffling effects.
 
         """
-        self._handle_player_game_effects(self.shuffle_effects, player, game)
+        if self.recorder is not None:
+            self.recorder.on_shuffle(player)
+        if self._shuffle_index.has_candidates(player):
+            self._handle_effects(self._shuffle_index, player, game, (player, game))
 
     def on_trash(self, player: "Player", card: "Card", game: "Game") -> None:
         """
         Trigger trashing effects.
 
         """
-        self._handle_player_card_game_effects(self.trash_effects, player, card, game)
+        if self.recorder is not None:
+            self.recorder.on_trash(player, card)
+        if self._trash_index.has_candidates(player):
+            self._handle_effects(self._trash_index, player, game, (player, card, game))
 
     def on_turn_start(self, player: "Player", game: "Game") -> None:
         """
         Trigger turn start effects.
 
         """
-        self._handle_player_game_effects(self.turn_start_effects, player, game)
+        if self.recorder is not None:
+            self.recorder.on_turn_start(player)
+        if self._turn_start_index.has_candidates(player):
+            self._handle_effects(self._turn_start_index, player, game, (player, game))
 
     def on_turn_end(self, player: "Player", game: "Game") -> None:
         """
         Trigger turn end effects.
 
         """
-        self._handle_player_game_effects(self.turn_end_effects, player, game)
+        if self._turn_end_index.has_candidates(player):
+            self._handle_effects(self._turn_end_index, player, game, (player, game))
 
     def on_buy_phase_end(self, player: "Player", game: "Game") -> None:
         """
         Trigger buy phase end effects.
 
         """
-        self._handle_player_game_effects(self.buy_phase_end_effects, player, game)
+        if self._buy_phase_end_index.has_candidates(player):
+            self._handle_effects(self._buy_phase_end_index, player, game, (player, game))
 
     def on_cleanup_phase_start(self, player: "Player", game: "Game") -> None:
         """
         Trigger clean-up phase start effects.
 
         """
-        self._handle_player_game_effects(self.cleanup_phase_start_effects, player, game)
+        if self._cleanup_phase_start_index.has_candidates(player):
+            self._handle_effects(self._cleanup_phase_start_index, player, game, (player, game))
+
+    def _assign_id(self, effect: Effect) -> None:
+        if effect._id is None:
+            effect._id = self._next_id
+            self._next_id += 1
 
     def register_attack_effect(self, effect: AttackEffect) -> None:
         """
         Register an effect to be triggered on attacking.
 
         """
-        self.attack_effects.append(effect)
+        self._assign_id(effect)
+        self._attack_index.add(effect)
 
     def unregister_attack_effect(self, id: int) -> None:
         """
         Unregister an effect from being triggered on attacking.
 
         """
-        self._unregister_effect_by_id(id, self.attack_effects)
+        self._attack_index.remove(id)
 
     def register_buy_effect(self, effect: PlayerCardGameDeckEffect) -> None:
         """
         Register an effect to be triggered on buying.
 
         """
-        self.buy_effects.append(effect)
+        self._assign_id(effect)
+        self._buy_index.add(effect)
 
     def unregister_buy_effect(self, id: int) -> None:
         """
         Unregister an effect from being triggered on buying.
 
         """
-        self._unregister_effect_by_id(id, self.buy_effects)
+        self._buy_index.remove(id)
 
     def register_discard_effect(self, effect: PlayerCardGameDeckEffect) -> None:
         """
         Register an effect to be triggered on discarding.
 
         """
-        self.discard_effects.append(effect)
+        self._assign_id(effect)
+        self._discard_index.add(effect)
 
     def unregister_discard_effect(self, id: int) -> None:
         """
         Unregister an effect from being triggered on discarding.
 
         """
-        self._unregister_effect_by_id(id, self.discard_effects)
+        self._discard_index.remove(id)
 
     def register_gain_effect(self, effect: PlayerCardGameDeckEffect) -> None:
         """
         Register an effect to be triggered on gaining.
 
         """
-        self.gain_effects.append(effect)
+        self._assign_id(effect)
+        self._gain_index.add(effect)
 
     def unregister_gain_effect(self, id: int) -> None:
         """
         Unregister an effect from being triggered on gaining.
 
         """
-        self._unregister_effect_by_id(id, self.gain_effects)
+        self._gain_index.remove(id)
 
     def register_hand_add_effect(self, effect: PlayerCardGameEffect) -> None:
         """
         Register an effect to be triggered on hand adding.
 
         """
-        self.hand_add_effects.append(effect)
+        self._assign_id(effect)
+        self._hand_add_index.add(effect)
 
     def unregister_hand_add_effect(self, id: int) -> None:
         """
         Unregister an effect from being triggered on hand adding.
 
         """
-        self._unregister_effect_by_id(id, self.hand_add_effects)
+        self._hand_add_index.remove(id)
 
     def register_hand_remove_effect(self, effect: PlayerCardGameEffect) -> None:
         """
         Register an effect to be triggered on hand removing.
 
         """
-        self.hand_remove_effects.append(effect)
+        self._assign_id(effect)
+        self._hand_remove_index.add(effect)
 
     def unregister_hand_remove_effect(self, id: int) -> None:
         """
         Unregister an effect from being triggered on hand removing.
 
         """
-        self._unregister_effect_by_id(id, self.hand_remove_effects)
+        self._hand_remove_index.remove(id)
 
     def register_play_effect(self, effect: PlayerCardGameEffect) -> None:
         """
         Register an effect to be triggered on playing.
 
         """
-        self.play_effects.append(effect)
+        self._assign_id(effect)
+        self._play_index.add(effect)
 
     def unregister_play_effect(self, id: int) -> None:
         """
         Unregister an effect from being triggered on playing.
 
         """
-        self._unregister_effect_by_id(id, self.play_effects)
+        self._play_index.remove(id)
 
     def register_reveal_effect(self, effect: PlayerCardGameEffect) -> None:
         """
         Register an effect to be triggered on revealing.
 
         """
-        self.reveal_effects.append(effect)
+        self._assign_id(effect)
+        self._reveal_index.add(effect)
 
     def unregister_reveal_effect(self, id: int) -> None:
         """
         Unregister an effect from being triggered on revealing.
 
         """
-        self._unregister_effect_by_id(id, self.reveal_effects)
+        self._reveal_index.remove(id)
 
     def register_shuffle_effect(self, effect: PlayerGameEffect) -> None:
         """
         Register an effect to be triggered on shuffling.
 
         """
-        self.shuffle_effects.append(effect)
+        self._assign_id(effect)
+        self._shuffle_index.add(effect)
 
     def unregister_shuffle_effect(self, id: int) -> None:
         """
         Unregister an effect from being triggered on shuffling.
 
         """
-        self._unregister_effect_by_id(id, self.shuffle_effects)
+        self._shuffle_index.remove(id)
 
     def register_trash_effect(self, effect: PlayerCardGameEffect) -> None:
         """
         Register an effect to be triggered on trashing.
 
         """
-        self.trash_effects.append(effect)
+        self._assign_id(effect)
+        self._trash_index.add(effect)
 
     def unregister_trash_effect(self, id: int) -> None:
         """
         Unregister an effect from being triggered on trashing.
 
         """
-        self._unregister_effect_by_id(id, self.trash_effects)
+        self._trash_index.remove(id)
 
     def register_turn_start_effect(self, effect: PlayerGameEffect) -> None:
         """
         Register an effect to be triggered on turn start.
 
         """
-        self.turn_start_effects.append(effect)
+        self._assign_id(effect)
+        self._turn_start_index.add(effect)
 
     def unregister_turn_start_effect(self, id: int) -> None:
         """
         Unregister an effect from being triggered on turn start.
 
         """
-        self._unregister_effect_by_id(id, self.turn_start_effects)
+        self._turn_start_index.remove(id)
 
     def register_turn_end_effect(self, effect: PlayerGameEffect) -> None:
         """
         Register an effect to be triggered on turn end.
 
         """
-        self.turn_end_effects.append(effect)
+        self._assign_id(effect)
+        self._turn_end_index.add(effect)
 
     def unregister_turn_end_effect(self, id: int) -> None:
         """
         Unregister an effect from being triggered on turn end.
 
         """
-        self._unregister_effect_by_id(id, self.turn_end_effects)
+        self._turn_end_index.remove(id)
 
     def register_buy_phase_end_effect(self, effect: PlayerGameEffect) -> None:
         """
         Register an effect to be triggered on buy phase end.
 
         """
-        self.buy_phase_end_effects.append(effect)
+        self._assign_id(effect)
+        self._buy_phase_end_index.add(effect)
 
     def unregister_buy_phase_end_effect(self, id: int) -> None:
         """
         Unregister an effect from being triggered on buy phase end.
 
         """
-        self._unregister_effect_by_id(id, self.buy_phase_end_effects)
+        self._buy_phase_end_index.remove(id)
 
     def register_cleanup_phase_start_effect(self, effect: PlayerGameEffect) -> None:
         """
         Register an effect to be triggered on clean-up phase start.
 
         """
-        self.cleanup_phase_start_effects.append(effect)
+        self._assign_id(effect)
+        self._cleanup_phase_start_index.add(effect)
 
     def unregister_cleanup_phase_start_effect(self, id: int) -> None:
         """
         Unregister an effect from being triggered on clean-up phase start.
 
         """
-        self._unregister_effect_by_id(id, self.cleanup_phase_start_effects)
+        self._cleanup_phase_start_index.remove(id)
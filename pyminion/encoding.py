@@ -0,0 +1,307 @@
+from array import array
+from typing import TYPE_CHECKING, Iterable, MutableSequence, Sequence
+
+from pyminion.core import KEY_MASK, AbstractDeck, Card, CountedZone, get_name_key
+
+if TYPE_CHECKING:
+    from pyminion.game import Game
+    from pyminion.player import Player
+
+
+class CardIndex:
+    """
+    Small integer ids for a set of cards.
+
+    Ids are assigned in the order the cards are given, skipping repeated
+    cards, which makes them suitable as indices into fixed-width arrays of
+    card counts. Cards added to the end of an index keep the ids of the other
+    cards, so data encoded with the index can still be read.
+
+    """
+
+    def __init__(self, cards: Iterable[Card]):
+        unique: dict[str, Card] = {}
+        for card in cards:
+            unique.setdefault(card.name, card)
+        self.cards: list[Card] = list(unique.values())
+        self.ids: dict[Card, int] = {card: i for i, card in enumerate(self.cards)}
+
+    @classmethod
+    def from_game(cls, game: "Game") -> "CardIndex":
+        """
+        Index of every card that is in a supply pile of the game or in the
+        possession of a player, in the order of the card names. The ids depend
+        on the cards of the game, so data of many games should be encoded with
+        the standard index instead.
+
+        """
+        cards: list[Card] = []
+        for pile in game.supply.piles:
+            cards.extend(pile.cards)
+        for player in game.players:
+            cards.extend(player.get_all_cards())
+        cards.extend(game.trash.cards)
+        cards.extend(game.start_deck)
+        return cls(sorted(cards, key=lambda card: card.name))
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def __contains__(self, card: Card) -> bool:
+        return card in self.ids
+
+    def get_id(self, card: Card) -> int:
+        return self.ids[card]
+
+    def get_counts(self, cards: Iterable[Card]) -> list[int]:
+        """
+        Count the cards into a list with one entry per card of the index.
+
+        """
+        counts = [0] * len(self.cards)
+        ids = self.ids
+        for card in cards:
+            counts[ids[card]] += 1
+        return counts
+
+
+def get_player_zones(player: "Player") -> list[AbstractDeck]:
+    """
+    The zones of a player in a fixed order: deck, discard pile, hand, playmat,
+    set aside cards and the player's mats in the order of their names.
+
+    """
+    zones = [player.deck, player.discard_pile, player.hand, player.playmat, player.set_aside]
+    for name in sorted(player.mats):
+        zones.append(player.mats[name])
+    return zones
+
+
+def get_state_hash(game: "Game") -> int:
+    """
+    64 bit hash of the state of a game: the cards in each zone of each player,
+    their turn state and number of turns, the counts of the supply piles, the
+    cards in the trash, the current player and the phase of the turn.
+
+    The order of the cards in a zone is not part of the hash. Zones are hashed
+    by their keys (see AbstractDeck.get_key), which counted zones keep up to
+    date as cards are added and removed, so the hash costs nothing until it is
+    requested and then O(zones + piles). The hash is the same in every process.
+
+    """
+    values: list[int] = [
+        game.players.index(game.current_player),
+        game.current_phase.value,
+        game.card_cost_reduction,
+    ]
+
+    for player in game.players:
+        state = player.state
+        values.extend((player.turns, state.actions, state.money, state.potions, state.buys))
+        values.extend(zone.get_key() for zone in get_player_zones(player))
+        for name in sorted(player.mats):
+            values.append(get_name_key(name))
+
+    values.extend(len(pile) for pile in game.supply.piles)
+    values.append(game.trash.get_key())
+
+    # hashes of tuples of ints do not depend on the hash seed of the process
+    return hash(tuple(values)) & KEY_MASK
+
+
+# cards of the standard index in the order of their ids. The ids are part of
+# recorded games and exported results, so new cards must be added at the end.
+STANDARD_CARD_NAMES: tuple[str, ...] = (
+    "Alchemist", "Apothecary", "Apprentice", "Artisan", "Astrolabe", "Bandit", "Baron", "Bazaar",
+    "Blockade", "Bridge", "Bureaucrat", "Caravan", "Cellar", "Chapel", "Conspirator", "Copper",
+    "Corsair", "Council Room", "Courtier", "Courtyard", "Curse", "Cutpurse", "Diplomat", "Duchy",
+    "Duke", "Estate", "Familiar", "Farm", "Festival", "Fishing Village", "Gardens", "Gold",
+    "Golem", "Harbinger", "Haven", "Herbalist", "Ironworks", "Island", "Laboratory", "Library",
+    "Lighthouse", "Lookout", "Lurker", "Market", "Masquerade", "Merchant", "Merchant Ship",
+    "Militia", "Mill", "Mine", "Mining Village", "Minion", "Moat", "Moneylender", "Monkey",
+    "Native Village", "Nobles", "Outpost", "Patrol", "Pawn", "Philosopher's Stone", "Pirate",
+    "Poacher", "Possession", "Potion", "Province", "Remodel", "Replace", "Sailor", "Salvager",
+    "Scrying Pool", "Sea Chart", "Sea Witch", "Secret Passage", "Sentry", "Shanty Town", "Silver",
+    "Smithy", "Smugglers", "Steward", "Swindler", "Tactician", "Throne Room", "Tide Pools",
+    "Torturer", "Trading Post", "Transmute", "Treasure Map", "Treasury", "University", "Upgrade",
+    "Vassal", "Village", "Vineyard", "Warehouse", "Wharf", "Wishing Well", "Witch", "Workshop",
+)
+
+
+_standard_card_index: CardIndex|None = None
+
+
+def get_standard_card_index() -> CardIndex:
+    """
+    Index of the basic cards and the cards of the base, intrigue, seaside and
+    alchemy sets, in the fixed order of STANDARD_CARD_NAMES. The ids do not
+    depend on the game, so encodings of games with different kingdoms have the
+    same layout, and they do not change when cards are added.
+
+    """
+    global _standard_card_index
+    if _standard_card_index is None:
+        from pyminion.expansions.alchemy import alchemy_set, potion
+        from pyminion.expansions.base import base_set, copper, curse, duchy, estate, gold, province, silver
+        from pyminion.expansions.intrigue import intrigue_set
+        from pyminion.expansions.seaside import seaside_set
+
+        basic_cards = [copper, silver, gold, potion, estate, duchy, province, curse]
+        cards = {card.name: card for card in basic_cards + base_set + intrigue_set + seaside_set + alchemy_set}
+        missing = cards.keys() - set(STANDARD_CARD_NAMES)
+        if missing:
+            raise ValueError(f"Cards missing from STANDARD_CARD_NAMES: {sorted(missing)}")
+        _standard_card_index = CardIndex(cards[name] for name in STANDARD_CARD_NAMES)
+    return _standard_card_index
+
+
+class Observer:
+    """
+    Encodes the state of a game as seen by one of its players into a fixed-width
+    vector of floats, for example as the input of a value network.
+
+    The vector holds, in this order, with one entry per card of the card index
+    for each count:
+        hand: counts of the cards in the player's hand.
+        deck: counts of the cards in the player's deck. The order is hidden.
+        discard_pile: counts of the cards in the player's discard pile.
+        playmat: counts of the cards the player has in play.
+        other: counts of the player's set aside cards and cards on mats.
+        opponents: for each opponent in turn order, counts of all the cards
+            they own, as the split between their zones is hidden.
+        supply: counts of the cards left in the supply.
+        trash: counts of the cards in the trash.
+        scalars: the player's actions, money, potions, buys, turns and victory
+            points, the phase of the turn, the card cost reduction, whether it
+            is the player's turn and the victory points of each opponent.
+
+    The offset and length of each part are in layout. Observations are written
+    into a preallocated array.array of floats, which NumPy can wrap without
+    copying (numpy.frombuffer(buffer, dtype=numpy.float32)). observe_batch
+    encodes many games at once into consecutive rows of one buffer.
+
+    Attributes:
+        num_players: number of players of the observed games.
+        card_index: ids of the cards. Defaults to the standard index.
+
+    """
+
+    def __init__(self, num_players: int, card_index: CardIndex|None = None):
+        self.num_players = num_players
+        self.card_index = card_index if card_index else get_standard_card_index()
+
+        num_cards = len(self.card_index)
+        num_opponents = num_players - 1
+        parts = [
+            ("hand", num_cards),
+            ("deck", num_cards),
+            ("discard_pile", num_cards),
+            ("playmat", num_cards),
+            ("other", num_cards),
+            ("opponents", num_opponents * num_cards),
+            ("supply", num_cards),
+            ("trash", num_cards),
+            ("scalars", 9 + num_opponents),
+        ]
+        self.layout: dict[str, tuple[int, int]] = {}
+        offset = 0
+        for name, length in parts:
+            self.layout[name] = (offset, length)
+            offset += length
+        self.size = offset
+
+        self._zeros = array("f", bytes(4 * self.size))
+        self.buffer = array("f", self._zeros)
+        self.batch_buffer = array("f")
+
+    def observe(self, game: "Game", player: "Player") -> array:
+        """
+        Encode the game as seen by the player into buffer and return it.
+        buffer is overwritten by the next call.
+
+        """
+        self.observe_into(game, player, self.buffer, 0)
+        return self.buffer
+
+    def observe_batch(self, observations: Sequence[tuple["Game", "Player"]]) -> array:
+        """
+        Encode each game as seen by its player into a row of batch_buffer and
+        return it. Row i starts at i * size. batch_buffer only grows when the
+        batch is larger than any batch before, in which case it is replaced by a
+        new buffer. It is overwritten by the next call.
+
+        """
+        needed = len(observations) * self.size
+        if len(self.batch_buffer) < needed:
+            self.batch_buffer = array("f", bytes(4 * needed))
+
+        for i, (game, player) in enumerate(observations):
+            self.observe_into(game, player, self.batch_buffer, i * self.size)
+        return self.batch_buffer
+
+    def observe_into(self, game: "Game", player: "Player", out: MutableSequence[float], offset: int = 0) -> None:
+        """
+        Encode the game as seen by the player into out, starting at offset.
+        out can be any mutable sequence of floats with room for size entries,
+        such as an array.array("f") or a NumPy array.
+
+        """
+        if len(game.players) != self.num_players:
+            raise ValueError(f"Observer for {self.num_players} players cannot observe a game of {len(game.players)} players")
+
+        out[offset:offset + self.size] = self._zeros
+        layout = self.layout
+        ids = self.card_index.ids
+
+        _add_zone(out, ids, player.hand, offset + layout["hand"][0])
+        _add_zone(out, ids, player.deck, offset + layout["deck"][0])
+        _add_zone(out, ids, player.discard_pile, offset + layout["discard_pile"][0])
+        _add_zone(out, ids, player.playmat, offset + layout["playmat"][0])
+        other_start = offset + layout["other"][0]
+        _add_zone(out, ids, player.set_aside, other_start)
+        for mat in player.mats.values():
+            _add_zone(out, ids, mat, other_start)
+
+        supply_start = offset + layout["supply"][0]
+        for pile in game.supply.piles:
+            if len(pile.card_names) == 1:
+                if pile.cards:
+                    out[supply_start + ids[pile.cards[0]]] = len(pile)
+            else:
+                _add_zone(out, ids, pile, supply_start)
+
+        _add_zone(out, ids, game.trash, offset + layout["trash"][0])
+
+        state = player.state
+        scalars_start = offset + layout["scalars"][0]
+        out[scalars_start] = state.actions
+        out[scalars_start + 1] = state.money
+        out[scalars_start + 2] = state.potions
+        out[scalars_start + 3] = state.buys
+        out[scalars_start + 4] = player.turns
+        out[scalars_start + 5] = player.get_victory_points()
+        out[scalars_start + 6] = game.current_phase.value
+        out[scalars_start + 7] = game.card_cost_reduction
+        out[scalars_start + 8] = 1 if game.current_player is player else 0
+
+        num_cards = len(self.card_index)
+        opponents_start = offset + layout["opponents"][0]
+        for i, opponent in enumerate(game.get_opponents(player)):
+            start = opponents_start + i * num_cards
+            if opponent.track_deck_stats:
+                for card, num in opponent.owned_cards.items():
+                    out[start + ids[card]] = num
+            else:
+                for card in opponent.get_all_cards():
+                    out[start + ids[card]] += 1
+            out[scalars_start + 9 + i] = opponent.get_victory_points()
+
+
+def _add_zone(out: MutableSequence[float], ids: dict[Card, int], zone: AbstractDeck, start: int) -> None:
+    # counted zones already hold the counts of their cards
+    if isinstance(zone, CountedZone):
+        for card, num in zone.counts.items():
+            out[start + ids[card]] += num
+    else:
+        for card in zone.cards:
+            out[start + ids[card]] += 1
@@ -170,7 +170,8 @@ class Apothecary(Action):
         num_topdeck = len(revealed)
 
         if num_topdeck > 0:
-            logger.info(f"Cards to topdeck: {revealed}")
+            if not game.headless:
+                logger.info(f"Cards to topdeck: {revealed}")
 
         if num_topdeck <= 1:
             topdeck_cards = revealed.cards[:]
@@ -632,9 +633,7 @@ class Vineyard(Victory):
         super().__init__("Vineyard", Cost(potions=1), (CardType.Victory,))
 
     def score(self, player: Player) -> int:
-        actions_count = sum(
-            1 for card in player.get_all_cards() if CardType.Action in card.type
-        )
+        actions_count = player.get_action_count()
         vp = actions_count // 3
         return vp
 
@@ -475,7 +475,7 @@ class Vassal(Action):
         if not decision:
             return
 
-        played_card = player.discard_pile.cards.pop()
+        played_card = player.discard_pile.pop()
         player.playmat.add(played_card)
         player.exact_play(card=player.playmat.cards[-1], game=game, generic_play=False)
 
@@ -649,6 +649,9 @@ class Moat(Action):
             super().__init__(f"Moat: {player.player_id} block attack", EffectAction.Other)
             self.player = player
 
+        def get_player(self) -> Player|None:
+            return self.player
+
         def is_triggered(self, attacking_player: Player, defending_player: Player, attack_card: Card, game: "Game") -> bool:
             return self.player.player_id == defending_player.player_id
 
@@ -662,7 +665,8 @@ class Moat(Action):
             )
             if block:
                 defending_player.reveal(moat, game)
-                logger.info(f"{defending_player} blocks {attack_card} with Moat")
+                if not game.headless:
+                    logger.info(f"{defending_player} blocks {attack_card} with Moat")
 
             return not block
 
@@ -694,7 +698,8 @@ class Moat(Action):
             lambda p, c, g: g.effect_registry.unregister_attack_effect(
                 effect.get_id()
             ),
-            lambda p, c, g: p is player and c.name == self.name,
+            lambda p, c, g: c.name == self.name,
+            player=player,
         )
         game.effect_registry.register_hand_remove_effect(hand_remove_effect)
 
@@ -715,6 +720,9 @@ class Merchant(Action):
         def get_action(self) -> EffectAction:
             return EffectAction.Other
 
+        def get_player(self) -> Player|None:
+            return self.player
+
         def is_triggered(self, player: Player, card: Card, game: "Game") -> bool:
             return player is self.player and card.name == "Silver"
 
@@ -747,7 +755,7 @@ class Merchant(Action):
             lambda p, g: g.effect_registry.unregister_play_effect(
                 money_effect.get_id()
             ),
-            lambda p, g: p is player,
+            player=player,
         )
         game.effect_registry.register_turn_start_effect(unregister_effect)
 
@@ -1114,7 +1122,8 @@ class Sentry(Action):
         trash_cards: list[Card] = []
         if len(looked_at) > 0:
             s = plural("card", len(looked_at))
-            logger.info(f"Sentry {s}: {looked_at}")
+            if not game.headless:
+                logger.info(f"Sentry {s}: {looked_at}")
             trash_cards = player.decider.trash_decision(
                 prompt="Enter the cards you would like to trash: ",
                 card=self,
@@ -1131,7 +1140,8 @@ class Sentry(Action):
         discard_cards: list[Card] = []
         if len(looked_at) > 0:
             s = plural("card", len(looked_at))
-            logger.info(f"Sentry {s}: {looked_at}")
+            if not game.headless:
+                logger.info(f"Sentry {s}: {looked_at}")
             discard_cards = player.decider.discard_decision(
                 prompt="Enter the cards you would like to discard: ",
                 card=self,
@@ -1144,9 +1154,10 @@ class Sentry(Action):
 
         reorder = False
         if len(looked_at) == 2:
-            logger.info(
-                f"Current order: {looked_at.cards[0]} (Top), {looked_at.cards[1]} (Bottom)"
-            )
+            if not game.headless:
+                logger.info(
+                    f"Current order: {looked_at.cards[0]} (Top), {looked_at.cards[1]} (Bottom)"
+                )
             reorder = player.decider.binary_decision(
                 prompt="Would you like to switch the order of the cards? y/n: ",
                 card=self,
@@ -225,6 +225,9 @@ class Diplomat(Action):
             super().__init__(f"Diplomat: {player.player_id} attack reaction", EffectAction.HandAddRemoveCards)
             self.player = player
 
+        def get_player(self) -> Player|None:
+            return self.player
+
         def is_triggered(self, attacking_player: Player, defending_player: Player, attack_card: Card, game: "Game") -> bool:
             return self.player.player_id == defending_player.player_id and len(defending_player.hand) >= 5
 
@@ -290,7 +293,8 @@ class Diplomat(Action):
             lambda p, c, g: g.effect_registry.unregister_attack_effect(
                 effect.get_id()
             ),
-            lambda p, c, g: p is player and c.name == self.name,
+            lambda p, c, g: c.name == self.name,
+            player=player,
         )
         game.effect_registry.register_hand_remove_effect(hand_remove_effect)
 
@@ -505,7 +509,10 @@ class Masquerade(Action):
             next_idx = (idx + 1) % len(valid_players)
             next_player = valid_players[next_idx]
             next_player.hand.add(c)
-            logger.info(f"{p} passes {c} to {next_player}")
+            p.remove_owned_card(c)
+            next_player.add_owned_card(c)
+            if not game.headless:
+                logger.info(f"{p} passes {c} to {next_player}")
 
         if len(player.hand) == 0:
             return
@@ -763,7 +770,8 @@ class Patrol(Action):
         num_topdeck = len(revealed.cards)
 
         if num_topdeck > 0:
-            logger.info(f"Cards to topdeck: {revealed}")
+            if not game.headless:
+                logger.info(f"Cards to topdeck: {revealed}")
 
         if num_topdeck <= 1:
             topdeck_cards = revealed.cards[:]
@@ -887,7 +895,8 @@ class Replace(Action):
 
         if CardType.Action in gain_card.type or CardType.Treasure in gain_card.type:
             player.gain(gain_card, game, destination=player.deck)
-            logger.info(f"{player} topdecks {gain_card}")
+            if not game.headless:
+                logger.info(f"{player} topdecks {gain_card}")
         else:
             player.gain(gain_card, game)
 
@@ -945,7 +954,7 @@ class SecretPassage(Action):
             assert 0 <= index <= len_deck
 
         player.hand.remove(insert_card)
-        player.deck.cards.insert(index, insert_card)
+        player.deck.insert(index, insert_card)
 
 
 class ShantyTown(Action):
@@ -1280,7 +1289,8 @@ class WishingWell(Action):
         assert len(named_cards) == 1
         name = named_cards[0].name
 
-        logger.info(f"{player} names {name}")
+        if not game.headless:
+            logger.info(f"{player} names {name}")
 
         revealed = AbstractDeck()
         player.draw(1, revealed, silent=True)
@@ -137,10 +137,13 @@ class Blockade(ActionDuration):
         gain_card = gain_cards[0]
         assert gain_card.get_cost(player, game) <= 4
 
-        player.set_aside.add(gain_card)
+        player.gain(gain_card, game, destination=player.set_aside)
 
-        get_set_aside_effect = GetSetAsideCardEffect(self.name, player, gain_cards)
-        game.effect_registry.register_turn_start_effect(get_set_aside_effect)
+        # the gain may have been redirected (possession) or the gained card moved by an
+        # on-gain effect, in which case there is nothing to put in hand next turn
+        if gain_card in player.set_aside:
+            get_set_aside_effect = GetSetAsideCardEffect(self.name, player, gain_cards)
+            game.effect_registry.register_turn_start_effect(get_set_aside_effect)
 
         affected_players = (
             p for p in game.get_opponents(player) if p.is_attacked(player, self, game)
@@ -155,7 +158,7 @@ class Blockade(ActionDuration):
             lambda p, g: g.effect_registry.unregister_gain_effect(
                 curse_effect.get_id()
             ),
-            lambda p, g: p is player,
+            player=player,
         )
         game.effect_registry.register_turn_start_effect(unregister_effect)
 
@@ -201,6 +204,9 @@ class Corsair(ActionDuration):
         def get_action(self) -> EffectAction:
             return EffectAction.Other
 
+        def get_player(self) -> Player|None:
+            return self.player
+
         def is_triggered(self, player: Player, card: Card, game: "Game") -> bool:
             return player is self.player and card.name in {"Silver", "Gold"}
 
@@ -248,7 +254,7 @@ class Corsair(ActionDuration):
             f"{self.name}: Unregister Trash Effects",
             EffectAction.First,
             lambda p, g: Corsair._unregister_effects(effect_ids, g),
-            lambda p, g: p is player,
+            player=player,
         )
         game.effect_registry.register_turn_start_effect(unregister_effect)
 
@@ -488,7 +494,7 @@ class Lighthouse(ActionDuration):
             lambda p, g: g.effect_registry.unregister_attack_effect(
                 block_effect.get_id()
             ),
-            lambda p, g: p is player,
+            player=player,
         )
         game.effect_registry.register_turn_start_effect(unregister_effect)
 
@@ -597,6 +603,9 @@ class Monkey(ActionDuration):
         def get_action(self) -> EffectAction:
             return EffectAction.Last
 
+        def get_player(self) -> Player|None:
+            return self.right_player
+
         def is_triggered(self, player: Player, card: Card, game: "Game", deck: AbstractDeck) -> bool:
             return player is self.right_player
 
@@ -630,7 +639,7 @@ class Monkey(ActionDuration):
             f"{self.name}: Unregister Draw",
             EffectAction.First,
             lambda p, g: g.effect_registry.unregister_gain_effect(draw_effect.get_id()),
-            lambda p, g: p is player,
+            player=player,
         )
         game.effect_registry.register_turn_start_effect(unregister_effect)
 
@@ -679,13 +688,14 @@ class NativeVillage(Action):
 
         if choice == NativeVillage.Choice.AddToMat:
             player.draw(1, mat, silent=True)
-            if len(mat) > mat_len:
+            if len(mat) > mat_len and not game.headless:
                 logger.info(f"{player} adds a card to their Native Village mat")
         elif choice == NativeVillage.Choice.GetFromMat:
             mat.move_to(player.hand)
-            logger.info(
-                f"{player} puts {mat_len} {cards_str} from their Native Village mat into their hand"
-            )
+            if not game.headless:
+                logger.info(
+                    f"{player} puts {mat_len} {cards_str} from their Native Village mat into their hand"
+                )
         else:
             raise ValueError(f"Unknown native village choice '{choice}'")
 
@@ -736,6 +746,9 @@ class Pirate(ActionDuration):
         def get_action(self) -> EffectAction:
             return EffectAction.HandAddCards
 
+        def get_player(self) -> Player|None:
+            return self.player
+
         def is_triggered(self, player: Player, game: "Game") -> bool:
             return player is self.player
 
@@ -827,7 +840,8 @@ class Pirate(ActionDuration):
             "Pirate: Hand Remove",
             EffectAction.Other,
             lambda p, c, g: g.effect_registry.unregister_gain_effect(effect.get_id()),
-            lambda p, c, g: p is player and c.name == self.name,
+            lambda p, c, g: c.name == self.name,
+            player=player,
         )
         game.effect_registry.register_hand_remove_effect(hand_remove_effect)
 
@@ -883,6 +897,9 @@ class Sailor(ActionDuration):
         def get_action(self) -> EffectAction:
             return EffectAction.HandRemoveCards
 
+        def get_player(self) -> Player|None:
+            return self.player
+
         def is_triggered(self, player: Player, game: "Game") -> bool:
             return player is self.player and len(player.hand) > 0
 
@@ -955,7 +972,7 @@ class Sailor(ActionDuration):
             lambda p, g: g.effect_registry.unregister_turn_start_effect(
                 trash_effect.get_id()
             ),
-            lambda p, g: p is player,
+            player=player,
         )
         game.effect_registry.register_turn_start_effect(unregister_effect)
 
@@ -1257,6 +1274,9 @@ class Treasury(Action):
         def get_action(self) -> EffectAction:
             return EffectAction.Other
 
+        def get_player(self) -> Player|None:
+            return self.player
+
         def is_triggered(self, player: Player, game: "Game") -> bool:
             return player is self.player and not any(
                 phase == Game.Phase.Buy and CardType.Victory in card.type
@@ -1314,7 +1334,7 @@ class Treasury(Action):
                 lambda p, g: g.effect_registry.unregister_buy_phase_end_effect(
                     effect.get_id()
                 ),
-                lambda p, g: p is player,
+                player=player,
             )
             game.effect_registry.register_turn_end_effect(unregister_effect)
 
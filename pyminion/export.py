@@ -0,0 +1,255 @@
+import ast
+import json
+import os
+import struct
+import sys
+from array import array
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from pyminion.encoding import CardIndex, get_standard_card_index
+from pyminion.result import GameResult
+
+if TYPE_CHECKING:
+    from pyminion.player import Player
+
+
+NPY_MAGIC = b"\x93NUMPY"
+
+# headers have a fixed length, so they can be rewritten once the number of rows is known
+NPY_HEADER_LENGTH = 128
+
+_BYTE_ORDER = "<" if sys.byteorder == "little" else ">"
+
+# NumPy types of array.array type codes
+_NPY_TYPES = {
+    "b": "|i1",
+    "h": f"{_BYTE_ORDER}i2",
+    "i": f"{_BYTE_ORDER}i4",
+    "q": f"{_BYTE_ORDER}i8",
+}
+_TYPECODES = {npy_type: typecode for typecode, npy_type in _NPY_TYPES.items()}
+
+# columns of the game table
+GAME_COLUMNS = {
+    "turns": "i",
+    # index of the winning player, or -1 for a tie
+    "winner": "b",
+}
+
+# columns of the player table, with one row per player per game
+PLAYER_COLUMNS = {
+    "game": "q",
+    "player": "b",
+    "result": "b",
+    "score": "i",
+    "turns": "i",
+    "shuffles": "i",
+    "turn_order": "b",
+}
+
+
+def get_npy_header(typecode: str, shape: tuple[int, ...]) -> bytes:
+    """
+    Header of a .npy file (format version 1.0) holding an array with the
+    given array.array type code and shape.
+
+    """
+    header = f"{{'descr': '{_NPY_TYPES[typecode]}', 'fortran_order': False, 'shape': {shape}, }}"
+    # magic, version, header length, header and the terminating newline
+    padding = NPY_HEADER_LENGTH - len(NPY_MAGIC) - 4 - len(header) - 1
+    if padding < 0:
+        raise ValueError(f"shape {shape} does not fit in a header of {NPY_HEADER_LENGTH} bytes")
+    return NPY_MAGIC + bytes([1, 0]) + struct.pack("<H", NPY_HEADER_LENGTH - len(NPY_MAGIC) - 4) + (header + " " * padding + "\n").encode()
+
+
+class NpyWriter:
+    """
+    Writes the rows of a .npy file in chunks. The shape in the header is
+    updated when the file is closed.
+
+    """
+
+    def __init__(self, path: str, typecode: str, width: int|None = None):
+        self.path = path
+        self.typecode = typecode
+        self.width = width
+        self.rows = 0
+        self.file: BinaryIO = open(path, "wb")
+        self.file.write(get_npy_header(typecode, self.get_shape()))
+
+    def get_shape(self) -> tuple[int, ...]:
+        return (self.rows,) if self.width is None else (self.rows, self.width)
+
+    def write(self, values: array) -> None:
+        values.tofile(self.file)
+        self.rows += len(values) if self.width is None else len(values) // self.width
+
+    def close(self) -> None:
+        self.file.seek(0)
+        self.file.write(get_npy_header(self.typecode, self.get_shape()))
+        self.file.close()
+
+
+def read_npy(path: str) -> tuple[array, tuple[int, ...]]:
+    """
+    Read a .npy file written by NpyWriter into an array.array and its shape.
+    Multi-dimensional arrays are flattened in row-major order.
+
+    With NumPy, the files can also be memory-mapped: numpy.load(path, mmap_mode="r").
+
+    """
+    with open(path, "rb") as file:
+        if file.read(len(NPY_MAGIC)) != NPY_MAGIC:
+            raise ValueError(f"{path} is not a .npy file")
+        file.read(2)
+        (header_length,) = struct.unpack("<H", file.read(2))
+        header = ast.literal_eval(file.read(header_length).decode())
+        values = array(_TYPECODES[header["descr"]])
+        values.frombytes(file.read())
+    return values, header["shape"]
+
+
+class ResultExporter:
+    """
+    Writes the results of games to column files, without keeping the results.
+
+    Each column is a .npy file in the directory, written in chunks of rows:
+        game_<column>.npy: one row per game, see GAME_COLUMNS.
+        player_<column>.npy: one row per player per game, see PLAYER_COLUMNS.
+            player_game is the index of the game of the row.
+        player_deck.npy: for each row of the player table, the number of
+            copies of each card of the card index the player ended with.
+        meta.json: the ids of the players and the names of the cards.
+
+    Players are referred to by their index in players, and results are
+    GameOutcome values. The files can be memory-mapped with NumPy
+    (numpy.load(path, mmap_mode="r")) or read with read_columns.
+
+    Attributes:
+        directory: directory of the column files. It is created if needed.
+        players: players of the games. If None, players are numbered in the order they are first seen.
+        card_index: ids of the cards of the deck columns. Defaults to the standard index.
+        chunk_size: number of games that are buffered before they are written.
+
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        players: list["Player"]|None = None,
+        card_index: CardIndex|None = None,
+        chunk_size: int = 10_000,
+    ):
+        self.directory = directory
+        self.players: list["Player"] = players[:] if players else []
+        self.player_indices = {player: i for i, player in enumerate(self.players)}
+        self.card_index = card_index if card_index else get_standard_card_index()
+        self.chunk_size = chunk_size
+        self.games = 0
+
+        os.makedirs(directory, exist_ok=True)
+        num_cards = len(self.card_index)
+        self.writers: dict[str, NpyWriter] = {}
+        self.buffers: dict[str, array] = {}
+        for prefix, columns in (("game", GAME_COLUMNS), ("player", PLAYER_COLUMNS)):
+            for column, typecode in columns.items():
+                self._add_column(f"{prefix}_{column}", typecode)
+        self._add_column("player_deck", "h", num_cards)
+        self._zero_deck = array("h", bytes(2 * num_cards))
+
+    def _add_column(self, name: str, typecode: str, width: int|None = None) -> None:
+        self.writers[name] = NpyWriter(os.path.join(self.directory, f"{name}.npy"), typecode, width)
+        self.buffers[name] = array(typecode)
+
+    def __enter__(self) -> "ResultExporter":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def get_player_index(self, player: "Player") -> int:
+        index = self.player_indices.get(player)
+        if index is None:
+            index = len(self.players)
+            self.players.append(player)
+            self.player_indices[player] = index
+        return index
+
+    def add_result(self, result: GameResult) -> None:
+        """
+        Add the result of a game to the buffered rows, and write them once
+        chunk_size games are buffered.
+
+        """
+        buffers = self.buffers
+        buffers["game_turns"].append(result.turns)
+        buffers["game_winner"].append(self.get_player_index(result.winners[0]) if len(result.winners) == 1 else -1)
+
+        ids = self.card_index.ids
+        deck = buffers["player_deck"]
+        num_cards = len(self.card_index)
+        for summary in result.player_summaries:
+            buffers["player_game"].append(self.games)
+            buffers["player_player"].append(self.get_player_index(summary.player))
+            buffers["player_result"].append(summary.result.value)
+            buffers["player_score"].append(summary.score)
+            buffers["player_turns"].append(summary.turns)
+            buffers["player_shuffles"].append(summary.shuffles)
+            buffers["player_turn_order"].append(summary.turn_order)
+
+            start = len(deck)
+            deck.extend(self._zero_deck)
+            for card, count in summary.deck.items():
+                if card not in ids:
+                    raise ValueError(f"{card} is not in the card index of the exporter")
+                deck[start + ids[card]] = count
+
+        self.games += 1
+        if len(buffers["game_turns"]) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the buffered rows.
+
+        """
+        for name, buffer in self.buffers.items():
+            self.writers[name].write(buffer)
+            del buffer[:]
+
+    def close(self) -> None:
+        """
+        Write the remaining rows, complete the headers and write the metadata.
+
+        """
+        self.flush()
+        for writer in self.writers.values():
+            writer.close()
+        meta = {
+            "games": self.games,
+            "players": [player.player_id for player in self.players],
+            "cards": [card.name for card in self.card_index.cards],
+        }
+        with open(os.path.join(self.directory, "meta.json"), "w") as file:
+            json.dump(meta, file)
+
+
+def read_columns(directory: str, card_index: CardIndex|None = None) -> dict[str, array]:
+    """
+    Read the columns written by a ResultExporter. player_deck is flattened,
+    with one count per card of the index for each row of the player table.
+
+    If card_index is given, the deck columns are checked to be written with
+    the same cards in the same order, and a ValueError is raised otherwise.
+
+    """
+    if card_index is not None:
+        with open(os.path.join(directory, "meta.json")) as file:
+            cards = json.load(file)["cards"]
+        if cards != [card.name for card in card_index.cards]:
+            raise ValueError("the columns were written with another card index")
+
+    columns: dict[str, array] = {}
+    for name in [f"game_{column}" for column in GAME_COLUMNS] + [f"player_{column}" for column in PLAYER_COLUMNS] + ["player_deck"]:
+        columns[name], _ = read_npy(os.path.join(directory, f"{name}.npy"))
+    return columns
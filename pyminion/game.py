@@ -1,15 +1,20 @@
+from array import array
+import copy
 from enum import IntEnum, unique
 import logging
 import random
-from typing import Iterator
+from typing import Any, Iterator
 
-from pyminion.core import Card, DeckCounter, DiscardPile, Pile, Supply, Trash
+from pyminion.core import Card, DeckCounter, Pile, Supply, Trash
 from pyminion.effects import EffectRegistry
+from pyminion.encoding import Observer
+from pyminion.lockstep import DecisionRequest, GameCoroutine
 from pyminion.exceptions import InvalidGameSetup, InvalidPlayerCount
 from pyminion.expansions.base import (copper, curse, duchy, estate, gold,
                                       province, silver)
 from pyminion.expansions.alchemy import potion
 from pyminion.player import Player
+from pyminion.replay import GameRecorder
 from pyminion.result import GameOutcome, GameResult, PlayerSummary
 
 
@@ -29,6 +34,11 @@ class Game:
         log_stdout: If True, logs game to stdout.
         log_file: If True, logs game to log file.
         log_file_name: Name of the file to be logged to. Default = "game.log"
+        headless: If True, no log messages are built or logged. Overrides log_stdout and log_file.
+        track_deck_stats: If True, all players keep incremental counts of the cards they own.
+        seed: Seed for the game's random number generator. Ignored if rng is given.
+        rng: Random number generator used for all shuffles and kingdom draws.
+        recorder: If set, records a binary log of each game that is played (see pyminion.replay).
 
     """
 
@@ -48,6 +58,11 @@ class Game:
         log_stdout: bool = True,
         log_file: bool = False,
         log_file_name: str = "game.log",
+        headless: bool = False,
+        track_deck_stats: bool = False,
+        seed: int|None = None,
+        rng: random.Random|None = None,
+        recorder: GameRecorder|None = None,
     ):
 
         if len(players) < 1:
@@ -64,10 +79,20 @@ class Game:
         self.random_order = random_order
         self.trash = Trash()
         self.current_phase: Game.Phase = Game.Phase.Action
+        self.seed = seed
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.recorder = recorder
+        self.headless = headless
+        self.track_deck_stats = track_deck_stats
 
         self.effect_registry = EffectRegistry()
+        # number of times the game was started, which tells games played on
+        # the same object apart
+        self.start_count = 0
+        self._observer: Observer|None = None
+        self._coroutine: GameCoroutine|None = None
 
-        if log_stdout:
+        if log_stdout and not headless:
             # Set up a handler that logs to stdout
             c_handler = logging.StreamHandler()
             c_handler.setLevel(logging.INFO)
@@ -75,7 +100,7 @@ class Game:
             c_handler.setFormatter(c_format)
             logger.addHandler(c_handler)
 
-        if log_file:
+        if log_file and not headless:
             # Set up a handler that dumps the log to a file
             f_handler = logging.FileHandler(log_file_name, mode="w")
             f_handler.setLevel(logging.INFO)
@@ -160,7 +185,7 @@ class Game:
         if chosen_cards:
             for card in self.kingdom_cards:
                 kingdom_options.remove(card)  # Do not duplicate any user chosen cards
-        kingdom_ten = random.sample(kingdom_options, KINGDOM_PILES - chosen_cards)
+        kingdom_ten = self.rng.sample(kingdom_options, KINGDOM_PILES - chosen_cards)
         random_piles = [Pile([card] * card.get_pile_starting_count(self)) for card in kingdom_ten]
 
         piles = chosen_piles + random_piles
@@ -190,19 +215,22 @@ class Game:
         return Supply(basic_score_piles, basic_treasure_piles, kingdom_piles)
 
     def start(self) -> None:
-        logger.info("\nStarting Game...\n")
+        if not self.headless:
+            logger.info("\nStarting Game...\n")
 
+        self.start_count += 1
         self.trash.cards.clear()
         self.effect_registry.reset()
 
         self.supply = self._create_supply()
-        logger.info(self.supply.get_pretty_string(self.players[0], self))
+        if not self.headless:
+            logger.info(self.supply.get_pretty_string(self.players[0], self))
 
         for card in self.all_game_cards:
             card.set_up(self)
 
         if self.random_order:
-            random.shuffle(self.players)
+            self.rng.shuffle(self.players)
         if not self.start_deck:
             self.start_deck = []
             for _ in range(7):
@@ -210,15 +238,87 @@ class Game:
             for _ in range(3):
                 self.start_deck.append(estate)
 
+        self.effect_registry.recorder = self.recorder
+        if self.recorder is not None:
+            self.recorder.start_game(self)
+
         for player in self.players:
             player.reset()
-            player.hand.on_add = lambda card, player=player: self.effect_registry.on_hand_add(player, card, self)
-            player.hand.on_remove = lambda card, player=player: self.effect_registry.on_hand_remove(player, card, self)
-            player.deck.on_shuffle = lambda player=player: self.effect_registry.on_shuffle(player, self)
-            player.discard_pile = DiscardPile(self.start_deck[:])
-            logger.info(f"\n{player} starts with {player.discard_pile}")
+            self._bind_player(player)
+            player.headless = self.headless
+            player.discard_pile.cards = self.start_deck[:]
+            if self.track_deck_stats:
+                player.track_deck_stats = True
+            player.recount_deck_stats()
+            if not self.headless:
+                logger.info(f"\n{player} starts with {player.discard_pile}")
             player.draw(5)
 
+    def _bind_player(self, player: Player) -> None:
+        """
+        Route the events of the player's hand and deck to this game.
+
+        """
+        player.hand.on_add = lambda card, player=player: self.effect_registry.on_hand_add(player, card, self)
+        player.hand.on_remove = lambda card, player=player: self.effect_registry.on_hand_remove(player, card, self)
+        player.deck.on_shuffle = lambda player=player: self.effect_registry.on_shuffle(player, self)
+        player.deck.rng = self.rng
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        # the events of hands and decks are not pickled with them
+        self.__dict__.update(state)
+        for player in self.players:
+            self._bind_player(player)
+
+    def __copy__(self) -> "Game":
+        # a shallow copy shares the players, which stay bound to this game
+        game = object.__new__(type(self))
+        game.__dict__.update(self.__dict__)
+        # the observer's buffer is overwritten on every observation
+        game._observer = None
+        return game
+
+    def clone(self) -> "Game":
+        """
+        Returns an independent copy of a game in progress.
+
+        Players, their zones and turn state, the supply, the trash, the effect
+        registry and the random number generator are copied. Cards, expansions
+        and deciders are shared. The copy plays on exactly like the original
+        until either one is changed, which makes it suitable for searching
+        ahead of a decision.
+
+        """
+        game = copy.copy(self)
+        game._coroutine = None
+        game._observer = None
+        game.recorder = None
+
+        players = {id(player): player.clone() for player in self.players}
+        game.players = [players[id(player)] for player in self.players]
+        game.current_player = players[id(self.current_player)]
+        for player in game.players:
+            if player.possessing_player is not None:
+                player.possessing_player = players[id(player.possessing_player)]
+
+        # Random() would seed itself from the OS only to be overwritten
+        game.rng = random.Random.__new__(random.Random)
+        game.rng.setstate(self.rng.getstate())
+        game.trash = self.trash.copy()
+        if hasattr(self, "supply"):
+            game.supply = self.supply.copy()
+
+        # effects refer to players (and rarely the game), which must become their copies
+        memo: dict[int, Any] = {id(self): game}
+        for player in self.players:
+            memo[id(player)] = players[id(player)]
+        game.effect_registry = self.effect_registry.clone(memo)
+
+        for player in game.players:
+            game._bind_player(player)
+
+        return game
+
     def is_over(self) -> bool:
         """
         The game is over if any 3 supply piles are empty or
@@ -227,20 +327,8 @@ class Game:
         Return True if the game is over
 
         """
-        empty_piles: int = 0
-        for pile in self.supply.piles:
-
-            # are provinces empty?
-            if pile.name == "Province" and len(pile) == 0:
-                return True
-
-            # are three piles empty?
-            if len(pile) == 0:
-                empty_piles += 1
-                if empty_piles >= 3:
-                    return True
-
-        return False
+        # the supply keeps count of its empty piles, so this is cheap enough to call freely
+        return self.supply.empty_end_piles > 0 or self.supply.empty_piles >= 3
 
     def play_turn(self, player: Player) -> None:
         # if player played Possession while being possessed, take the extra turn
@@ -276,16 +364,56 @@ class Game:
         player.take_extra_turn = False
 
     def play(self) -> GameResult:
-        self.start()
-        while True:
-            for player in self.players:
-                self.current_player = player
-                self.play_turn(player)
+        try:
+            self.start()
+            while True:
+                for player in self.players:
+                    self.current_player = player
+                    self.play_turn(player)
+
+                    if self.is_over():
+                        if self.recorder is not None:
+                            self.recorder.end_game()
+                        result = self.summarize_game()
+                        if not self.headless:
+                            logging.info(f"\n{result}")
+                        return result
+        finally:
+            # the recorder wraps the deciders of the players while the game is played
+            if self.recorder is not None:
+                self.recorder.restore_deciders()
+
+    def step(self, answer: Any = None) -> DecisionRequest|GameResult:
+        """
+        Play the game step by step instead of with play.
+
+        The first call starts the game. The game runs until a player with an
+        ExternalDecider (see pyminion.lockstep) has to make a decision, and the
+        request for that decision is returned. The answer is passed to the
+        next call, which resumes the game. Once the game is over, its result is
+        returned.
+
+        The game runs on a thread of its own (see GameCoroutine), so each game
+        in progress holds an OS thread, and step blocks while other players
+        take their turns. A game that is not played to the end must be stopped
+        with close, or the thread keeps waiting for the next answer.
+
+        """
+        if self._coroutine is None:
+            self._coroutine = GameCoroutine(self)
+        request = self._coroutine.send(answer)
+        if request is None:
+            assert self._coroutine.result is not None
+            return self._coroutine.result
+        return request
+
+    def close(self) -> None:
+        """
+        Stop a game that is played step by step before it is over.
 
-                if self.is_over():
-                    result = self.summarize_game()
-                    logging.info(f"\n{result}")
-                    return result
+        """
+        if self._coroutine is not None:
+            self._coroutine.close()
 
     def get_left_player(self, player: Player) -> Player:
         """
@@ -319,6 +447,17 @@ class Game:
             opponent = self.players[idx]
             yield opponent
 
+    def observe(self, player: Player) -> array:
+        """
+        Encode the game as seen by the player into a vector of floats with the
+        layout of the standard card index (see pyminion.encoding.Observer).
+        The returned buffer is reused by the next call.
+
+        """
+        if self._observer is None:
+            self._observer = Observer(len(self.players))
+        return self._observer.observe(self, player)
+
     def distribute_curses(self, attacking_player: Player, attack_card: Card) -> None:
         """
         Distribute curses in turn order.
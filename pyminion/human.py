@@ -1,6 +1,7 @@
 import functools
 import logging
 from collections import Counter
+from contextvars import ContextVar
 from typing import TYPE_CHECKING, Callable, Sequence
 
 from pyminion.core import (Card, Deck)
@@ -18,6 +19,27 @@ if TYPE_CHECKING:
 logger = logging.getLogger()
 
 
+class Terminal:
+    """
+    Where human deciders read their input and show prompts and errors.
+    Defaults to the terminal of the process.
+
+    """
+
+    def input(self, prompt: str) -> str:
+        return input(prompt)
+
+    def print(self, text: str) -> None:
+        print(text)
+
+    def error(self, error: Exception) -> None:
+        logger.error(error)
+
+
+# terminal of the human deciders in the current context
+terminal: ContextVar[Terminal] = ContextVar("terminal", default=Terminal())
+
+
 def get_matches(input_str: str, options: list[str]) -> list[str]:
     """
     Find matches in a list of options for a user input string
@@ -63,7 +85,7 @@ def validate_input(
                 try:
                     return func(*args, **kwargs)
                 except exceptions as e:
-                    logger.error(e)
+                    terminal.get().error(e)
 
         return wrapper
 
@@ -77,10 +99,10 @@ def effects_order_decision(effects: Sequence[Effect]) -> int:
     Raise exception if user provided selection is not a valid option
 
     """
-    print("Pick the next effect to occur:")
+    terminal.get().print("Pick the next effect to occur:")
     for i, effect in enumerate(effects):
-        print(f"{i + 1}: {effect.get_name()}")
-    order_input = input("Effect number: ")
+        terminal.get().print(f"{i + 1}: {effect.get_name()}")
+    order_input = terminal.get().input("Effect number: ")
 
     try:
         order_num = int(order_input)
@@ -102,7 +124,7 @@ def binary_decision(prompt: str) -> bool:
 
     """
 
-    decision = input(prompt)
+    decision = terminal.get().input(prompt)
     if decision in ("yes", "y", "Yes", "Y"):
         return True
     elif decision in ("no", "n", "No", "N"):
@@ -128,7 +150,7 @@ def single_card_decision(
     a valid_mixin.
 
     """
-    card_input = input(prompt)
+    card_input = terminal.get().input(prompt)
     if not card_input:
         return None
 
@@ -165,7 +187,7 @@ def multiple_card_decision(
     Raise exception if user provided selection is not in valid_cards.
 
     """
-    card_input = input(prompt)
+    card_input = terminal.get().input(prompt)
     if not card_input:
         return []
 
@@ -217,10 +239,10 @@ def multiple_option_decision(
     if unique and num_choices > 1:
         prompt += " (the choices must be different)"
     prompt += ":"
-    print(prompt)
+    terminal.get().print(prompt)
     for i, option in enumerate(options):
-        print(f"{i + 1}: {option}")
-    choice_input = input("Choice: ")
+        terminal.get().print(f"{i + 1}: {option}")
+    choice_input = terminal.get().input("Choice: ")
     choice_strings = [x.strip() for x in choice_input.split(",")]
 
     if len(choice_strings) != num_choices:
@@ -246,7 +268,7 @@ def multiple_option_decision(
 
 
 def deck_position_decision(prompt: str, num_deck_cards: int) -> int:
-    pos_str = input(prompt).casefold()
+    pos_str = terminal.get().input(prompt).casefold()
     if pos_str == "top":
         pos = num_deck_cards
     elif pos_str == "bottom":
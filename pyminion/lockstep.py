@@ -0,0 +1,340 @@
+import inspect
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Sequence
+
+from pyminion.decider import Decider
+from pyminion.result import GameResult
+
+if TYPE_CHECKING:
+    from pyminion.game import Game
+    from pyminion.player import Player
+
+
+# names of the methods of the decider protocol
+DECISION_METHODS: tuple[str, ...] = tuple(name for name in vars(Decider) if name.endswith("_decision"))
+
+# parameter names of each decision method, without self
+DECISION_PARAMETERS: dict[str, tuple[str, ...]] = {
+    name: tuple(inspect.signature(getattr(Decider, name)).parameters)[1:] for name in DECISION_METHODS
+}
+
+
+class DecisionRequest:
+    """
+    A decision that a game is waiting for: the name of the Decider method,
+    the arguments it was called with and the external decider that received it.
+
+    """
+
+    __slots__ = ("name", "args", "kwargs", "decider")
+
+    def __init__(self, name: str, args: tuple[Any, ...], kwargs: dict[str, Any], decider: "ExternalDecider"):
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+        self.decider = decider
+
+    def __repr__(self):
+        return f"DecisionRequest({self.name}, player={self.player})"
+
+    def get_argument(self, name: str, default: Any = None) -> Any:
+        """
+        Value of an argument of the decision by its parameter name in Decider.
+
+        """
+        index = DECISION_PARAMETERS[self.name].index(name)
+        if index < len(self.args):
+            return self.args[index]
+        return self.kwargs.get(name, default)
+
+    @property
+    def player(self) -> "Player":
+        return self.get_argument("player")
+
+    @property
+    def game(self) -> "Game":
+        return self.get_argument("game")
+
+    def answer_with(self, decider: Decider) -> Any:
+        """
+        Make the decision with a decider.
+
+        """
+        return getattr(decider, self.name)(*self.args, **self.kwargs)
+
+    def answer(self) -> Any:
+        """
+        Make the decision with the decider wrapped by the external decider.
+
+        """
+        if self.decider.decider is None:
+            raise ValueError("the external decider does not wrap a decider")
+        return self.answer_with(self.decider.decider)
+
+
+class GameExit(Exception):
+    """
+    Raised inside a suspended game that is closed before it ends.
+
+    """
+
+
+# thread state of the game that runs in the current thread
+_local = threading.local()
+
+
+class _GameThread:
+    """
+    The thread a game runs on and the state it shares with the caller. It is
+    kept apart from GameCoroutine, so the thread does not keep the coroutine
+    alive and a dropped coroutine can be closed when it is collected.
+
+    """
+
+    def __init__(self, game: "Game"):
+        self.game = game
+        self.request: DecisionRequest|None = None
+        self.result: GameResult|None = None
+        self.done = False
+        self._answer: Any = None
+        self._error: BaseException|None = None
+        self._closing = False
+        self._thread: threading.Thread|None = None
+        self._to_game = threading.Lock()
+        self._to_game.acquire()
+        self._to_caller = threading.Lock()
+        self._to_caller.acquire()
+
+    def send(self, answer: Any) -> DecisionRequest|None:
+        if self.done:
+            raise RuntimeError("game is over")
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+        self._answer = answer
+        self._to_game.release()
+        self._to_caller.acquire()
+
+        if self._error is not None:
+            error = self._error
+            self._error = None
+            raise error
+        return self.request
+
+    def close(self) -> None:
+        if self._thread is None or self.done:
+            self.done = True
+            return
+        self._closing = True
+        self._to_game.release()
+        self._to_caller.acquire()
+        self._error = None
+
+    def suspend(self, request: DecisionRequest) -> Any:
+        """
+        Called from the thread of the game: wait for the answer to a request.
+
+        """
+        self.request = request
+        self._to_caller.release()
+        self._to_game.acquire()
+        if self._closing:
+            raise GameExit()
+        return self._answer
+
+    def _run(self) -> None:
+        _local.coroutine = self
+        self._to_game.acquire()
+        try:
+            if not self._closing:
+                self.result = self.game.play()
+        except GameExit:
+            pass
+        except BaseException as error:
+            self._error = error
+        self.done = True
+        self.request = None
+        self._to_caller.release()
+
+
+class GameCoroutine:
+    """
+    Runs a game as a coroutine that suspends whenever a player with an
+    ExternalDecider has to make a decision.
+
+    send starts or resumes the game and returns the next decision request, or
+    None once the game is over and result is set. The answer to a request is
+    passed to the next call of send.
+
+    The engine calls deciders from deep inside card effects, so the game runs
+    on a thread of its own. Only one of the game and its caller runs at any
+    time: control is handed back and forth with a pair of locks, so the game
+    behaves like a generator and needs no synchronization.
+
+    This is not free: every live game parks one OS thread with its own stack
+    while it waits for an answer, and each decision costs two thread switches.
+    Thousands of games can be run at once, but they cost thousands of threads.
+    Decisions of players with regular deciders are made on the game's thread
+    while send blocks the caller until the next request.
+
+    A game that is dropped before it is over must be closed, or its thread
+    waits for an answer forever. A coroutine that is garbage collected closes
+    its game, but a game played with Game.step is referenced by its own
+    thread and is only stopped by Game.close.
+
+    """
+
+    def __init__(self, game: "Game"):
+        self._game_thread = _GameThread(game)
+        # the finalizer refers to the thread state only, so it does not keep
+        # the coroutine alive. threads are daemons, so nothing is closed at exit
+        self._finalizer = weakref.finalize(self, self._game_thread.close)
+        self._finalizer.atexit = False
+
+    @property
+    def game(self) -> "Game":
+        return self._game_thread.game
+
+    @property
+    def request(self) -> DecisionRequest|None:
+        return self._game_thread.request
+
+    @property
+    def result(self) -> GameResult|None:
+        return self._game_thread.result
+
+    @property
+    def done(self) -> bool:
+        return self._game_thread.done
+
+    def send(self, answer: Any = None) -> DecisionRequest|None:
+        """
+        Answer the pending request, or start the game if it was not started,
+        and run the game until its next request.
+
+        """
+        return self._game_thread.send(answer)
+
+    def close(self) -> None:
+        """
+        Stop a suspended game by raising GameExit inside it.
+
+        """
+        self._game_thread.close()
+
+
+class ExternalDecider:
+    """
+    Decider whose decisions are made outside of the game. Every decision
+    suspends the game it is made in and is returned to the caller of
+    GameCoroutine.send as a DecisionRequest.
+
+    Games with external deciders must be run by a GameCoroutine, for example
+    through Game.step or a LockstepDriver.
+
+    Attributes:
+        decider: optional decider that can answer the requests (see
+            DecisionRequest.answer), which lets existing bots and humans
+            play games that are run step by step.
+
+    """
+
+    def __init__(self, decider: Decider|None = None):
+        self.decider = decider
+
+
+def _make_external_decision(name: str) -> Callable[..., Any]:
+    def decision(self: ExternalDecider, *args: Any, **kwargs: Any) -> Any:
+        coroutine: _GameThread|None = getattr(_local, "coroutine", None)
+        if coroutine is None:
+            raise RuntimeError("games with an ExternalDecider must be run by a GameCoroutine")
+        return coroutine.suspend(DecisionRequest(name, args, kwargs, self))
+
+    decision.__name__ = name
+    decision.__qualname__ = f"ExternalDecider.{name}"
+    return decision
+
+
+for _name in DECISION_METHODS:
+    setattr(ExternalDecider, _name, _make_external_decision(_name))
+
+
+# answers a batch of decision requests, one answer per request in the same order
+BatchedPolicy = Callable[[list[DecisionRequest]], Sequence[Any]]
+
+
+class LockstepDriver:
+    """
+    Plays many games in lockstep and makes the decisions of their external
+    players in batches.
+
+    Each game runs until every one of them is waiting for a decision of a
+    player with an ExternalDecider or is over. The pending requests of all
+    games are then answered by one call of the policy, and the games resume.
+    This replaces one call of a model per decision with one call per round,
+    which is much faster for learned policies that evaluate batches.
+
+    Decisions of players with other deciders are made inline as usual.
+
+    Attributes:
+        games: games to play. They are started by the driver.
+        policy: answers a list of requests with a sequence of answers in the same order.
+        batches: number of calls of the policy in the last run.
+        decisions: number of requests answered in the last run.
+
+    """
+
+    def __init__(self, games: list["Game"], policy: BatchedPolicy):
+        self.games = games
+        self.policy = policy
+        self.batches = 0
+        self.decisions = 0
+
+    def run(self) -> list[GameResult]:
+        """
+        Play all games to the end and return their results in the order of the games.
+
+        """
+        self.batches = 0
+        self.decisions = 0
+        coroutines = [GameCoroutine(game) for game in self.games]
+        results: list[GameResult|None] = [None] * len(coroutines)
+
+        try:
+            pending: dict[int, DecisionRequest] = {}
+            for i, coroutine in enumerate(coroutines):
+                request = coroutine.send(None)
+                if request is None:
+                    results[i] = coroutine.result
+                else:
+                    pending[i] = request
+
+            while pending:
+                requests = list(pending.values())
+                answers = self.policy(requests)
+                if len(answers) != len(requests):
+                    raise ValueError(f"policy returned {len(answers)} answers to {len(requests)} requests")
+                self.batches += 1
+                self.decisions += len(requests)
+
+                indices = list(pending)
+                pending = {}
+                for i, answer in zip(indices, answers):
+                    request = coroutines[i].send(answer)
+                    if request is None:
+                        results[i] = coroutines[i].result
+                    else:
+                        pending[i] = request
+
+        finally:
+            for coroutine in coroutines:
+                coroutine.close()
+
+        finished: list[GameResult] = []
+        for i, result in enumerate(results):
+            if result is None:
+                raise RuntimeError(f"game {i} finished without a result")
+            finished.append(result)
+        return finished
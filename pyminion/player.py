@@ -1,9 +1,11 @@
 import logging
+from collections import Counter
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Iterable, Iterator
 
-from pyminion.core import (AbstractDeck, Action, CardType, Card, Deck, DiscardPile, Hand,
-                           Playmat, Supply, Trash, Treasure, get_action_cards, get_treasure_cards,
+from pyminion.core import (AbstractDeck, Action, CardType, Card, CountedDeck,
+                           CountedDiscardPile, CountedHand, Deck, DiscardPile, Hand,
+                           Pile, Playmat, Supply, Trash, Treasure, get_action_cards, get_treasure_cards,
                            get_score_cards)
 from pyminion.decider import Decider
 from pyminion.exceptions import (CardNotFound, EmptyPile, InsufficientBuys,
@@ -34,6 +36,14 @@ class Player:
     Basic representation of a player including the piles of cards they own
     and the basic actions they can take to manipulate the state of the game.
 
+    If counted_zones is True, the deck, discard pile and hand keep a count of
+    each card so membership tests and card counts do not scan the zones.
+
+    If track_deck_stats is True, the player keeps count of the cards they own
+    and their money as cards are gained, trashed and passed, so deck queries
+    like get_card_count and get_victory_points do not walk every card.
+    Set debug_deck_stats to check the counts against a full recount at the end of each turn.
+
     """
 
     def __init__(
@@ -45,6 +55,8 @@ class Player:
         playmat: Playmat|None = None,
         state: State|None = None,
         player_id: str = "",
+        counted_zones: bool = False,
+        track_deck_stats: bool = False,
     ):
         self.decider = decider
         self.deck = deck if deck else Deck()
@@ -66,10 +78,59 @@ class Player:
         self.possessing_player: Player|None = None
         self.possession_trash = Trash()
         self.next_turn_draw: int = 5
+        self.headless: bool = False
+
+        self.track_deck_stats = track_deck_stats
+        self.debug_deck_stats: bool = False
+        self.owned_cards: Counter[Card] = Counter()
+        self.owned_card_total: int = 0
+        self.owned_treasure_count: int = 0
+        self.owned_action_count: int = 0
+        self.owned_treasure_money: int = 0
+        self.owned_action_money: int = 0
+
+        if counted_zones:
+            self.use_counted_zones()
 
     def __repr__(self):
         return f"{self.player_id}"
 
+    def use_counted_zones(self) -> None:
+        """
+        Replace the deck, discard pile and hand with counted zones holding the same cards.
+
+        """
+        if not isinstance(self.deck, CountedDeck):
+            self.deck = CountedDeck(self.deck.cards, self.deck.on_add, self.deck.on_remove, self.deck.on_shuffle, self.deck.rng)
+        if not isinstance(self.discard_pile, CountedDiscardPile):
+            self.discard_pile = CountedDiscardPile(self.discard_pile.cards)
+        if not isinstance(self.hand, CountedHand):
+            self.hand = CountedHand(self.hand.cards, self.hand.on_add, self.hand.on_remove)
+
+    def clone(self) -> "Player":
+        """
+        Returns a copy of the player with copies of all their zones and turn state.
+        The decider is shared. The zones of the copy have no callbacks and
+        possessing_player still refers to the original player; Game.clone
+        binds both to the cloned game.
+
+        """
+        player = object.__new__(type(self))
+        player.__dict__.update(self.__dict__)
+        player.deck = self.deck.copy()
+        player.discard_pile = self.discard_pile.copy()
+        player.hand = self.hand.copy()
+        player.playmat = self.playmat.copy()
+        player.set_aside = self.set_aside.copy()
+        player.mats = {name: mat.copy() for name, mat in self.mats.items()}
+        player.state = State(self.state.actions, self.state.money, self.state.potions, self.state.buys)
+        player.playmat_persist_counts = self.playmat_persist_counts.copy()
+        player.current_turn_gains = self.current_turn_gains[:]
+        player.last_turn_gains = self.last_turn_gains[:]
+        player.possession_trash = self.possession_trash.copy()
+        player.owned_cards = self.owned_cards.copy()
+        return player
+
     def reset(self) -> None:
         """
         Reset the state of the player to a pre-game state.
@@ -92,6 +153,67 @@ class Player:
         self.take_possession_turn = False
         self.possessing_player = None
         self.next_turn_draw = 5
+        self.recount_deck_stats()
+
+    def recount_deck_stats(self) -> None:
+        """
+        Recount the tracked deck stats from all the cards in the player's possession.
+
+        """
+        self.owned_cards = Counter()
+        self.owned_card_total = 0
+        self.owned_treasure_count = 0
+        self.owned_action_count = 0
+        self.owned_treasure_money = 0
+        self.owned_action_money = 0
+        if self.track_deck_stats:
+            for card in self.get_all_cards():
+                self._update_deck_stats(card, 1)
+
+    def check_deck_stats(self) -> None:
+        """
+        Check the tracked deck stats against a full recount.
+
+        """
+        owned_cards = Counter(self.get_all_cards())
+        assert self.owned_cards == owned_cards, f"{self} tracked cards {self.owned_cards} != {owned_cards}"
+        assert self.owned_card_total == sum(owned_cards.values())
+        assert self.owned_treasure_count == sum(1 for _ in get_treasure_cards(owned_cards.elements()))
+        assert self.owned_action_count == sum(1 for _ in get_action_cards(owned_cards.elements()))
+        assert self.owned_treasure_money == sum(c.money for c in get_treasure_cards(owned_cards.elements()))
+        assert self.owned_action_money == sum(c.money for c in get_action_cards(owned_cards.elements()))
+
+    def _update_deck_stats(self, card: Card, count: int) -> None:
+        owned = self.owned_cards[card] + count
+        if owned == 0:
+            del self.owned_cards[card]
+        else:
+            self.owned_cards[card] = owned
+        self.owned_card_total += count
+        if CardType.Treasure in card.type:
+            assert isinstance(card, Treasure)
+            self.owned_treasure_count += count
+            self.owned_treasure_money += card.money * count
+        if CardType.Action in card.type:
+            assert isinstance(card, Action)
+            self.owned_action_count += count
+            self.owned_action_money += card.money * count
+
+    def add_owned_card(self, card: Card) -> None:
+        """
+        Update the tracked deck stats for a card that came into the player's possession.
+
+        """
+        if self.track_deck_stats:
+            self._update_deck_stats(card, 1)
+
+    def remove_owned_card(self, card: Card) -> None:
+        """
+        Update the tracked deck stats for a card that left the player's possession.
+
+        """
+        if self.track_deck_stats:
+            self._update_deck_stats(card, -1)
 
     def add_playmat_persistent_card(self, card: Card) -> None:
         name = card.name
@@ -133,6 +255,7 @@ class Player:
         """
         if destination is None:
             destination = self.hand
+        log_draw = not silent and not self.headless
         drawn_cards: AbstractDeck = AbstractDeck()
         for _ in range(num_cards):
             # Both deck and discard empty -> do nothing
@@ -141,16 +264,18 @@ class Player:
             else:
                 # Deck is empty -> shuffle discard pile into deck
                 if len(self.deck) == 0:
-                    logger.info(f"{self} shuffles their deck")
+                    if not self.headless:
+                        logger.info(f"{self} shuffles their deck")
                     self.discard_pile.move_to(self.deck)
                     self.deck.shuffle()
                     self.shuffles += 1
 
                 draw_card = self.deck.draw()
                 destination.add(draw_card)
-                drawn_cards.add(draw_card)
+                if log_draw:
+                    drawn_cards.add(draw_card)
 
-        if not silent:
+        if log_draw:
             logger.info(f"{self} draws {drawn_cards}")
 
     def discard(
@@ -169,7 +294,7 @@ class Player:
         for card in source.cards:
             if card == target_card:
                 self.discard_pile.add(source.remove(card))
-                if not silent:
+                if not silent and not self.headless:
                     logger.info(f"{self} discards {card}")
                 game.effect_registry.on_discard(self, card, game, source)
                 return
@@ -183,21 +308,20 @@ class Player:
         but is overridden for cards like vassal and throne room.
 
         """
-        if target_card not in self.hand.cards:
+        if target_card not in self.hand:
             raise CardNotFound(f"Invalid play, {target_card} not in hand")
-        for card in self.hand.cards:
-            if card.name == target_card.name:
-                if CardType.Action in card.type:
-                    assert isinstance(card, Action)
-                    self.actions_played_this_turn += 1
-                    card.play(player=self, game=game, generic_play=generic_play)
-                    game.effect_registry.on_play(self, card, game)
-                    return
-                if CardType.Treasure in card.type:
-                    assert isinstance(card, Treasure)
-                    card.play(player=self, game=game)
-                    game.effect_registry.on_play(self, card, game)
-                    return
+        card = target_card
+        if CardType.Action in card.type:
+            assert isinstance(card, Action)
+            self.actions_played_this_turn += 1
+            card.play(player=self, game=game, generic_play=generic_play)
+            game.effect_registry.on_play(self, card, game)
+            return
+        if CardType.Treasure in card.type:
+            assert isinstance(card, Treasure)
+            card.play(player=self, game=game)
+            game.effect_registry.on_play(self, card, game)
+            return
         raise InvalidCardPlay(f"Invalid play, {target_card} could not be played")
 
     def exact_play(self, card: Card, game: "Game", generic_play: bool = True) -> None:
@@ -253,7 +377,8 @@ class Player:
         self.state.potions -= cost.potions
         self.state.buys -= 1
 
-        logger.info(f"{self} buys {card}")
+        if not self.headless:
+            logger.info(f"{self} buys {card}")
 
         if self.possessing_player is None:
             try:
@@ -261,6 +386,7 @@ class Player:
             except EmptyPile as e:
                 raise e
             self.discard_pile.add(card)
+            self.add_owned_card(card)
             self.current_turn_gains.append((game.current_phase, card))
             game.effect_registry.on_buy(self, card, game, self.discard_pile)
         else:
@@ -286,8 +412,10 @@ class Player:
         if self.possessing_player is None:
             gain_card = source.remove(card)
             destination.add(gain_card)
+            self.add_owned_card(gain_card)
             self.current_turn_gains.append((game.current_phase, card))
-            logger.info(f"{self} gains {gain_card}")
+            if not self.headless:
+                logger.info(f"{self} gains {gain_card}")
             game.effect_registry.on_gain(self, card, game, destination)
         else:
             self.possessing_player.gain(card, game, destination=self.possessing_player.discard_pile, source=source)
@@ -327,9 +455,15 @@ class Player:
                 source.remove(card)
                 if self.possessing_player is None:
                     game.trash.add(card)
+                    if not isinstance(source, Pile):
+                        self.remove_owned_card(card)
                 else:
+                    # cards trashed while possessed are returned to the discard pile
                     self.possession_trash.add(card)
-                logger.info(f"{self} trashes {card}")
+                    if isinstance(source, Pile):
+                        self.add_owned_card(card)
+                if not self.headless:
+                    logger.info(f"{self} trashes {card}")
                 game.effect_registry.on_trash(self, card, game)
 
                 break
@@ -341,10 +475,11 @@ class Player:
         """
         if isinstance(cards, Card):
             cards = [cards]
-        if message is None:
-            message = f"{self} reveals "
 
-        logger.info(message + ", ".join(card.name for card in cards))
+        if not self.headless:
+            if message is None:
+                message = f"{self} reveals "
+            logger.info(message + ", ".join(card.name for card in cards))
         for card in cards:
             game.effect_registry.on_reveal(self, card, game)
 
@@ -356,7 +491,8 @@ class Player:
         if isinstance(cards, Card):
             cards = [cards]
 
-        logger.info(f"{self} topdecks " + ", ".join(card.name for card in cards))
+        if not self.headless:
+            logger.info(f"{self} topdecks " + ", ".join(card.name for card in cards))
         for card in cards:
             source.remove(card)
             self.deck.add(card)
@@ -372,23 +508,25 @@ class Player:
         self.state.potions = 0
         self.state.buys = 1
 
-        if is_extra_turn:
-            if self.possessing_player is None:
+        if not is_extra_turn:
+            # extra turns do not count toward the total number of turns
+            self.turns += 1
+
+        if not self.headless:
+            if not is_extra_turn:
+                logger.info(f"\nTurn {self.turns} - {self.player_id}")
+            elif self.possessing_player is None:
                 logger.info(f"\nTurn {self.turns} (extra) - {self.player_id}")
             else:
                 logger.info(f"\nTurn {self.turns} (possession) - {self.player_id} possessed by {self.possessing_player}")
-        else:
-            # extra turns do not count toward the total number of turns
-            self.turns += 1
-            logger.info(f"\nTurn {self.turns} - {self.player_id}")
 
-        for mat_name in self.mats:
-            mat = self.mats[mat_name]
-            if len(mat) > 0:
-                logger.info(f"{self.player_id}'s {mat_name} mat: {mat}")
+            for mat_name in self.mats:
+                mat = self.mats[mat_name]
+                if len(mat) > 0:
+                    logger.info(f"{self.player_id}'s {mat_name} mat: {mat}")
 
-        if len(self.playmat) > 0:
-            logger.info(f"{self.player_id}'s cards in play: {self.playmat}")
+            if len(self.playmat) > 0:
+                logger.info(f"{self.player_id}'s cards in play: {self.playmat}")
 
         game.effect_registry.on_turn_start(self, game)
 
@@ -396,7 +534,8 @@ class Player:
         game.current_phase = game.Phase.Action
 
         while self.state.actions > 0:
-            logger.info(f"{self.player_id}'s hand: {self.hand}")
+            if not self.headless:
+                logger.info(f"{self.player_id}'s hand: {self.hand}")
 
             viable_actions = [card for card in self.hand.cards if CardType.Action in card.type]
             if not viable_actions:
@@ -413,7 +552,8 @@ class Player:
 
         viable_treasures = [card for card in self.hand.cards if CardType.Treasure in card.type]
         while len(viable_treasures) > 0:
-            logger.info(f"Hand: {self.hand}")
+            if not self.headless:
+                logger.info(f"Hand: {self.hand}")
 
             cards = self.decider.treasure_phase_decision(viable_treasures, self, game)
             if len(cards) == 0:
@@ -421,18 +561,20 @@ class Player:
 
             for card in cards:
                 self.exact_play(card, game)
-            cards_str = ", ".join([str(c) for c in cards])
-            logger.info(f"{self.player_id} played {cards_str}")
+            if not self.headless:
+                cards_str = ", ".join([str(c) for c in cards])
+                logger.info(f"{self.player_id} played {cards_str}")
 
             viable_treasures = [card for card in self.hand.cards if CardType.Treasure in card.type]
 
     def start_buy_phase(self, game: "Game") -> None:
         while self.state.buys > 0:
-            logger.info(game.supply.get_pretty_string(self, game))
-            logger.info(f"Money: {self.state.money}")
-            if self.state.potions > 0:
-                logger.info(f"Potions: {self.state.potions}")
-            logger.info(f"Buys: {self.state.buys}")
+            if not self.headless:
+                logger.info(game.supply.get_pretty_string(self, game))
+                logger.info(f"Money: {self.state.money}")
+                if self.state.potions > 0:
+                    logger.info(f"Potions: {self.state.potions}")
+                logger.info(f"Buys: {self.state.buys}")
 
             valid_cards = [
                 c
@@ -447,7 +589,8 @@ class Player:
             )
 
             if card is None:
-                logger.info(f"{self} buys nothing")
+                if not self.headless:
+                    logger.info(f"{self} buys nothing")
                 break
 
             self.buy(card, game)
@@ -489,6 +632,10 @@ class Player:
     def end_turn(self, game: "Game") -> None:
         game.effect_registry.on_turn_end(self, game)
 
+        # cards trashed while possessed are only returned once the possession turn is over
+        if self.track_deck_stats and self.debug_deck_stats and self.possessing_player is None:
+            self.check_deck_stats()
+
         self.last_turn_gains = self.current_turn_gains
         self.current_turn_gains = []
 
@@ -513,6 +660,9 @@ class Player:
         if len(opponent.possession_trash) > 0:
             opponent.possession_trash.move_to(opponent.discard_pile)
 
+        if opponent.track_deck_stats and opponent.debug_deck_stats:
+            opponent.check_deck_stats()
+
         # reset opponent's state
         opponent.decider = original_decider
         opponent.possessing_player = None
@@ -548,14 +698,45 @@ class Player:
         Get all the cards the player has in their possession.
 
         """
+        if self.track_deck_stats:
+            return self.owned_card_total
         return sum(1 for _ in self.get_all_cards())
 
+    def get_treasure_count(self) -> int:
+        """
+        Get count of the treasure cards in player's whole deck.
+
+        """
+        if self.track_deck_stats:
+            return self.owned_treasure_count
+        return sum(1 for _ in get_treasure_cards(self.get_all_cards()))
+
+    def get_action_count(self) -> int:
+        """
+        Get count of the action cards in player's whole deck.
+
+        """
+        if self.track_deck_stats:
+            return self.owned_action_count
+        return sum(1 for _ in get_action_cards(self.get_all_cards()))
+
     def get_card_count(self, card: Card) -> int:
         """
         Get count of a specific card in player's whole deck.
 
         """
-        return sum(1 for c in self.get_all_cards() if c == card)
+        if self.track_deck_stats:
+            return self.owned_cards[card]
+        count = (
+            self.deck.count(card)
+            + self.discard_pile.count(card)
+            + self.playmat.count(card)
+            + self.hand.count(card)
+            + self.set_aside.count(card)
+        )
+        for mat in self.mats.values():
+            count += mat.count(card)
+        return count
 
     def get_victory_points(self) -> int:
         """
@@ -563,6 +744,10 @@ class Player:
 
         """
         total_vp: int = 0
+        if self.track_deck_stats:
+            for card in get_score_cards(self.owned_cards):
+                total_vp += card.score(self) * self.owned_cards[card]
+            return total_vp
         for card in get_score_cards(self.get_all_cards()):
             total_vp += card.score(self)
         return total_vp
@@ -572,6 +757,8 @@ class Player:
         Return the amount of money a player has in their deck from treasure cards.
 
         """
+        if self.track_deck_stats:
+            return self.owned_treasure_money
         total_money: int = 0
         for card in get_treasure_cards(self.get_all_cards()):
             total_money += card.money
@@ -582,6 +769,8 @@ class Player:
         Return the amount of money a player has in their deck from action cards.
 
         """
+        if self.track_deck_stats:
+            return self.owned_action_money
         total_money: int = 0
         for card in get_action_cards(self.get_all_cards()):
             total_money += card.money
@@ -0,0 +1,426 @@
+import struct
+from dataclasses import dataclass, field
+from enum import IntEnum, unique
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable, Iterator
+
+from pyminion.core import Card, get_name_key
+from pyminion.decider import Decider
+from pyminion.encoding import CardIndex, get_standard_card_index
+from pyminion.lockstep import DECISION_METHODS, DECISION_PARAMETERS
+from pyminion.player import Player
+from pyminion.result import GameResult
+
+if TYPE_CHECKING:
+    from pyminion.game import Game
+
+
+@unique
+class Event(IntEnum):
+    """
+    Kinds of records in a game log.
+
+    """
+
+    GameStart = 0
+    TurnStart = 1
+    HandAdd = 2
+    Play = 3
+    Buy = 4
+    Gain = 5
+    Trash = 6
+    Reveal = 7
+    Discard = 8
+    Shuffle = 9
+    Decision = 10
+    GameEnd = 11
+
+
+LOG_VERSION = 1
+
+# plain ints are faster to pack than enum members
+_BUY = int(Event.Buy)
+_DISCARD = int(Event.Discard)
+_GAIN = int(Event.Gain)
+_HAND_ADD = int(Event.HandAdd)
+_PLAY = int(Event.Play)
+_REVEAL = int(Event.Reveal)
+_TRASH = int(Event.Trash)
+
+# event, player, card
+_pack_card_event = struct.Struct("<BBB").pack
+# event, version, has seed, seed, card index key, number of players
+_HEADER = struct.Struct("<BBBQQB")
+_INT = struct.Struct("<h")
+
+# decisions by the type of their answer
+_CARD_DECISIONS = {"action_phase_decision", "buy_phase_decision", "multi_play_decision"}
+_INT_DECISIONS = {"effects_order_decision", "deck_position_decision"}
+_BOOL_DECISIONS = {"binary_decision"}
+_INTS_DECISIONS = {"multiple_option_decision"}
+
+_DECISION_IDS = {name: i for i, name in enumerate(DECISION_METHODS)}
+
+
+def get_card_index_key(card_index: CardIndex) -> int:
+    """
+    Key of the ids of a card index, which must be the same when a log is read.
+
+    """
+    return get_name_key("\n".join(card.name for card in card_index.cards))
+
+
+class GameRecorder:
+    """
+    Records games as a compact binary log of their events, which can be read
+    with read_game_logs and replayed with replay_game.
+
+    Each game is one record stream: a header with the seed of the game (if
+    known), the players in turn order, the kingdom and the starting deck,
+    followed by one record per event. Most events are 3 bytes: the kind of
+    event, the player and the card. Shuffles record the new order of the
+    deck and decisions record their answer, which makes the log enough to
+    replay the game without its deciders. Records are collected in memory
+    and written to the stream when the game ends.
+
+    Attach the recorder with Game(recorder=...). Games of a sequential
+    Simulator share the recorder of their game, so the stream holds one log
+    per game. Copies made with Game.clone are not recorded.
+
+    The deciders of the players are wrapped to record their decisions while
+    a game is played, and put back when it ends or stops with an error.
+
+    Attributes:
+        stream: binary stream the logs are written to.
+        card_index: ids of the cards. Defaults to the standard index.
+
+    """
+
+    def __init__(self, stream: BinaryIO, card_index: CardIndex|None = None):
+        self.stream = stream
+        self.card_index = card_index if card_index else get_standard_card_index()
+        if len(self.card_index) > 254:
+            raise ValueError("a card index for game logs can have at most 254 cards")
+        self.card_ids = self.card_index.ids
+        self.buffer = bytearray()
+        self.player_indices: dict[Player, int] = {}
+        # deciders of the players of the current game before they were wrapped
+        self._deciders: dict[Player, Decider] = {}
+        self._index_key = get_card_index_key(self.card_index)
+
+    def start_game(self, game: "Game") -> None:
+        """
+        Record the header of a game once the supply is set up and the turn
+        order is known, and record the decisions of its players.
+
+        """
+        self.buffer.clear()
+        self.player_indices = {player: i for i, player in enumerate(game.players)}
+
+        seed = game.seed
+        self.buffer += _HEADER.pack(
+            Event.GameStart, LOG_VERSION, seed is not None, 0 if seed is None else seed & 0xFFFFFFFFFFFFFFFF,
+            self._index_key, len(game.players),
+        )
+        for player in game.players:
+            player_id = player.player_id.encode()
+            self.buffer.append(len(player_id))
+            self.buffer += player_id
+        self._add_cards([pile.cards[0] for pile in game.supply.kingdom_piles])
+        self._add_cards(game.start_deck if game.start_deck else [])
+
+        self.restore_deciders()
+        for player in game.players:
+            self._deciders[player] = player.decider
+            player.decider = RecordingDecider(player.decider, self)
+
+    def end_game(self) -> None:
+        """
+        Record the end of the game and write its log to the stream.
+
+        """
+        self.buffer.append(Event.GameEnd)
+        self.stream.write(self.buffer)
+        self.buffer.clear()
+        self.restore_deciders()
+
+    def restore_deciders(self) -> None:
+        """
+        Give the players of the current game back the deciders they had
+        before the game started.
+
+        """
+        for player, decider in self._deciders.items():
+            player.decider = decider
+        self._deciders.clear()
+
+    def on_buy(self, player: Player, card: Card) -> None:
+        self.buffer += _pack_card_event(_BUY, self.player_indices[player], self.card_ids[card])
+
+    def on_discard(self, player: Player, card: Card) -> None:
+        self.buffer += _pack_card_event(_DISCARD, self.player_indices[player], self.card_ids[card])
+
+    def on_gain(self, player: Player, card: Card) -> None:
+        self.buffer += _pack_card_event(_GAIN, self.player_indices[player], self.card_ids[card])
+
+    def on_hand_add(self, player: Player, card: Card) -> None:
+        self.buffer += _pack_card_event(_HAND_ADD, self.player_indices[player], self.card_ids[card])
+
+    def on_play(self, player: Player, card: Card) -> None:
+        self.buffer += _pack_card_event(_PLAY, self.player_indices[player], self.card_ids[card])
+
+    def on_reveal(self, player: Player, card: Card) -> None:
+        self.buffer += _pack_card_event(_REVEAL, self.player_indices[player], self.card_ids[card])
+
+    def on_trash(self, player: Player, card: Card) -> None:
+        self.buffer += _pack_card_event(_TRASH, self.player_indices[player], self.card_ids[card])
+
+    def on_shuffle(self, player: Player) -> None:
+        self.buffer.append(Event.Shuffle)
+        self.buffer.append(self.player_indices[player])
+        self._add_cards(player.deck.cards)
+
+    def on_turn_start(self, player: Player) -> None:
+        self.buffer.append(Event.TurnStart)
+        self.buffer.append(self.player_indices[player])
+
+    def add_decision(self, name: str, player: Player, answer: Any) -> None:
+        buffer = self.buffer
+        buffer.append(Event.Decision)
+        buffer.append(self.player_indices[player])
+        buffer.append(_DECISION_IDS[name])
+        if name in _CARD_DECISIONS:
+            buffer.append(0 if answer is None else self.card_ids[answer] + 1)
+        elif name in _INT_DECISIONS:
+            buffer += _INT.pack(answer)
+        elif name in _BOOL_DECISIONS:
+            buffer.append(1 if answer else 0)
+        elif name in _INTS_DECISIONS:
+            buffer.append(len(answer))
+            for value in answer:
+                buffer += _INT.pack(value)
+        else:
+            self._add_cards(answer)
+
+    def _add_cards(self, cards: list[Card]) -> None:
+        if len(cards) > 255:
+            raise ValueError("at most 255 cards can be recorded at once")
+        card_ids = self.card_ids
+        self.buffer.append(len(cards))
+        self.buffer += bytes([card_ids[card] for card in cards])
+
+
+class RecordingDecider:
+    """
+    Decider that records the decisions of another decider in a game log.
+    Decisions in copies of the recorded game are not recorded.
+
+    """
+
+    def __init__(self, decider: Decider, recorder: GameRecorder):
+        self.decider = decider
+        self.recorder = recorder
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.decider, name)
+
+
+def _make_recording_decision(name: str) -> Callable[..., Any]:
+    parameters = DECISION_PARAMETERS[name]
+    player_index = parameters.index("player")
+    game_index = parameters.index("game")
+
+    def decision(self: RecordingDecider, *args: Any, **kwargs: Any) -> Any:
+        answer = getattr(self.decider, name)(*args, **kwargs)
+        game = args[game_index] if game_index < len(args) else kwargs["game"]
+        if game.recorder is self.recorder:
+            player = args[player_index] if player_index < len(args) else kwargs["player"]
+            self.recorder.add_decision(name, player, answer)
+        return answer
+
+    decision.__name__ = name
+    decision.__qualname__ = f"RecordingDecider.{name}"
+    return decision
+
+
+for _name in DECISION_METHODS:
+    setattr(RecordingDecider, _name, _make_recording_decision(_name))
+
+
+@dataclass
+class GameLog:
+    """
+    A game read from a log. Players are referred to by their index in the turn order.
+
+    Events are tuples of the event, the player and its data: the card for card
+    events, None for turn starts, the new deck order for shuffles and the name
+    of the decision and its answer for decisions.
+
+    """
+
+    seed: int|None
+    player_ids: list[str]
+    kingdom: list[Card]
+    start_deck: list[Card]
+    events: list[tuple[Event, int, Any]] = field(default_factory=list)
+
+
+def read_game_logs(stream: BinaryIO, card_index: CardIndex|None = None) -> Iterator[GameLog]:
+    """
+    Read the games of a log written by a GameRecorder.
+
+    """
+    card_index = card_index if card_index else get_standard_card_index()
+    reader = _LogReader(stream.read(), card_index.cards)
+    index_key = get_card_index_key(card_index)
+    while not reader.at_end():
+        yield reader.read_game(index_key)
+
+
+class _LogReader:
+    def __init__(self, data: bytes, cards: list[Card]):
+        self.data = data
+        self.cards = cards
+        self.position = 0
+
+    def at_end(self) -> bool:
+        return self.position >= len(self.data)
+
+    def read_byte(self) -> int:
+        value = self.data[self.position]
+        self.position += 1
+        return value
+
+    def read_int(self) -> int:
+        (value,) = _INT.unpack_from(self.data, self.position)
+        self.position += _INT.size
+        return value
+
+    def read_cards(self) -> list[Card]:
+        count = self.read_byte()
+        start = self.position
+        self.position += count
+        cards = self.cards
+        return [cards[card_id] for card_id in self.data[start:self.position]]
+
+    def read_game(self, index_key: int) -> GameLog:
+        event, version, has_seed, seed, log_index_key, num_players = _HEADER.unpack_from(self.data, self.position)
+        if event != Event.GameStart or version != LOG_VERSION:
+            raise ValueError(f"not the start of a game log of version {LOG_VERSION}")
+        if log_index_key != index_key:
+            raise ValueError("the game log was written with a different card index")
+        self.position += _HEADER.size
+
+        player_ids = []
+        for _ in range(num_players):
+            length = self.read_byte()
+            player_ids.append(self.data[self.position:self.position + length].decode())
+            self.position += length
+        log = GameLog(
+            seed=seed if has_seed else None,
+            player_ids=player_ids,
+            kingdom=self.read_cards(),
+            start_deck=self.read_cards(),
+        )
+
+        cards = self.cards
+        events = log.events
+        data = self.data
+        while True:
+            event = Event(self.read_byte())
+            if event == Event.GameEnd:
+                return log
+            player = self.read_byte()
+            if event == Event.TurnStart:
+                events.append((event, player, None))
+            elif event == Event.Shuffle:
+                events.append((event, player, self.read_cards()))
+            elif event == Event.Decision:
+                name = DECISION_METHODS[self.read_byte()]
+                events.append((event, player, (name, self.read_answer(name))))
+            else:
+                events.append((event, player, cards[data[self.position]]))
+                self.position += 1
+
+    def read_answer(self, name: str) -> Any:
+        if name in _CARD_DECISIONS:
+            card_id = self.read_byte()
+            return None if card_id == 0 else self.cards[card_id - 1]
+        elif name in _INT_DECISIONS:
+            return self.read_int()
+        elif name in _BOOL_DECISIONS:
+            return self.read_byte() == 1
+        elif name in _INTS_DECISIONS:
+            return [self.read_int() for _ in range(self.read_byte())]
+        else:
+            return self.read_cards()
+
+
+class _Replay:
+    """
+    Source of the random outcomes and decisions of a logged game.
+
+    """
+
+    def __init__(self, log: GameLog):
+        self.shuffles = iter([cards for event, _, cards in log.events if event == Event.Shuffle])
+        self.decisions = iter([decision for event, _, decision in log.events if event == Event.Decision])
+
+    def shuffle(self, cards: list[Card]) -> None:
+        order = next(self.shuffles, None)
+        if order is None or len(order) != len(cards):
+            raise ValueError("the game does not match its log")
+        cards[:] = order
+
+    def sample(self, population: list[Card], k: int) -> list[Card]:
+        # the whole kingdom is given, so no cards are drawn
+        assert k == 0
+        return []
+
+    def decide(self, name: str) -> Any:
+        decision = next(self.decisions, None)
+        if decision is None or decision[0] != name:
+            raise ValueError("the game does not match its log")
+        return decision[1]
+
+
+class _ReplayDecider:
+    def __init__(self, replay: _Replay):
+        self.replay = replay
+
+
+def _make_replay_decision(name: str) -> Callable[..., Any]:
+    def decision(self: _ReplayDecider, *args: Any, **kwargs: Any) -> Any:
+        return self.replay.decide(name)
+
+    decision.__name__ = name
+    decision.__qualname__ = f"_ReplayDecider.{name}"
+    return decision
+
+
+for _name in DECISION_METHODS:
+    setattr(_ReplayDecider, _name, _make_replay_decision(_name))
+
+
+def replay_game(log: GameLog, recorder: GameRecorder|None = None) -> GameResult:
+    """
+    Play a logged game again and return its result. The shuffles and the
+    decisions of the players are taken from the log, so the game is identical
+    to the logged game. If a recorder is given, the replayed game is recorded.
+
+    """
+    from pyminion.game import Game
+
+    replay = _Replay(log)
+    decider = _ReplayDecider(replay)
+    game = Game(
+        players=[Player(decider=decider, player_id=player_id) for player_id in log.player_ids],
+        expansions=[log.kingdom],
+        kingdom_cards=log.kingdom,
+        start_deck=log.start_deck,
+        random_order=False,
+        headless=True,
+        seed=log.seed,
+        rng=replay,  # type: ignore
+        recorder=recorder,
+    )
+    return game.play()
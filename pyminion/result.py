@@ -1,9 +1,12 @@
+import math
+from collections import Counter
 from dataclasses import dataclass, field
 from enum import Enum
+from statistics import NormalDist
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from pyminion.core import DeckCounter
+    from pyminion.core import Card, DeckCounter
     from pyminion.game import Game
     from pyminion.player import Player
 
@@ -85,12 +88,99 @@ class GameResult:
         return f"Game Result: {result}{format_summaries}"
 
 
+def get_mean(counts: Counter[int]) -> float:
+    """
+    helper function to compute the mean of a histogram
+
+    """
+    total = sum(counts.values())
+    if total == 0:
+        return 0.0
+    return sum(value * count for value, count in counts.items()) / total
+
+
+def get_wilson_interval(successes: float, total: int, confidence: float = 0.95) -> tuple[float, float]:
+    """
+    Wilson score interval of a proportion of successes in a number of trials.
+    Unlike the normal approximation, it stays within [0, 1] and behaves well
+    for small samples and proportions close to 0 or 1.
+
+    """
+    if total == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    p = successes / total
+    denominator = 1 + z * z / total
+    center = (p + z * z / (2 * total)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
 @dataclass
 class PlayerSimulatorResult:
+    """
+    holds running aggregates of a player's games over a simulation
+
+    Histograms map a value to the number of games it occurred in.
+    deck_counts maps a card to a histogram of how many copies the player
+    ended the game with, games where the player did not own the card are not counted.
+
+    The win rate counts ties as half a win, win_interval is its Wilson
+    interval at the given confidence.
+
+    """
+
     player: "Player"
     wins: int
     losses: int
     ties: int
+    score_counts: Counter[int] = field(default_factory=Counter)
+    turn_counts: Counter[int] = field(default_factory=Counter)
+    deck_counts: dict["Card", Counter[int]] = field(default_factory=dict)
+    confidence: float = 0.95
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.losses + self.ties
+
+    @property
+    def win_rate(self) -> float:
+        games = self.games
+        if games == 0:
+            return 0.0
+        return (self.wins + self.ties / 2) / games
+
+    @property
+    def win_interval(self) -> tuple[float, float]:
+        return get_wilson_interval(self.wins + self.ties / 2, self.games, self.confidence)
+
+    @property
+    def mean_score(self) -> float:
+        return get_mean(self.score_counts)
+
+    @property
+    def mean_turns(self) -> float:
+        return get_mean(self.turn_counts)
+
+    def add_summary(self, summary: PlayerSummary) -> None:
+        """
+        Fold the summary of a single game into the aggregates.
+
+        """
+        if summary.result == GameOutcome.win:
+            self.wins += 1
+        elif summary.result == GameOutcome.tie:
+            self.ties += 1
+        else:
+            self.losses += 1
+
+        self.score_counts[summary.score] += 1
+        self.turn_counts[summary.turns] += 1
+        for card, count in summary.deck.items():
+            if card in self.deck_counts:
+                self.deck_counts[card][count] += 1
+            else:
+                self.deck_counts[card] = Counter({count: 1})
 
 
 @dataclass
@@ -103,12 +193,20 @@ class SimulatorResult:
     iterations: int
     game_results: list[GameResult]
     player_results: list[PlayerSimulatorResult]
+    turn_counts: Counter[int] = field(default_factory=Counter)
+    stopped_early: bool = False
 
     def __repr__(self):
         title = f"ran {self.iterations} games"
+        if self.stopped_early:
+            title += " (stopped early)"
 
         format_results = ""
         for result in self.player_results:
-            format_results += f"\n{result.player.player_id} won {result.wins}, lost {result.losses}, tied {result.ties}"
+            low, high = result.win_interval
+            format_results += (
+                f"\n{result.player.player_id} won {result.wins}, lost {result.losses}, tied {result.ties}"
+                f" (win rate {result.win_rate:.1%}, {result.confidence:.0%} interval {low:.1%} - {high:.1%})"
+            )
 
         return f"Simulation Result: {title}{format_results}"
@@ -1,13 +1,32 @@
 import copy
 import logging
+import multiprocessing
+import os
+import pickle
+import random
+from collections import Counter
+from typing import Any
 
+from pyminion.core import Card, DeckCounter
+from pyminion.export import ResultExporter
 from pyminion.game import Game
 from pyminion.player import Player
-from pyminion.result import GameResult, PlayerSimulatorResult, SimulatorResult
+from pyminion.result import (GameOutcome, GameResult, PlayerSimulatorResult,
+                             PlayerSummary, SimulatorResult)
 
 logger = logging.getLogger()
 
 
+# version of the checkpoint format, checkpoints of other versions cannot be resumed
+CHECKPOINT_VERSION = 1
+
+
+# compact, picklable representation of a game result that is sent back from worker processes.
+# players are referred to by their index in the simulator's original player list.
+PlayerOutcome = tuple[int, int, int, int, int, int, dict[Card, int]]
+CompactGameResult = tuple[int, tuple[int, ...], tuple[PlayerOutcome, ...]]
+
+
 def get_percent(occurrence: int, total: int) -> float:
     """
     helper function to compute percent
@@ -16,6 +35,94 @@ def get_percent(occurrence: int, total: int) -> float:
     return round(((occurrence / total) * 100), 3)
 
 
+def get_game_seed(seed: int, iteration: int) -> int:
+    """
+    Derive the seed of a single game in a simulation from the simulation seed.
+    This only depends on the simulation seed and the iteration index.
+
+    """
+    return random.Random(f"{seed}:{iteration}").getrandbits(64)
+
+
+def compact_game_result(result: GameResult, player_indices: dict[int, int]) -> CompactGameResult:
+    """
+    Convert a game result into a compact representation that does not hold
+    references to the game or its players.
+
+    """
+    winners = tuple(player_indices[id(p)] for p in result.winners)
+    summaries = tuple(
+        (
+            player_indices[id(s.player)],
+            s.result.value,
+            s.score,
+            s.turns,
+            s.shuffles,
+            s.turn_order,
+            dict(s.deck),
+        )
+        for s in result.player_summaries
+    )
+    return (result.turns, winners, summaries)
+
+
+def expand_game_result(compact: CompactGameResult, game: Game, players: list[Player]) -> GameResult:
+    """
+    Rebuild a game result from its compact representation.
+
+    """
+    turns, winners, summaries = compact
+    player_summaries = [
+        PlayerSummary(
+            player=players[index],
+            result=GameOutcome(outcome),
+            score=score,
+            turns=player_turns,
+            shuffles=shuffles,
+            turn_order=turn_order,
+            deck=DeckCounter(deck),
+        )
+        for index, outcome, score, player_turns, shuffles, turn_order, deck in summaries
+    ]
+    return GameResult(
+        game=game,
+        winners=[players[i] for i in winners],
+        turns=turns,
+        player_summaries=player_summaries,
+    )
+
+
+# state of a worker process, set up once by _init_worker
+_worker_game: Game|None = None
+_worker_players: list[Player] = []
+_worker_player_indices: dict[int, int] = {}
+
+
+def _init_worker(game_args: dict[str, Any]) -> None:
+    global _worker_game, _worker_players, _worker_player_indices
+
+    # interleaved game logs from many processes are not useful
+    _worker_game = Game(**game_args, headless=True)
+    _worker_players = _worker_game.players[:]
+    _worker_player_indices = {id(p): i for i, p in enumerate(_worker_players)}
+
+
+def _run_games(chunk: tuple[int, int, int|None]) -> list[CompactGameResult]:
+    assert _worker_game is not None
+    start, stop, seed = chunk
+    results: list[CompactGameResult] = []
+    for iteration in range(start, stop):
+        if seed is not None:
+            _worker_game.seed = get_game_seed(seed, iteration)
+            _worker_game.rng.seed(_worker_game.seed)
+        # every game starts from the original turn order so results do not
+        # depend on which worker played the previous games
+        _worker_game.players = _worker_players[:]
+        result = _worker_game.play()
+        results.append(compact_game_result(result, _worker_player_indices))
+    return results
+
+
 class Simulator:
     """
     Simulate multiple games of dominion and compute statistics
@@ -23,58 +130,301 @@ class Simulator:
     Attributes:
         game: pyminion game instance.
         iterations: number of times the game will be simulated.
+        workers: number of processes used to simulate games. If greater than 1,
+            games are distributed over a process pool and the players must be picklable.
+        seed: If set, each game is seeded from this value and its iteration index,
+            so the simulation is reproducible regardless of the number of workers
+            and any single game can be replayed.
+        keep_results: If False, each game is folded into running aggregates and then dropped,
+            so memory use does not grow with the number of iterations.
+        exporter: If set, each game is also written to the exporter's column files.
+            The exporter is not closed by the simulator.
+        confidence: If set, the simulation stops early once the win rate interval
+            of the leading player at this confidence does not overlap the interval
+            of any other player. Intervals of the results are reported at this confidence.
+        margin: If set, the simulation stops early once the win rate interval
+            of every player is at most this wide on either side, e.g. 0.01 for ±1%.
+        min_iterations: number of games played before stopping early is considered.
+        check_every: number of games between checks for stopping early.
+        checkpoint_path: If set, the progress of the simulation is saved to this file
+            every checkpoint_every games and when it finishes, so it can be continued
+            with Simulator.resume after the process dies.
+        checkpoint_every: number of games between checkpoints.
+
+    When stopping early, iterations is the maximum number of games. The checks
+    happen at fixed game counts, so seeded simulations stop after the same game
+    regardless of the number of workers. Checking repeatedly makes false
+    separations somewhat more likely than 1 - confidence, which a higher
+    confidence or min_iterations compensates for.
 
     """
 
-    def __init__(self, game: Game, iterations: int = 100):
+    def __init__(
+        self,
+        game: Game,
+        iterations: int = 100,
+        workers: int = 1,
+        seed: int|None = None,
+        keep_results: bool = True,
+        exporter: ResultExporter|None = None,
+        confidence: float|None = None,
+        margin: float|None = None,
+        min_iterations: int = 100,
+        check_every: int = 100,
+        checkpoint_path: str|None = None,
+        checkpoint_every: int = 1000,
+    ):
         self.game = game
         self.iterations = iterations
+        self.workers = workers
+        self.seed = seed
+        self.keep_results = keep_results
+        self.exporter = exporter
+        self.confidence = confidence
+        self.margin = margin
+        self.min_iterations = min_iterations
+        self.check_every = check_every
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
         self.results: list[GameResult] = []
+        self.player_results: dict[Player, PlayerSimulatorResult] = {
+            player: PlayerSimulatorResult(
+                player=player,
+                wins=0,
+                losses=0,
+                ties=0,
+                confidence=confidence if confidence is not None else 0.95,
+            )
+            for player in game.players
+        }
+        self.turn_counts: Counter[int] = Counter()
+        self.games = 0
+        self.stopped_early = False
 
     def run(self) -> SimulatorResult:
-        logger.info(f"Simulating {self.iterations} games...")
-        for _ in range(self.iterations):
-            game = copy.copy((self.game))
+        if self.games:
+            logger.info(f"Resuming simulation at game {self.games} of {self.iterations}...")
+        else:
+            logger.info(f"Simulating {self.iterations} games...")
+        # a resumed simulation may already have stopped early
+        if not self.stopped_early:
+            if self.workers > 1:
+                self._run_parallel()
+            else:
+                self._run_sequential()
+
+        if self.checkpoint_path is not None:
+            self.save_checkpoint(self.checkpoint_path)
+        return self.get_sim_result()
+
+    def _run_sequential(self) -> None:
+        players = self.game.players[:]
+        for iteration in range(self.games, self.iterations):
+            game = self._copy_game(iteration, players)
             result = game.play()
+            self.add_result(result)
+            if self.should_stop():
+                break
+
+    def _copy_game(self, iteration: int, players: list[Player]) -> Game:
+        game = copy.copy((self.game))
+        game.players = players[:]
+        if self.seed is not None:
+            game.seed = get_game_seed(self.seed, iteration)
+            game.rng = random.Random(game.seed)
+        else:
+            # games after the first continue the random number generator of the game
+            game.seed = None
+        return game
+
+    def replay(self, iteration: int) -> GameResult:
+        """
+        Play a single game of a seeded simulation again.
+        The game is identical to the game played at this iteration of the simulation.
+
+        """
+        if self.seed is None:
+            raise ValueError("Only games of seeded simulations can be replayed")
+        game = self._copy_game(iteration, self.game.players[:])
+        return game.play()
+
+    def _get_chunks(self) -> list[tuple[int, int, int|None]]:
+        """
+        Split the iterations into chunks of work for the process pool.
+        Several chunks per worker keep the load balanced when game lengths vary.
+
+        """
+        remaining = self.iterations - self.games
+        num_chunks = min(remaining, self.workers * 4)
+        if num_chunks <= 0:
+            return []
+        chunk_size = -(-remaining // num_chunks)
+        if self.confidence is not None or self.margin is not None:
+            # small chunks so that few games are played past the point of stopping
+            chunk_size = min(chunk_size, self.check_every)
+        return [
+            (start, min(start + chunk_size, self.iterations), self.seed)
+            for start in range(self.games, self.iterations, chunk_size)
+        ]
+
+    def _run_parallel(self) -> None:
+        # players are referenced by index, capture the order before games shuffle it
+        players = self.game.players[:]
+        game_args = {
+            "players": players,
+            "expansions": self.game.expansions,
+            "kingdom_cards": self.game.kingdom_cards,
+            "start_deck": self.game.start_deck,
+            "random_order": self.game.random_order,
+        }
+
+        with multiprocessing.Pool(
+            processes=self.workers,
+            initializer=_init_worker,
+            initargs=(game_args,),
+        ) as pool:
+            # chunks are consumed as they finish so finished games are not held in memory
+            for chunk in pool.imap(_run_games, self._get_chunks()):
+                for compact in chunk:
+                    self.add_result(expand_game_result(compact, self.game, players))
+                    # leaving the pool terminates the workers still playing games
+                    if self.should_stop():
+                        return
+
+    def add_result(self, result: GameResult) -> None:
+        """
+        Fold a finished game into the running aggregates.
+
+        """
+        self.games += 1
+        self.turn_counts[result.turns] += 1
+        for summary in result.player_summaries:
+            self.player_results[summary.player].add_summary(summary)
+
+        if self.exporter is not None:
+            self.exporter.add_result(result)
+
+        if self.keep_results:
             self.results.append(result)
 
-        return self.get_sim_result()
+        if self.checkpoint_path is not None and self.games % self.checkpoint_every == 0:
+            self.save_checkpoint(self.checkpoint_path)
 
-    def get_sim_result(self) -> SimulatorResult:
+    def save_checkpoint(self, path: str) -> None:
+        """
+        Save the progress of the simulation: the settings, the aggregates of the
+        finished games, their number and the state of the random number generator.
 
-        # make temp hashmap to store player sim results
-        player_results: dict[Player, PlayerSimulatorResult] = {}
+        Game results and the exporter are not saved, a resumed simulation only
+        keeps the results of the games it plays itself.
 
-        # initialize each player result with default values
-        for player in self.game.players:
-            player_results[player] = PlayerSimulatorResult(
-                player=player, wins=0, losses=0, ties=0
-            )
+        """
+        players = list(self.player_results)
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "game_args": {
+                "players": players,
+                "expansions": self.game.expansions,
+                "kingdom_cards": self.game.kingdom_cards,
+                "start_deck": self.game.start_deck,
+                "random_order": self.game.random_order,
+                "headless": self.game.headless,
+            },
+            "rng_state": self.game.rng.getstate(),
+            "settings": {
+                "iterations": self.iterations,
+                "workers": self.workers,
+                "seed": self.seed,
+                "keep_results": self.keep_results,
+                "confidence": self.confidence,
+                "margin": self.margin,
+                "min_iterations": self.min_iterations,
+                "check_every": self.check_every,
+                "checkpoint_every": self.checkpoint_every,
+            },
+            "games": self.games,
+            "stopped_early": self.stopped_early,
+            "player_results": [self.player_results[player] for player in players],
+            "turn_counts": self.turn_counts,
+        }
+        # write to a temporary file first so a crash while saving keeps the previous checkpoint
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            pickle.dump(state, file)
+        os.replace(temp_path, path)
 
-        # iterate through each simulated game to determine win record
-        for result in self.results:
+    @classmethod
+    def from_checkpoint(
+        cls,
+        path: str,
+        workers: int|None = None,
+        exporter: ResultExporter|None = None,
+    ) -> "Simulator":
+        """
+        Rebuild a simulator from a checkpoint. It continues with the game after
+        the last one that was saved, and keeps saving checkpoints to the same path.
 
-            # single player wins
-            if len(result.winners) == 1:
-                player_results[result.winners[0]].wins += 1
+        """
+        with open(path, "rb") as file:
+            state = pickle.load(file)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"{path} is not a checkpoint of version {CHECKPOINT_VERSION}")
 
-            # multiple players tie
-            else:
-                for player in result.winners:
-                    player_results[player].ties += 1
+        game_args = state["game_args"]
+        game = Game(**game_args, log_stdout=False)
+        game.rng.setstate(state["rng_state"])
 
-            # rest of players are losers
-            for player in self.game.players:
-                if player not in result.winners:
-                    player_results[player].losses += 1
+        settings = state["settings"]
+        if workers is not None:
+            settings["workers"] = workers
+        sim = cls(game, exporter=exporter, checkpoint_path=path, **settings)
+        sim.games = state["games"]
+        sim.stopped_early = state["stopped_early"]
+        sim.player_results = {result.player: result for result in state["player_results"]}
+        sim.turn_counts = state["turn_counts"]
+        return sim
 
-        player_results_final: list[PlayerSimulatorResult] = list(
-            player_results.values()
-        )
+    @classmethod
+    def resume(
+        cls,
+        path: str,
+        workers: int|None = None,
+        exporter: ResultExporter|None = None,
+    ) -> SimulatorResult:
+        """
+        Continue a simulation from a checkpoint and run it to the end.
+        The result covers every game of the simulation, including the games
+        played before the checkpoint.
+
+        """
+        return cls.from_checkpoint(path, workers, exporter).run()
+
+    def should_stop(self) -> bool:
+        """
+        Check whether the results are conclusive enough to stop early.
 
+        """
+        if self.confidence is None and self.margin is None:
+            return False
+        if self.games < self.min_iterations or self.games % self.check_every != 0:
+            return False
+
+        intervals = [result.win_interval for result in self.player_results.values()]
+        if self.margin is not None:
+            if all((high - low) / 2 <= self.margin for low, high in intervals):
+                self.stopped_early = True
+        if self.confidence is not None and len(intervals) > 1:
+            leader = max(range(len(intervals)), key=lambda i: intervals[i][0])
+            if all(intervals[leader][0] > high for i, (_, high) in enumerate(intervals) if i != leader):
+                self.stopped_early = True
+        return self.stopped_early
+
+    def get_sim_result(self) -> SimulatorResult:
         sim_result = SimulatorResult(
-            iterations=self.iterations,
+            iterations=self.games,
             game_results=self.results,
-            player_results=player_results_final,
+            player_results=list(self.player_results.values()),
+            turn_counts=self.turn_counts,
+            stopped_early=self.stopped_early,
         )
         return sim_result
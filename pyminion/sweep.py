@@ -0,0 +1,360 @@
+import hashlib
+import json
+import logging
+import os
+import random
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from pyminion.core import Card
+from pyminion.encoding import get_standard_card_index
+from pyminion.player import Player
+from pyminion.result import PlayerSimulatorResult
+from pyminion.tournament import PairingResult, Tournament, TournamentResult
+
+logger = logging.getLogger()
+
+
+KINGDOM_SIZE = 10
+
+
+def sample_kingdoms(
+    expansions: list[list[Card]],
+    count: int,
+    rng: random.Random,
+    required: list[Card]|None = None,
+) -> list[list[Card]]:
+    """
+    Sample random kingdoms in which every card of the expansions appears about
+    equally often. Cards are dealt from a shuffled deck of all kingdom cards
+    that is only reshuffled once every card has been dealt.
+
+    Required cards are in every kingdom, the other cards are sorted by name.
+
+    """
+    required = required if required is not None else []
+    options = [card for expansion in expansions for card in expansion if card not in required]
+    size = KINGDOM_SIZE - len(required)
+    if size < 0 or size > len(options):
+        raise ValueError(f"Cannot sample kingdoms of {KINGDOM_SIZE} cards from {len(options)} options")
+
+    kingdoms: list[list[Card]] = []
+    deck: list[Card] = []
+    for _ in range(count):
+        kingdom: list[Card] = []
+        skipped: list[Card] = []
+        while len(kingdom) < size:
+            if not deck:
+                deck = options[:]
+                rng.shuffle(deck)
+            card = deck.pop()
+            if card in kingdom:
+                # dealt twice across a reshuffle, keep it for the next kingdom
+                skipped.append(card)
+            else:
+                kingdom.append(card)
+        deck.extend(skipped)
+        kingdoms.append(required + sorted(kingdom, key=lambda card: card.name))
+    return kingdoms
+
+
+def get_kingdom_key(kingdom: list[Card]) -> str:
+    return ",".join(sorted(card.name for card in kingdom))
+
+
+@dataclass
+class CardStatistics:
+    """
+    holds the win rates of the players in kingdoms with and without a card
+
+    Win rates count ties as half a win and are listed in the order of the
+    players of the sweep. shifts is how much the card changes each win rate.
+
+    """
+
+    card: Card
+    kingdoms: int
+    games: int
+    win_rates: list[float]
+    baseline_win_rates: list[float]
+
+    @property
+    def shifts(self) -> list[float]:
+        return [rate - baseline for rate, baseline in zip(self.win_rates, self.baseline_win_rates)]
+
+
+def get_card_statistics(
+    players: list[Player],
+    kingdom_results: list[PairingResult],
+    exclude: list[Card]|None = None,
+) -> list[CardStatistics]:
+    """
+    Compare the win rates of the players in the kingdoms that contain each card
+    with the kingdoms that do not. Cards are sorted by how much they shift the
+    win rate of the first player, from most positive to most negative.
+
+    """
+    exclude = exclude if exclude is not None else []
+    total_points = [0.0] * len(players)
+    total_games = 0
+    card_points: dict[Card, list[float]] = {}
+    card_games: Counter[Card] = Counter()
+    card_kingdoms: Counter[Card] = Counter()
+
+    for kingdom_result in kingdom_results:
+        points = [0.0] * len(players)
+        for result in kingdom_result.player_results:
+            points[players.index(result.player)] = result.wins + result.ties / 2
+        games = kingdom_result.games
+
+        total_games += games
+        for i, value in enumerate(points):
+            total_points[i] += value
+        for card in kingdom_result.kingdom:
+            if card in exclude:
+                continue
+            card_kingdoms[card] += 1
+            card_games[card] += games
+            card_points.setdefault(card, [0.0] * len(players))
+            for i, value in enumerate(points):
+                card_points[card][i] += value
+
+    statistics: list[CardStatistics] = []
+    for card, points in card_points.items():
+        games = card_games[card]
+        other_games = total_games - games
+        statistics.append(
+            CardStatistics(
+                card=card,
+                kingdoms=card_kingdoms[card],
+                games=games,
+                win_rates=[value / games if games else 0.0 for value in points],
+                baseline_win_rates=[
+                    (total - value) / other_games if other_games else 0.0
+                    for total, value in zip(total_points, points)
+                ],
+            )
+        )
+    statistics.sort(key=lambda s: (-s.shifts[0], s.card.name))
+    return statistics
+
+
+@dataclass
+class SweepResult(TournamentResult):
+    """
+    holds the results of a kingdom sweep and the effect of each card on the
+    win rates of the players
+
+    """
+
+    players: list[Player] = field(default_factory=list)
+    card_statistics: list[CardStatistics] = field(default_factory=list)
+
+    def __repr__(self):
+        games = sum(result.games for result in self.pairing_results)
+        title = f"{len(self.pairing_results)} kingdoms, {games} games"
+
+        format_cards = ""
+        for statistics in self.card_statistics:
+            shifts = ", ".join(
+                f"{player.player_id} {shift:+.1%}" for player, shift in zip(self.players, statistics.shifts)
+            )
+            format_cards += f"\n{statistics.card.name} in {statistics.kingdoms} kingdoms: {shifts}"
+
+        return f"Sweep Result: {title}{self.format_standings()}{format_cards}"
+
+
+def _dump_pairing_result(result: PairingResult, key: dict[str, Any]) -> dict[str, Any]:
+    players = result.players
+    return {
+        "key": key,
+        "turn_counts": dict(result.turn_counts),
+        "points": [
+            [players.index(player), players.index(opponent), points]
+            for (player, opponent), points in result.points.items()
+        ],
+        "player_results": [
+            {
+                "wins": r.wins,
+                "losses": r.losses,
+                "ties": r.ties,
+                "score_counts": dict(r.score_counts),
+                "turn_counts": dict(r.turn_counts),
+                "deck_counts": {card.name: dict(counts) for card, counts in r.deck_counts.items()},
+            }
+            for r in result.player_results
+        ],
+    }
+
+
+def _load_counter(data: dict[str, int]) -> Counter[int]:
+    # json turns the integer keys of histograms into strings
+    return Counter({int(value): count for value, count in data.items()})
+
+
+def _load_pairing_result(
+    data: dict[str, Any],
+    players: list[Player],
+    kingdom: list[Card],
+    cards: dict[str, Card],
+) -> PairingResult:
+    points: Counter[tuple[Player, Player]] = Counter()
+    for player, opponent, value in data["points"]:
+        points[(players[player], players[opponent])] = value
+    return PairingResult(
+        players=players,
+        kingdom=kingdom,
+        player_results=[
+            PlayerSimulatorResult(
+                player=player,
+                wins=r["wins"],
+                losses=r["losses"],
+                ties=r["ties"],
+                score_counts=_load_counter(r["score_counts"]),
+                turn_counts=_load_counter(r["turn_counts"]),
+                deck_counts={cards[name]: _load_counter(counts) for name, counts in r["deck_counts"].items()},
+            )
+            for player, r in zip(players, data["player_results"])
+        ],
+        points=points,
+        turn_counts=_load_counter(data["turn_counts"]),
+    )
+
+
+class KingdomSweep(Tournament):
+    """
+    Play the same players against each other on many kingdoms to measure how
+    each card shifts their win rates.
+
+    Kingdoms are played as pairings of a tournament, on one process pool and in
+    every rotation of the seats. The games of a kingdom are seeded from the seed
+    and the cards of the kingdom, so they do not depend on the other kingdoms
+    of the sweep.
+
+    If cache_dir is set, the result of each kingdom is saved there as soon as
+    it is finished, keyed by the player ids, the kingdom, the seed and the
+    number of games. Kingdoms that are already in the cache are not played
+    again, so an interrupted sweep continues where it stopped. Players are only
+    identified by their ids, so bots that change must get a new id or a new cache.
+
+    Attributes:
+        players: players of every game.
+        expansions: expansions the kingdoms are drawn from.
+        kingdoms: the kingdoms to play, or the number of kingdoms to sample with sample_kingdoms.
+        iterations: number of games for every seat rotation on a kingdom.
+        workers: number of processes used to play games.
+        seed: seed of the sampled kingdoms and of the games.
+        cache_dir: directory of the kingdom results. It is created if needed.
+        required: cards that are in every sampled kingdom, e.g. cards the bots depend on.
+            They are left out of the card statistics.
+        chunk_size: maximum number of games played by a worker in one block.
+
+    """
+
+    def __init__(
+        self,
+        players: list[Player],
+        expansions: list[list[Card]],
+        kingdoms: int|list[list[Card]] = 100,
+        iterations: int = 10,
+        workers: int = 1,
+        seed: int = 0,
+        cache_dir: str|None = None,
+        required: list[Card]|None = None,
+        chunk_size: int|None = None,
+    ):
+        self.required = required if required is not None else []
+        if isinstance(kingdoms, int):
+            kingdoms = sample_kingdoms(expansions, kingdoms, random.Random(seed), self.required)
+        super().__init__(
+            players,
+            expansions,
+            kingdoms=kingdoms,
+            iterations=iterations,
+            players_per_game=len(players),
+            workers=workers,
+            seed=seed,
+            chunk_size=chunk_size,
+        )
+        self.cache_dir = cache_dir
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get_pairing_seed(self, pairing: int) -> int|None:
+        _, kingdom = self.pairings[pairing]
+        return random.Random(f"{self.seed}:{get_kingdom_key(self.kingdoms[kingdom])}").getrandbits(64)
+
+    def get_cache_key(self, kingdom: list[Card]) -> dict[str, Any]:
+        return {
+            "players": [player.player_id for player in self.players],
+            "kingdom": get_kingdom_key(kingdom),
+            "seed": self.seed,
+            "iterations": self.iterations,
+        }
+
+    def get_cache_path(self, kingdom: list[Card]) -> str:
+        assert self.cache_dir is not None
+        key = json.dumps(self.get_cache_key(kingdom), sort_keys=True)
+        return os.path.join(self.cache_dir, f"{hashlib.sha256(key.encode()).hexdigest()}.json")
+
+    def _load(self, kingdom: list[Card]) -> PairingResult|None:
+        if self.cache_dir is None:
+            return None
+        path = self.get_cache_path(kingdom)
+        if not os.path.exists(path):
+            return None
+        with open(path) as file:
+            data = json.load(file)
+        if data["key"] != self.get_cache_key(kingdom):
+            return None
+
+        cards = {card.name: card for card in get_standard_card_index().cards}
+        for expansion in self.expansions:
+            cards.update((card.name, card) for card in expansion)
+        return _load_pairing_result(data, self.players, kingdom, cards)
+
+    def _save(self, result: PairingResult) -> None:
+        if self.cache_dir is None:
+            return
+        path = self.get_cache_path(result.kingdom)
+        # write to a temporary file first so an interrupted sweep leaves no partial results
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(_dump_pairing_result(result, self.get_cache_key(result.kingdom)), file)
+        os.replace(temp_path, path)
+
+    def iter_results(self) -> Iterator[PairingResult]:
+        """
+        Yield the result of each kingdom, first the kingdoms that are cached and
+        then the others as soon as their games are finished.
+
+        """
+        pending: list[int] = []
+        for pairing, (_, kingdom) in enumerate(self.pairings):
+            cached = self._load(self.kingdoms[kingdom])
+            if cached is None:
+                pending.append(pairing)
+            else:
+                self.pairing_results.append(cached)
+                yield cached
+
+        logger.info(f"{len(self.pairings) - len(pending)} of {len(self.pairings)} kingdoms are cached")
+        for result in self._play_pairings(pending):
+            self._save(result)
+            yield result
+
+    def get_result(self) -> SweepResult:
+        """
+        Rate the players and compute the card statistics from the kingdoms
+        finished so far.
+
+        """
+        result = super().get_result()
+        return SweepResult(
+            pairing_results=result.pairing_results,
+            standings=result.standings,
+            players=self.players,
+            card_statistics=get_card_statistics(self.players, result.pairing_results, self.required),
+        )
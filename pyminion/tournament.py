@@ -0,0 +1,395 @@
+import itertools
+import logging
+import math
+import multiprocessing
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from pyminion.core import Card
+from pyminion.game import Game
+from pyminion.player import Player
+from pyminion.result import GameResult, PlayerSimulatorResult
+from pyminion.simulator import (CompactGameResult, compact_game_result,
+                                expand_game_result, get_game_seed)
+
+logger = logging.getLogger()
+
+
+# a block of games played by a worker:
+# pairing index, seated player indices, kingdom index, first and last game index, pairing seed
+TournamentTask = tuple[int, tuple[int, ...], int, int, int, int|None]
+
+# rating of a player whose strength equals the virtual reference opponent
+BASE_RATING = 1500.0
+
+
+def get_ratings(
+    players: list[Player],
+    points: Counter[tuple[Player, Player]],
+    iterations: int = 1000,
+    tolerance: float = 1e-9,
+) -> dict[Player, float]:
+    """
+    Compute Elo-scale ratings of players from their head to head points.
+
+    points maps a pair of players to the points the first scored against the
+    second, where a win is worth 1 and a tie 0.5. Ratings are the maximum
+    likelihood Bradley-Terry strengths, so a rating difference of 400 means
+    10:1 odds. Every player also gets a virtual tie against an opponent rated
+    BASE_RATING, which keeps ratings of unbeaten or winless players finite.
+
+    """
+    strengths = {player: 1.0 for player in players}
+    for _ in range(iterations):
+        new_strengths: dict[Player, float] = {}
+        for player in players:
+            strength = strengths[player]
+            score = 0.5
+            expected = 1 / (strength + 1)
+            for opponent in players:
+                if opponent is player:
+                    continue
+                games = points[(player, opponent)] + points[(opponent, player)]
+                if games:
+                    score += points[(player, opponent)]
+                    expected += games / (strength + strengths[opponent])
+            new_strengths[player] = score / expected
+
+        change = max(abs(math.log(new_strengths[p] / strengths[p])) for p in players) if players else 0.0
+        strengths = new_strengths
+        if change < tolerance:
+            break
+
+    return {player: BASE_RATING + 400 * math.log10(strength) for player, strength in strengths.items()}
+
+
+def add_points(points: Counter[tuple[Player, Player]], result: GameResult) -> None:
+    """
+    Add the head to head points of a game. Each winner beats every other
+    player and ties with the other winners.
+
+    """
+    winners = result.winners
+    players = [summary.player for summary in result.player_summaries]
+    for player, opponent in itertools.permutations(players, 2):
+        if player in winners:
+            points[(player, opponent)] += 0.5 if opponent in winners else 1
+
+
+@dataclass
+class PairingResult:
+    """
+    holds the results of the games between a group of players on one kingdom,
+    over all seat rotations
+
+    An empty kingdom means the kingdom was drawn at random for every game.
+
+    """
+
+    players: list[Player]
+    kingdom: list[Card]
+    player_results: list[PlayerSimulatorResult]
+    points: Counter[tuple[Player, Player]] = field(default_factory=Counter)
+    turn_counts: Counter[int] = field(default_factory=Counter)
+
+    @property
+    def games(self) -> int:
+        return sum(self.turn_counts.values())
+
+    def add_result(self, result: GameResult) -> None:
+        """
+        Fold a finished game into the aggregates.
+
+        """
+        self.turn_counts[result.turns] += 1
+        for summary in result.player_summaries:
+            self.player_results[self.players.index(summary.player)].add_summary(summary)
+        add_points(self.points, result)
+
+    def __repr__(self):
+        kingdom = ", ".join(card.name for card in self.kingdom) if self.kingdom else "random kingdom"
+        format_results = ""
+        for result in self.player_results:
+            format_results += f"\n{result.player.player_id} won {result.wins}, lost {result.losses}, tied {result.ties}"
+        return f"Pairing Result: {self.games} games on {kingdom}{format_results}"
+
+
+@dataclass
+class Standing:
+    """
+    holds the rating and record of a player over a tournament
+
+    """
+
+    player: Player
+    rating: float
+    wins: int
+    losses: int
+    ties: int
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.losses + self.ties
+
+
+@dataclass
+class TournamentResult:
+    """
+    holds the finished pairings of a tournament and the standings of the
+    players, sorted from highest to lowest rating
+
+    """
+
+    pairing_results: list[PairingResult]
+    standings: list[Standing]
+
+    def format_standings(self) -> str:
+        format_standings = ""
+        for rank, standing in enumerate(self.standings, start=1):
+            format_standings += (
+                f"\n{rank}. {standing.player.player_id} rating {standing.rating:.0f}:"
+                f" won {standing.wins}, lost {standing.losses}, tied {standing.ties}"
+            )
+        return format_standings
+
+    def __repr__(self):
+        games = sum(result.games for result in self.pairing_results)
+        title = f"{len(self.pairing_results)} pairings, {games} games"
+        return f"Tournament Result: {title}{self.format_standings()}"
+
+
+class _TournamentWorker:
+    """
+    Plays blocks of tournament games. Worker processes set one up once and
+    reuse it for every block they are given.
+
+    """
+
+    def __init__(self, players: list[Player], expansions: list[list[Card]], kingdoms: list[list[Card]]):
+        self.players = players
+        self.expansions = expansions
+        self.kingdoms = kingdoms
+        self.player_indices = {id(p): i for i, p in enumerate(players)}
+
+    def play(self, task: TournamentTask) -> tuple[int, list[CompactGameResult]]:
+        pairing, seats, kingdom, start, stop, seed = task
+        players = [self.players[i] for i in seats]
+        game = Game(
+            players=players[:],
+            expansions=self.expansions,
+            kingdom_cards=self.kingdoms[kingdom],
+            random_order=False,
+            headless=True,
+        )
+        results: list[CompactGameResult] = []
+        for index in range(start, stop):
+            if seed is not None:
+                game.seed = get_game_seed(seed, index)
+                game.rng.seed(game.seed)
+            game.players = players[:]
+            result = game.play()
+            results.append(compact_game_result(result, self.player_indices))
+        return pairing, results
+
+
+# state of a worker process, set up once by _init_worker
+_worker: _TournamentWorker|None = None
+
+
+def _init_worker(players: list[Player], expansions: list[list[Card]], kingdoms: list[list[Card]]) -> None:
+    global _worker
+    _worker = _TournamentWorker(players, expansions, kingdoms)
+
+
+def _play_games(task: TournamentTask) -> tuple[int, list[CompactGameResult]]:
+    assert _worker is not None
+    return _worker.play(task)
+
+
+class Tournament:
+    """
+    Play every group of players against each other on every kingdom and rate
+    the players from the results.
+
+    Each group plays iterations games in every rotation of its seats. All games
+    are scheduled on one process pool, which is kept until the tournament is closed,
+    so the players are only sent to the workers once.
+
+    Attributes:
+        players: players of the tournament. If workers is greater than 1, they must be picklable.
+        expansions: expansions the supply is drawn from.
+        kingdoms: kingdoms to play on. If None, each game draws a random kingdom from the expansions.
+        iterations: number of games for every seat rotation of a group on a kingdom.
+        players_per_game: size of the groups of players.
+        workers: number of processes used to play games.
+        seed: If set, the tournament is reproducible regardless of the number of workers.
+        chunk_size: maximum number of games played by a worker in one block.
+            By default, blocks are small enough to balance the load over the workers.
+
+    """
+
+    def __init__(
+        self,
+        players: list[Player],
+        expansions: list[list[Card]],
+        kingdoms: list[list[Card]]|None = None,
+        iterations: int = 100,
+        players_per_game: int = 2,
+        workers: int = 1,
+        seed: int|None = None,
+        chunk_size: int|None = None,
+    ):
+        if players_per_game > len(players):
+            raise ValueError(f"Cannot play games of {players_per_game} players with {len(players)} players")
+        self.players = players
+        self.expansions = expansions
+        self.kingdoms = kingdoms if kingdoms is not None else [[]]
+        self.iterations = iterations
+        self.players_per_game = players_per_game
+        self.workers = workers
+        self.seed = seed
+        self.chunk_size = chunk_size
+
+        self.pairings: list[tuple[tuple[int, ...], int]] = [
+            (group, kingdom)
+            for group in itertools.combinations(range(len(players)), players_per_game)
+            for kingdom in range(len(self.kingdoms))
+        ]
+        self.pairing_results: list[PairingResult] = []
+        self._pool: Any = None
+
+    def __enter__(self) -> "Tournament":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shut down the process pool.
+
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def get_pairing_seed(self, pairing: int) -> int|None:
+        """
+        Seed of the games of a pairing, from which each game is seeded by its index
+        within the pairing.
+
+        """
+        if self.seed is None:
+            return None
+        return get_game_seed(self.seed, pairing)
+
+    def _get_tasks(self, pairings: list[int]) -> list[TournamentTask]:
+        """
+        Split the games of the pairings over their seat rotations into blocks.
+        Blocks are ordered by pairing, so pairings finish one after another.
+
+        """
+        rotations = self.players_per_game
+        chunk_size = self.chunk_size
+        if chunk_size is None:
+            total = len(pairings) * rotations * self.iterations
+            chunk_size = max(1, min(self.iterations, total // (self.workers * 8)))
+
+        tasks: list[TournamentTask] = []
+        for pairing in pairings:
+            group, kingdom = self.pairings[pairing]
+            seed = self.get_pairing_seed(pairing)
+            for rotation in range(rotations):
+                seats = group[rotation:] + group[:rotation]
+                first = rotation * self.iterations
+                for start in range(0, self.iterations, chunk_size):
+                    stop = min(start + chunk_size, self.iterations)
+                    tasks.append((pairing, seats, kingdom, first + start, first + stop, seed))
+        return tasks
+
+    def _play_tasks(self, tasks: list[TournamentTask]) -> Iterator[tuple[int, list[CompactGameResult]]]:
+        if self.workers <= 1:
+            worker = _TournamentWorker(self.players, self.expansions, self.kingdoms)
+            for task in tasks:
+                yield worker.play(task)
+            return
+
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(
+                processes=self.workers,
+                initializer=_init_worker,
+                initargs=(self.players, self.expansions, self.kingdoms),
+            )
+        yield from self._pool.imap_unordered(_play_games, tasks)
+
+    def iter_results(self) -> Iterator[PairingResult]:
+        """
+        Play the tournament and yield the result of each pairing as soon as
+        all of its games are finished.
+
+        """
+        yield from self._play_pairings(list(range(len(self.pairings))))
+
+    def _play_pairings(self, pairings: list[int]) -> Iterator[PairingResult]:
+        tasks = self._get_tasks(pairings)
+        logger.info(f"Playing {len(pairings)} pairings in {len(tasks)} blocks...")
+
+        remaining = Counter(task[0] for task in tasks)
+        partial: dict[int, PairingResult] = {}
+        games: dict[int, Game] = {}
+        for pairing, results in self._play_tasks(tasks):
+            if pairing not in partial:
+                group, kingdom = self.pairings[pairing]
+                players = [self.players[i] for i in group]
+                partial[pairing] = PairingResult(
+                    players=players,
+                    kingdom=self.kingdoms[kingdom],
+                    player_results=[PlayerSimulatorResult(player=p, wins=0, losses=0, ties=0) for p in players],
+                )
+                games[pairing] = Game(
+                    players=players,
+                    expansions=self.expansions,
+                    kingdom_cards=self.kingdoms[kingdom],
+                    headless=True,
+                )
+
+            for compact in results:
+                partial[pairing].add_result(expand_game_result(compact, games[pairing], self.players))
+
+            remaining[pairing] -= 1
+            if remaining[pairing] == 0:
+                pairing_result = partial.pop(pairing)
+                del games[pairing]
+                self.pairing_results.append(pairing_result)
+                yield pairing_result
+
+    def run(self) -> TournamentResult:
+        for _ in self.iter_results():
+            pass
+        return self.get_result()
+
+    def get_result(self) -> TournamentResult:
+        """
+        Rate the players from the pairings finished so far.
+
+        """
+        points: Counter[tuple[Player, Player]] = Counter()
+        records = {player: [0, 0, 0] for player in self.players}
+        for pairing_result in self.pairing_results:
+            points.update(pairing_result.points)
+            for result in pairing_result.player_results:
+                record = records[result.player]
+                record[0] += result.wins
+                record[1] += result.losses
+                record[2] += result.ties
+
+        ratings = get_ratings(self.players, points)
+        standings = [
+            Standing(player=player, rating=ratings[player], wins=wins, losses=losses, ties=ties)
+            for player, (wins, losses, ties) in records.items()
+        ]
+        standings.sort(key=lambda standing: standing.rating, reverse=True)
+        return TournamentResult(pairing_results=self.pairing_results[:], standings=standings)
@@ -11,6 +11,7 @@ def test_blockade(multiplayer_game: Game, monkeypatch):
     player2 = multiplayer_game.players[1]
 
     player1.hand.add(blockade)
+    smithy_pile_length = multiplayer_game.supply.pile_length("Smithy")
 
     responses = ["smithy"]
     monkeypatch.setattr("builtins.input", lambda _: responses.pop(0))
@@ -20,6 +21,7 @@ def test_blockade(multiplayer_game: Game, monkeypatch):
 
     player1.play(blockade, multiplayer_game)
     assert len(responses) == 0
+    assert multiplayer_game.supply.pile_length("Smithy") == smithy_pile_length - 1
     assert len(player1.playmat) == 1
     assert type(player1.playmat.cards[0]) is Blockade
     assert len(player1.set_aside) == 1
@@ -0,0 +1,155 @@
+import asyncio
+from typing import Any
+
+from pyminion.async_game import human_game_handler, is_async_decider, play_game
+from pyminion.bots.examples import BigMoney
+from pyminion.bots.examples.big_money import BigMoneyDecider
+from pyminion.expansions.base import base_set, smithy
+from pyminion.game import Game
+from pyminion.player import Player
+
+
+class AsyncBigMoneyDecider:
+    """
+    Makes the decisions of big money as coroutines.
+
+    """
+
+    def __init__(self, decider: Any = None):
+        self.decider = decider if decider is not None else BigMoneyDecider()
+        self.decisions = 0
+
+    def __getattr__(self, name: str):
+        decision = getattr(self.decider, name)
+
+        async def async_decision(*args, **kwargs):
+            self.decisions += 1
+            await asyncio.sleep(0)
+            return decision(*args, **kwargs)
+
+        return async_decision
+
+
+def make_game(player: Player, seed: int = 1) -> Game:
+    return Game(
+        players=[player, BigMoney()],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        headless=True,
+        random_order=False,
+        seed=seed,
+    )
+
+
+def summarize(result) -> tuple:
+    return result.turns, [s.score for s in result.player_summaries]
+
+
+def test_play_game_async_decider():
+    expected = [summarize(make_game(BigMoney(), seed).play()) for seed in range(3)]
+
+    deciders = [AsyncBigMoneyDecider() for _ in range(3)]
+    assert is_async_decider(deciders[0])
+    games = [make_game(Player(decider=decider, player_id="big_money"), seed) for seed, decider in enumerate(deciders)]
+
+    async def play_all():
+        return await asyncio.gather(*(play_game(game) for game in games))
+
+    results = asyncio.run(play_all())
+
+    assert [summarize(result) for result in results] == expected
+    assert all(decider.decisions > 0 for decider in deciders)
+
+
+def test_play_game_restores_deciders():
+    decider = AsyncBigMoneyDecider()
+    player = Player(decider=decider, player_id="big_money")
+    game = make_game(player)
+
+    asyncio.run(play_game(game))
+    assert player.decider is decider
+
+    # the game can be played again outside of the event loop with a regular decider
+    game.players[game.players.index(player)].decider = BigMoneyDecider()
+    assert game.play().turns > 0
+
+
+def test_play_game_staggered_sessions():
+    from pyminion.bench import SCENARIOS
+
+    (scenario,) = [s for s in SCENARIOS if s.name == "seaside_durations"]
+
+    def make_duration_game(seed: int, use_async: bool) -> tuple[Game, list[AsyncBigMoneyDecider]]:
+        players = scenario.make_players()
+        deciders = []
+        if use_async:
+            for player in players:
+                player.decider = AsyncBigMoneyDecider(player.decider)
+                deciders.append(player.decider)
+        game = Game(
+            players=players,
+            expansions=scenario.expansions,
+            kingdom_cards=scenario.kingdom_cards,
+            headless=True,
+            seed=seed,
+        )
+        return game, deciders
+
+    expected = [summarize(make_duration_game(seed, use_async=False)[0].play()) for seed in (1, 2)]
+
+    # the second session starts while the first is in the middle of its game
+    async def play_sessions():
+        first, deciders = make_duration_game(1, use_async=True)
+        first_task = asyncio.create_task(play_game(first))
+        while sum(decider.decisions for decider in deciders) < 50:
+            await asyncio.sleep(0)
+        second, _ = make_duration_game(2, use_async=True)
+        return await asyncio.gather(first_task, play_game(second))
+
+    results = asyncio.run(play_sessions())
+
+    assert [summarize(result) for result in results] == expected
+
+
+async def run_clients(inputs: list[list[str]]) -> list[str]:
+    server = await asyncio.start_server(human_game_handler(make_game), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    async def client(lines: list[str]) -> str:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write("".join(f"{line}\n" for line in lines).encode())
+        await writer.drain()
+        if not lines:
+            writer.close()
+        output = await reader.read()
+        writer.close()
+        return output.decode()
+
+    try:
+        return await asyncio.gather(*(client(lines) for lines in inputs))
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def test_human_games_over_sockets():
+    outputs = asyncio.run(run_clients([["all", "silver"] * 200, ["all", ""] * 200]))
+
+    for output in outputs:
+        assert output.startswith("\nHand: ")
+        assert "Choose treasures to play: " in output
+        assert "Choose a card to buy: " in output
+        assert "Game Result" in output
+
+
+def test_human_invalid_input_over_socket():
+    output = asyncio.run(run_clients([["nonsense", "all", "silver"] * 200]))[0]
+
+    assert output.startswith("\nHand: 3 Copper, 2 Estate | actions: 1, money: 0, buys: 1\n")
+    assert "nonsense is not a valid card" in output
+    assert "Game Result" in output
+
+
+def test_human_disconnect():
+    outputs = asyncio.run(run_clients([[]]))
+    assert "Game Result" not in outputs[0]
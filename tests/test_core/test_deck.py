@@ -1,4 +1,4 @@
-from pyminion.core import AbstractDeck, Card, Deck
+from pyminion.core import AbstractDeck, Card, CountedDeck, CountedHand, Deck
 from pyminion.expansions.base import Copper, Estate, copper, estate
 
 NUM_COPPER = 7
@@ -159,3 +159,62 @@ def test_deck_on_shuffle():
     deck.shuffle()
     deck.shuffle()
     assert len(shuffles) == 3
+
+
+def test_counted_zone_counts():
+    hand = CountedHand([copper, copper, estate])
+    assert hand.count(copper) == 2
+    assert estate in hand
+    hand.remove(estate)
+    assert estate not in hand
+    assert hand.count(estate) == 0
+    hand.add(estate)
+    hand.insert(0, estate)
+    assert hand.count(estate) == 2
+    assert hand.cards[0] is estate
+    assert hand.pop() is estate
+    assert hand.count(estate) == 1
+
+
+def test_counted_deck_draw_and_move():
+    deck = CountedDeck([estate, copper, copper])
+    assert deck.draw() is copper
+    assert deck.count(copper) == 1
+
+    hand = CountedHand([copper])
+    deck.move_to(hand)
+    assert len(deck) == 0
+    assert deck.count(copper) == 0
+    assert hand.count(copper) == 2
+    assert hand.count(estate) == 1
+
+    deck.cards = [estate]
+    assert deck.count(estate) == 1
+
+
+def test_zone_key():
+    assert AbstractDeck().get_key() == 0
+    assert AbstractDeck([copper, estate]).get_key() == AbstractDeck([estate, copper]).get_key()
+    assert AbstractDeck([copper, copper]).get_key() != AbstractDeck([copper, estate]).get_key()
+
+
+def test_counted_zone_key():
+    hand = CountedHand([copper, estate])
+    deck = CountedDeck([estate, copper, copper])
+    assert hand.get_key() == AbstractDeck(hand.cards).get_key()
+
+    hand.add(copper)
+    assert hand.get_key() == deck.get_key()
+
+    hand.remove(estate)
+    hand.insert(0, estate)
+    deck.draw()
+    deck.add(copper)
+    assert hand.get_key() == deck.get_key()
+
+    deck.move_to(hand)
+    assert deck.get_key() == 0
+    assert hand.get_key() == AbstractDeck(hand.cards).get_key()
+
+    hand.pop()
+    assert hand.get_key() == AbstractDeck(hand.cards).get_key()
@@ -0,0 +1,183 @@
+import copy
+from pyminion.bots.examples import BigMoney
+from pyminion.encoding import STANDARD_CARD_NAMES, CardIndex, Observer, get_standard_card_index, get_state_hash
+from pyminion.expansions.alchemy import alchemist, alchemy_set
+from pyminion.expansions.base import base_set, copper, curse, estate, moat, province, silver, smithy, workshop
+from pyminion.expansions.intrigue import courtyard, intrigue_set
+from pyminion.expansions.seaside import lighthouse, seaside_set
+from pyminion.game import Game
+import pytest
+
+
+def make_game(counted_zones: bool = False) -> Game:
+    players = [BigMoney(player_id="a"), BigMoney(player_id="b")]
+    if counted_zones:
+        for player in players:
+            player.use_counted_zones()
+    game = Game(
+        players=players,
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        headless=True,
+        random_order=False,
+        seed=5,
+    )
+    game.start()
+    return game
+
+
+def test_card_index():
+    index = CardIndex([silver, copper, silver, estate])
+    assert len(index) == 3
+    assert index.cards == [silver, copper, estate]
+    assert index.get_id(silver) == 0
+    assert curse not in index
+    assert index.get_counts([silver, silver, copper]) == [2, 1, 0]
+
+    # adding a card keeps the ids of the others
+    extended = CardIndex(index.cards + [curse])
+    assert all(extended.get_id(card) == index.get_id(card) for card in index.cards)
+
+
+def test_card_index_from_game():
+    game = make_game()
+    index = CardIndex.from_game(game)
+    assert smithy in index
+    assert province in index
+    assert index.cards == sorted(index.cards, key=lambda card: card.name)
+
+
+def test_state_hash_same_state():
+    game = make_game()
+    assert get_state_hash(game) == get_state_hash(game.clone())
+    assert get_state_hash(game) == get_state_hash(make_game(counted_zones=True))
+
+
+def test_state_hash_ignores_order():
+    game = make_game()
+    state_hash = get_state_hash(game)
+    game.players[0].deck.cards.reverse()
+    assert get_state_hash(game) == state_hash
+
+
+def test_state_hash_changes():
+    game = make_game(counted_zones=True)
+    player = game.players[0]
+    hashes = {get_state_hash(game)}
+
+    player.draw()
+    hashes.add(get_state_hash(game))
+
+    player.state.money += 1
+    hashes.add(get_state_hash(game))
+
+    player.gain(silver, game)
+    hashes.add(get_state_hash(game))
+
+    game.current_phase = game.Phase.Buy
+    hashes.add(get_state_hash(game))
+
+    game.trash.add(player.hand.remove(player.hand.cards[0]))
+    hashes.add(get_state_hash(game))
+
+    assert len(hashes) == 6
+
+
+def test_state_hash_same_cards_different_zone():
+    game = make_game()
+    player = game.players[0]
+    other = game.clone()
+    other_player = other.players[0]
+
+    player.discard_pile.add(player.hand.pop())
+    card = other_player.hand.pop()
+    other_player.deck.add(card)
+
+    assert get_state_hash(game) != get_state_hash(other)
+
+
+def test_observer_counts():
+    game = make_game()
+    player = game.players[0]
+    observer = Observer(2)
+    ids = observer.card_index.ids
+
+    vector = observer.observe(game, player)
+
+    assert len(vector) == observer.size
+    hand_start = observer.layout["hand"][0]
+    deck_start = observer.layout["deck"][0]
+    assert vector[hand_start + ids[copper]] == player.hand.cards.count(copper)
+    assert vector[deck_start + ids[estate]] == player.deck.cards.count(estate)
+    opponents_start = observer.layout["opponents"][0]
+    assert vector[opponents_start + ids[copper]] == 7
+    supply_start = observer.layout["supply"][0]
+    assert vector[supply_start + ids[province]] == 8
+    assert vector[supply_start + ids[smithy]] == 10
+
+
+def test_observer_counted_zones():
+    game = make_game()
+    counted_game = make_game(counted_zones=True)
+    observer = Observer(2)
+    vector = list(observer.observe(game, game.players[1]))
+    assert list(observer.observe(counted_game, counted_game.players[1])) == vector
+    assert list(game.observe(game.players[1])) == vector
+
+
+def test_observer_reuses_buffer():
+    game = make_game()
+    observer = Observer(2)
+    vector = observer.observe(game, game.players[0])
+    game.players[0].gain(silver, game)
+    assert observer.observe(game, game.players[0]) is vector
+
+
+def test_game_copies_do_not_share_observer():
+    game = make_game()
+    vector = game.observe(game.players[0])
+    expected = list(vector)
+    clone = game.clone()
+    clone.players[0].gain(silver, clone)
+    assert clone.observe(clone.players[0]) is not vector
+    assert list(vector) == expected
+    shallow = copy.copy(game)
+    assert shallow.observe(shallow.players[0]) is not vector
+
+
+def test_observer_batch():
+    game = make_game()
+    other = make_game(counted_zones=True)
+    other.players[1].gain(silver, other)
+    observer = Observer(2)
+    observations = [(game, game.players[0]), (other, other.players[1])]
+
+    batch = observer.observe_batch(observations)
+
+    assert len(batch) == 2 * observer.size
+    for i, (g, p) in enumerate(observations):
+        assert batch[i * observer.size:(i + 1) * observer.size] == observer.observe(g, p)
+
+
+def test_observer_player_count():
+    game = make_game()
+    with pytest.raises(ValueError):
+        Observer(3).observe(game, game.players[0])
+
+
+def test_standard_card_index():
+    index = get_standard_card_index()
+    assert copper in index
+    assert smithy in index
+    assert moat in index
+    assert courtyard in index
+    assert lighthouse in index
+    assert alchemist in index
+    assert index is get_standard_card_index()
+
+    assert [card.name for card in index.cards] == list(STANDARD_CARD_NAMES)
+    for card in base_set + intrigue_set + seaside_set + alchemy_set:
+        assert card in index
+    # ids are stored in game logs and exported results, so they must never change
+    assert index.get_id(copper) == 15
+    assert index.get_id(workshop) == 98
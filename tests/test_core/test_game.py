@@ -1,6 +1,7 @@
 import pytest
 
 from pyminion.core import CardType, Card, Supply, Trash
+from pyminion.effects import EffectAction, FuncPlayerCardGameEffect
 from pyminion.exceptions import InvalidGameSetup, InvalidPlayerCount
 from pyminion.expansions.base import (base_set, curse, duchy, estate, gold, province,
                                       smithy, witch)
@@ -240,3 +241,246 @@ def test_include_potions(decider):
     )
     game_potions.start()
     assert any(pile.name == "Potion" for pile in game_potions.supply.piles)
+
+
+def test_seeded_game_is_reproducible():
+    from pyminion.bots.examples import BigMoney, BigMoneyUltimate
+
+    def play(seed: int):
+        game = Game(
+            players=[BigMoney(), BigMoneyUltimate()],
+            expansions=[base_set],
+            kingdom_cards=[smithy],
+            log_stdout=False,
+            seed=seed,
+        )
+        result = game.play()
+        kingdom = [pile.name for pile in game.supply.kingdom_piles]
+        order = [p.player_id for p in game.players]
+        scores = [s.score for s in result.player_summaries]
+        return kingdom, order, scores, result.turns
+
+    assert play(7) == play(7)
+
+
+def test_headless_game_does_not_log(caplog):
+    from pyminion.bots.examples import BigMoney, BigMoneySmithy
+
+    game = Game(
+        players=[BigMoney(), BigMoneySmithy()],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        headless=True,
+    )
+    with caplog.at_level("INFO"):
+        result = game.play()
+
+    assert result.turns > 0
+    assert all(p.headless for p in game.players)
+    assert len(caplog.records) == 0
+
+
+def test_game_is_over_returned_province(game: Game):
+    for _ in range(5):
+        game.supply.gain_card(card=province)
+    assert game.is_over()
+    game.supply.return_card(province)
+    assert not game.is_over()
+
+
+def test_clone_is_independent():
+    from pyminion.bots.examples import BigMoney, BigMoneySmithy
+
+    game = Game(
+        players=[BigMoney(), BigMoneySmithy()],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        headless=True,
+        seed=3,
+    )
+    game.start()
+    for player in game.players:
+        game.play_turn(player)
+
+    clone = game.clone()
+    player = game.players[0]
+    clone_player = clone.players[0]
+    assert clone_player is not player
+    assert clone.current_player is clone.players[game.players.index(game.current_player)]
+    assert clone_player.hand.cards == player.hand.cards
+    assert clone_player.deck.cards == player.deck.cards
+    assert clone.supply.pile_length("Province") == game.supply.pile_length("Province")
+
+    hand = player.hand.cards[:]
+    deck = player.deck.cards[:]
+    clone_player.draw(2)
+    clone_player.gain(province, clone)
+    clone.trash.add(clone_player.hand.remove(clone_player.hand.cards[0]))
+
+    assert player.hand.cards == hand
+    assert player.deck.cards == deck
+    assert province not in player.discard_pile
+    assert not game.trash
+    assert game.supply.pile_length("Province") == clone.supply.pile_length("Province") + 1
+
+    # hand events of the clone reach the effect registry of the clone only
+    seen: list[Card] = []
+    clone.effect_registry.register_hand_add_effect(
+        FuncPlayerCardGameEffect("Test: Hand Add", EffectAction.Other, lambda p, c, g: seen.append(c))
+    )
+    player.draw()
+    assert seen == []
+    clone_player.draw()
+    assert len(seen) == 1
+
+
+def finish(game: Game) -> list[tuple[str, int]]:
+    start = game.players.index(game.current_player)
+    order = game.players[start:] + game.players[:start]
+    while not game.is_over():
+        for player in order:
+            game.current_player = player
+            game.play_turn(player)
+            if game.is_over():
+                break
+        order = game.players
+    return [(s.player.player_id, s.score) for s in game.summarize_game().player_summaries]
+
+
+def test_clone_plays_out_like_original():
+    from pyminion.bots.examples import BigMoney, BigMoneyUltimate
+
+    game = Game(
+        players=[BigMoney(), BigMoneyUltimate()],
+        expansions=[base_set],
+        kingdom_cards=[smithy, witch],
+        headless=True,
+        seed=11,
+    )
+    game.start()
+    for _ in range(4):
+        for player in game.players:
+            game.current_player = player
+            game.play_turn(player)
+
+    clone = game.clone()
+    assert finish(clone) == finish(game)
+
+
+def test_pickled_game_plays_out_like_original():
+    import pickle
+
+    from pyminion.bench import SCENARIOS
+
+    # moat and the attacks keep effects made from functions in the registry
+    (scenario,) = [s for s in SCENARIOS if s.name == "attacks"]
+    game = Game(
+        players=scenario.make_players(),
+        expansions=scenario.expansions,
+        kingdom_cards=scenario.kingdom_cards,
+        headless=True,
+        seed=5,
+    )
+    game.start()
+    for _ in range(8):
+        for player in game.players:
+            game.current_player = player
+            game.play_turn(player)
+
+    copy = pickle.loads(pickle.dumps(game))
+    assert len(copy.effect_registry.hand_remove_effects) == len(game.effect_registry.hand_remove_effects) > 0
+    assert finish(copy) == finish(game)
+
+
+def test_step_matches_play():
+    from pyminion.bots.examples import BigMoney, BigMoneySmithy
+    from pyminion.lockstep import DecisionRequest, ExternalDecider
+    from pyminion.result import GameResult
+
+    def make_game(external: bool) -> Game:
+        players = [BigMoney(), BigMoneySmithy()]
+        if external:
+            for player in players:
+                player.decider = ExternalDecider(player.decider)
+        return Game(players=players, expansions=[base_set], kingdom_cards=[smithy], headless=True, seed=3)
+
+    expected = make_game(external=False).play()
+
+    game = make_game(external=True)
+    step = game.step()
+    decisions = 0
+    while isinstance(step, DecisionRequest):
+        decisions += 1
+        step = game.step(step.answer())
+
+    assert isinstance(step, GameResult)
+    assert decisions > 0
+    assert step.turns == expected.turns
+    assert [s.score for s in step.player_summaries] == [s.score for s in expected.player_summaries]
+    with pytest.raises(RuntimeError):
+        game.step()
+
+
+def test_step_human(monkeypatch):
+    from pyminion.lockstep import DecisionRequest, ExternalDecider
+
+    human = Human()
+    human.decider = ExternalDecider(human.decider)
+    game = Game(players=[human], expansions=[base_set], kingdom_cards=[smithy], headless=True, seed=3)
+
+    request = game.step()
+    assert isinstance(request, DecisionRequest)
+    assert request.name == "treasure_phase_decision"
+
+    monkeypatch.setattr("builtins.input", lambda _: "all")
+    treasures = request.answer()
+    assert isinstance(game.step(treasures), DecisionRequest)
+    assert human.state.money == len(treasures)
+
+    game.close()
+
+
+def test_step_interleaved_games():
+    from pyminion.bench import SCENARIOS
+    from pyminion.lockstep import DecisionRequest, ExternalDecider
+
+    (scenario,) = [s for s in SCENARIOS if s.name == "seaside_durations"]
+
+    def make_game(seed: int, external: bool) -> Game:
+        players = scenario.make_players()
+        if external:
+            for player in players:
+                player.decider = ExternalDecider(player.decider)
+        return Game(
+            players=players,
+            expansions=scenario.expansions,
+            kingdom_cards=scenario.kingdom_cards,
+            headless=True,
+            seed=seed,
+        )
+
+    def summarize(result) -> tuple:
+        return result.turns, [(s.player.player_id, s.score) for s in result.player_summaries]
+
+    seeds = [1, 2, 3]
+    expected = [summarize(make_game(seed, external=False).play()) for seed in seeds]
+
+    # start each game in the middle of the earlier ones, then take turns
+    # answering a decision of each game, so the games register and unregister
+    # their duration effects in between each other
+    games = [make_game(seed, external=True) for seed in seeds]
+    steps: list = []
+
+    def advance() -> None:
+        for i, step in enumerate(steps):
+            if isinstance(step, DecisionRequest):
+                steps[i] = games[i].step(step.answer())
+
+    for game in games:
+        for _ in range(50):
+            advance()
+        steps.append(game.step())
+    while any(isinstance(step, DecisionRequest) for step in steps):
+        advance()
+
+    assert [summarize(step) for step in steps] == expected
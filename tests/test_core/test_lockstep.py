@@ -0,0 +1,114 @@
+import gc
+
+from pyminion.bots.examples import BigMoney
+from pyminion.bots.examples.big_money import BigMoneyDecider
+from pyminion.expansions.base import base_set, militia, witch
+from pyminion.game import Game
+from pyminion.lockstep import DecisionRequest, ExternalDecider, GameCoroutine, LockstepDriver
+from pyminion.player import Player
+import pytest
+
+
+def make_game(seed: int, external: bool = True) -> Game:
+    decider = ExternalDecider() if external else BigMoneyDecider()
+    return Game(
+        players=[Player(decider=decider, player_id="a"), BigMoney(player_id="b")],
+        expansions=[base_set],
+        kingdom_cards=[witch, militia],
+        headless=True,
+        random_order=False,
+        seed=seed,
+    )
+
+
+def summarize(game_result) -> tuple:
+    return game_result.turns, [(s.player.player_id, s.score) for s in game_result.player_summaries]
+
+
+def test_lockstep_matches_direct_play():
+    expected = [summarize(make_game(seed, external=False).play()) for seed in range(5)]
+
+    decider = BigMoneyDecider()
+    batch_sizes = []
+
+    def policy(requests: list[DecisionRequest]) -> list:
+        batch_sizes.append(len(requests))
+        return [request.answer_with(decider) for request in requests]
+
+    driver = LockstepDriver([make_game(seed) for seed in range(5)], policy)
+    results = driver.run()
+
+    assert [summarize(result) for result in results] == expected
+    assert batch_sizes[0] == 5
+    assert driver.batches == len(batch_sizes)
+    assert driver.decisions == sum(batch_sizes)
+
+
+def test_lockstep_wrong_answer_count():
+    driver = LockstepDriver([make_game(0), make_game(1)], lambda requests: [])
+    with pytest.raises(ValueError):
+        driver.run()
+
+
+def test_lockstep_missing_result(monkeypatch):
+    monkeypatch.setattr(GameCoroutine, "result", property(lambda self: None))
+    decider = BigMoneyDecider()
+    driver = LockstepDriver([make_game(0)], lambda requests: [request.answer_with(decider) for request in requests])
+    with pytest.raises(RuntimeError):
+        driver.run()
+
+
+def test_coroutine_requests():
+    game = make_game(0)
+    coroutine = GameCoroutine(game)
+
+    request = coroutine.send()
+
+    assert request is not None
+    # the opening hand has no actions
+    assert request.name == "treasure_phase_decision"
+    assert request.player is game.players[0]
+    assert request.game is game
+    treasures = request.get_argument("valid_treasures")
+    assert len(treasures) > 0
+
+    request = coroutine.send(treasures)
+    assert request is not None
+    assert request.name == "buy_phase_decision"
+    assert game.players[0].state.money == len(treasures)
+    coroutine.close()
+    assert coroutine.done
+
+
+def test_coroutine_error():
+    coroutine = GameCoroutine(make_game(0))
+    coroutine.send()
+    with pytest.raises(TypeError):
+        # an answer that is not a list of treasures fails inside the game
+        coroutine.send(1)
+    assert coroutine.done
+
+
+def test_dropped_coroutine_stops_its_thread():
+    coroutine = GameCoroutine(make_game(0))
+    assert coroutine.send() is not None
+    thread = coroutine._game_thread._thread
+    assert thread is not None and thread.is_alive()
+
+    del coroutine
+    gc.collect()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+def test_external_decider_outside_coroutine():
+    with pytest.raises(RuntimeError):
+        make_game(0).play()
+
+
+def test_request_answer_without_decider():
+    game = make_game(0)
+    request = game.step()
+    with pytest.raises(ValueError):
+        request.answer()
+    game.close()
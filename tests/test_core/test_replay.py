@@ -0,0 +1,98 @@
+import io
+
+from pyminion.bots.examples import BigMoney, BigMoneySmithy
+from pyminion.encoding import CardIndex
+from pyminion.expansions.base import base_set, copper, estate, smithy, witch
+from pyminion.game import Game
+from pyminion.replay import Event, GameRecorder, read_game_logs, replay_game
+from pyminion.simulator import Simulator, get_game_seed
+import pytest
+
+
+def record_games(iterations: int) -> bytes:
+    stream = io.BytesIO()
+    game = Game(
+        players=[BigMoney(), BigMoneySmithy()],
+        expansions=[base_set],
+        kingdom_cards=[smithy, witch],
+        headless=True,
+        recorder=GameRecorder(stream),
+    )
+    Simulator(game, iterations=iterations, seed=2).run()
+    return stream.getvalue()
+
+
+def test_read_game_logs():
+    logs = list(read_game_logs(io.BytesIO(record_games(3))))
+
+    assert len(logs) == 3
+    log = logs[0]
+    assert log.seed == get_game_seed(2, 0)
+    assert sorted(log.player_ids) == ["big_money", "big_money_smithy"]
+    assert smithy in log.kingdom and witch in log.kingdom
+    assert log.start_deck == [copper] * 7 + [estate] * 3
+
+    events = {event for event, _, _ in log.events}
+    assert {Event.TurnStart, Event.HandAdd, Event.Play, Event.Buy, Event.Shuffle, Event.Decision} <= events
+    event, player, (name, answer) = next(e for e in log.events if e[0] == Event.Decision)
+    assert name == "treasure_phase_decision"
+    assert all(card is copper for card in answer)
+
+
+def test_replay_game():
+    for log in read_game_logs(io.BytesIO(record_games(3))):
+        stream = io.BytesIO()
+        result = replay_game(log, GameRecorder(stream))
+
+        (replayed,) = read_game_logs(io.BytesIO(stream.getvalue()))
+        assert replayed.events == log.events
+        assert result.turns > 0
+
+
+def test_clone_is_not_recorded():
+    stream = io.BytesIO()
+    recorder = GameRecorder(stream)
+    game = Game(
+        players=[BigMoney(), BigMoneySmithy()],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        headless=True,
+        seed=1,
+        recorder=recorder,
+    )
+    game.start()
+    size = len(recorder.buffer)
+
+    clone = game.clone()
+    clone.play_turn(clone.players[0])
+
+    assert len(recorder.buffer) == size
+
+
+def test_recorder_restores_deciders():
+    players = [BigMoney(), BigMoneySmithy()]
+    deciders = {player: player.decider for player in players}
+    game = Game(
+        players=players,
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        headless=True,
+        seed=1,
+        recorder=GameRecorder(io.BytesIO()),
+    )
+    game.play()
+    assert {player: player.decider for player in players} == deciders
+
+    # also when the game stops with an error
+    def fail(*args, **kwargs):
+        raise RuntimeError("decider failed")
+
+    players[0].decider.buy_phase_decision = fail
+    with pytest.raises(RuntimeError):
+        game.play()
+    assert {player: player.decider for player in players} == deciders
+
+
+def test_read_with_other_card_index():
+    with pytest.raises(ValueError):
+        list(read_game_logs(io.BytesIO(record_games(1)), CardIndex([copper, estate])))
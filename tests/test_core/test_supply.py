@@ -93,3 +93,34 @@ def test_pile_length(supply: Supply):
     assert supply.pile_length(pile_name="Province") == 8
     supply.gain_card(card=province)
     assert supply.pile_length(pile_name="Province") == 7
+
+
+def test_get_pile_split_pile():
+    fake_top = Card(name="Top", cost=0, type=(CardType.Action,))
+    fake_bottom = Card(name="Bottom", cost=0, type=(CardType.Action,))
+    split = Pile([fake_top] * 5 + [fake_bottom] * 5)
+    supply = Supply([], [], [split])
+    assert supply.get_pile("Top/Bottom") is split
+    assert supply.get_pile("Top") is split
+    assert supply.get_pile("Bottom") is split
+    assert supply.pile_length("Top") == 10
+
+
+def test_empty_piles_cached_on_return(supply: Supply):
+    for i in range(8):
+        supply.gain_card(card=estate)
+    assert supply.num_empty_piles() == 1
+    supply.return_card(estate)
+    assert supply.num_empty_piles() == 0
+    supply.piles[1].remove(duchy)
+    assert supply.num_empty_piles() == 0
+
+
+def test_empty_end_piles(supply: Supply):
+    assert supply.num_empty_end_piles() == 0
+    for i in range(8):
+        supply.gain_card(card=province)
+    assert supply.num_empty_end_piles() == 1
+    assert supply.num_empty_piles() == 1
+    supply.return_card(province)
+    assert supply.num_empty_end_piles() == 0
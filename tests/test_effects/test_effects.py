@@ -1,7 +1,6 @@
 from pyminion.core import AbstractDeck, Card
 from pyminion.effects import (
     AttackEffect,
-    Effect,
     EffectAction,
     EffectRegistry,
     FuncPlayerCardGameEffect,
@@ -122,11 +121,21 @@ class PlayerGameEffectTest(PlayerGameEffect):
             self.order_count = self.order_counter.inc_count()
 
 
-def test_effect_id():
-    e1 = Effect("e1")
-    e2 = Effect("e2")
-    e3 = Effect("e3")
-    assert e1.get_id() != e2.get_id() != e3.get_id()
+def test_effect_id(effect_registry: EffectRegistry):
+    e1 = PlayerGameEffectTest("e1")
+    e2 = PlayerGameEffectTest("e2")
+    e3 = PlayerGameEffectTest("e3")
+    effect_registry.register_turn_start_effect(e1)
+    effect_registry.register_turn_start_effect(e2)
+    effect_registry.register_turn_end_effect(e2)
+    effect_registry.register_turn_end_effect(e3)
+    assert len({e1.get_id(), e2.get_id(), e3.get_id()}) == 3
+
+    # ids are not reused after a reset, so effects of an earlier game cannot clash
+    effect_registry.reset()
+    e4 = PlayerGameEffectTest("e4")
+    effect_registry.register_turn_start_effect(e4)
+    assert e4.get_id() not in {e1.get_id(), e2.get_id(), e3.get_id()}
 
 
 def test_register_effects(effect_registry: EffectRegistry):
@@ -407,6 +416,90 @@ def test_effect_handler_register(multiplayer_game: Game):
     assert e1.handler_called
 
 
+def test_player_effect_order(multiplayer_game: Game):
+    order_counter = OrderCounter()
+    effect_registry = multiplayer_game.effect_registry
+    player = multiplayer_game.players[0]
+
+    e1 = PlayerCardGameEffectTest("e1", EffectAction.Other, order_counter)
+    effect_registry.register_reveal_effect(e1)
+
+    e2 = FuncPlayerCardGameEffect(
+        "e2",
+        EffectAction.Other,
+        lambda p, c, g: order_counter.inc_count(),
+        player=player,
+    )
+    effect_registry.register_reveal_effect(e2)
+
+    e3 = PlayerCardGameEffectTest("e3", EffectAction.Other, order_counter)
+    effect_registry.register_reveal_effect(e3)
+
+    player.reveal(player.hand.cards[0], multiplayer_game)
+
+    # effects bound to a player are handled in registration order with the others
+    assert e1.order_count == 0
+    assert e3.order_count == 2
+
+
+def test_player_effect_other_player(multiplayer_game: Game):
+    effect_registry = multiplayer_game.effect_registry
+    player = multiplayer_game.players[0]
+    other_player = multiplayer_game.players[1]
+
+    triggered_players: list[Player] = []
+
+    def is_triggered(p: Player, c: Card, g: Game) -> bool:
+        triggered_players.append(p)
+        return True
+
+    effect = FuncPlayerCardGameEffect(
+        "effect",
+        EffectAction.Other,
+        lambda p, c, g: None,
+        is_triggered,
+        player=player,
+    )
+    effect_registry.register_reveal_effect(effect)
+    assert effect.get_player() is player
+
+    # the effect is never considered for other players
+    other_player.reveal(other_player.hand.cards[0], multiplayer_game)
+    assert len(triggered_players) == 0
+
+    player.reveal(player.hand.cards[0], multiplayer_game)
+    assert len(triggered_players) > 0
+    assert all(p is player for p in triggered_players)
+
+    effect_registry.unregister_reveal_effect(effect.get_id())
+    assert len(effect_registry.reveal_effects) == 0
+    triggered_players.clear()
+    player.reveal(player.hand.cards[0], multiplayer_game)
+    assert len(triggered_players) == 0
+
+
+def test_nested_effects(multiplayer_game: Game):
+    effect_registry = multiplayer_game.effect_registry
+    player = multiplayer_game.players[0]
+
+    calls: list[str] = []
+
+    def reveal_again(p: Player, c: Card, g: Game) -> None:
+        calls.append("e1")
+        if len(calls) == 1:
+            p.reveal(c, g)
+
+    e1 = FuncPlayerCardGameEffect("e1", EffectAction.Other, reveal_again)
+    effect_registry.register_reveal_effect(e1)
+
+    e2 = FuncPlayerCardGameEffect("e2", EffectAction.Other, lambda p, c, g: calls.append("e2"))
+    effect_registry.register_reveal_effect(e2)
+
+    # the nested reveal handles both effects without affecting the outer reveal
+    player.reveal(player.hand.cards[0], multiplayer_game)
+    assert calls == ["e1", "e1", "e2", "e2"]
+
+
 @pytest.mark.kingdom_cards([witch])
 def test_on_attack(multiplayer_game: Game):
     reg = multiplayer_game.effect_registry
@@ -587,3 +680,28 @@ def test_on_cleanup_phase_start(game: Game):
     player.start_cleanup_phase(game)
 
     assert effect.handler_called
+
+
+def test_clone_copies_closure_state(game: Game):
+    player = game.players[0]
+    counts = {player.player_id: 0}
+
+    def count(p: Player, c: Card, g: Game) -> None:
+        counts[p.player_id] += 1
+
+    effect = FuncPlayerCardGameEffect("Test: Count", EffectAction.Other, count, player=player)
+    game.effect_registry.register_play_effect(effect)
+
+    clone = game.clone()
+    clone_player = clone.players[0]
+    clone_effect = clone.effect_registry.play_effects[0]
+    assert clone_effect is not effect
+    assert clone_effect.get_id() == effect.get_id()
+    assert clone_effect.get_player() is clone_player
+
+    clone.effect_registry.on_play(clone_player, smithy, clone)
+    assert counts[player.player_id] == 0
+    assert not clone_effect.is_triggered(player, smithy, game)
+
+    game.effect_registry.on_play(player, smithy, game)
+    assert counts[player.player_id] == 1
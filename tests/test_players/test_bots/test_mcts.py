@@ -0,0 +1,127 @@
+from pyminion.bots.examples import BigMoney, BigMoneyUltimate
+from pyminion.bots.mcts import BUY_DECISION, MCTSBot, MCTSDecider, information_set_key
+from pyminion.expansions.base import base_set, copper, curse, province, smithy
+from pyminion.game import Game
+import pytest
+
+
+def make_game(decider: MCTSDecider) -> Game:
+    game = Game(
+        players=[MCTSBot(decider=decider), BigMoney()],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        headless=True,
+        random_order=False,
+        seed=1,
+    )
+    game.start()
+    return game
+
+
+def test_mcts_buy_decision_does_not_change_game():
+    decider = MCTSDecider(iterations=20, seed=0)
+    game = make_game(decider)
+    player = game.players[0]
+    player.state.money = 8
+    hand = player.hand.cards[:]
+    deck = player.deck.cards[:]
+
+    card = decider.buy_phase_decision([province, curse], player, game)
+
+    assert card is province
+    assert player.hand.cards == hand
+    assert player.deck.cards == deck
+    assert game.supply.pile_length("Province") == 8
+    assert len(decider.table) > 1
+
+
+def test_mcts_reuses_nodes():
+    decider = MCTSDecider(iterations=10, seed=0)
+    game = make_game(decider)
+    player = game.players[0]
+    player.state.money = 8
+
+    decider.buy_phase_decision([province, curse], player, game)
+    key = information_set_key(BUY_DECISION, player, game)
+    root = decider.table[key]
+    assert root.visits == 10
+
+    decider.buy_phase_decision([province, curse], player, game)
+    assert decider.table[key] is root
+    assert root.visits == 20
+
+
+def test_mcts_new_game_on_same_object():
+    decider = MCTSDecider(iterations=10, max_turns=4, seed=0)
+    game = make_game(decider)
+    player = game.players[0]
+    hand = player.hand.cards[:]
+    deck = player.deck.cards[:]
+    player.state.money = 8
+
+    decider.buy_phase_decision([province, curse], player, game)
+    key = information_set_key(BUY_DECISION, player, game)
+    assert decider.table[key].visits == 10
+
+    # play a whole game, then start another one on the same object in the same state
+    game.play()
+    game.start()
+    player = game.players[0]
+    player.hand.cards = hand[:]
+    player.deck.cards = deck[:]
+    player.state.money = 8
+    assert information_set_key(BUY_DECISION, player, game) == key
+
+    decider.buy_phase_decision([province, curse], player, game)
+    assert decider.table[key].visits == 10
+
+
+def test_mcts_node_cap():
+    decider = MCTSDecider(iterations=30, max_nodes=3, seed=0)
+    game = make_game(decider)
+    player = game.players[0]
+    player.state.money = 3
+
+    decider.buy_phase_decision([copper, curse], player, game)
+
+    assert len(decider.table) <= 3
+    # the root of the decision is the most recently used node
+    key = information_set_key(BUY_DECISION, player, game)
+    assert key in decider.table
+
+
+def test_mcts_invalid_node_cap():
+    with pytest.raises(ValueError):
+        MCTSDecider(max_nodes=0)
+
+
+def test_mcts_new_game_clears_table():
+    decider = MCTSDecider(iterations=5, seed=0)
+    game = make_game(decider)
+    player = game.players[0]
+    player.state.money = 8
+    decider.buy_phase_decision([province, curse], player, game)
+
+    other_game = make_game(decider)
+    other_player = other_game.players[0]
+    decider.buy_phase_decision([], other_player, other_game)
+    decider.buy_phase_decision([curse], other_player, other_game)
+    assert len(decider.table) > 0
+
+    other_player.state.money = 8
+    decider.buy_phase_decision([province, curse], other_player, other_game)
+    key = information_set_key(BUY_DECISION, other_player, other_game)
+    assert decider.table[key].visits == 5
+
+
+def test_mcts_bot_game():
+    bot = MCTSBot(decider=MCTSDecider(iterations=2, max_turns=4, seed=0))
+    game = Game(
+        players=[bot, BigMoneyUltimate()],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        headless=True,
+        seed=2,
+    )
+    result = game.play()
+    assert result.turns > 0
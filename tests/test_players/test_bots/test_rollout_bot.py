@@ -0,0 +1,156 @@
+import multiprocessing
+import random
+
+from pyminion.bots.examples import BigMoney
+from pyminion.bots.rollout_bot import RolloutBot, RolloutBotDecider, determinize
+from pyminion.expansions.base import base_set, copper, curse, gold, moat, province, smithy
+from pyminion.game import Game
+from pyminion.simulator import Simulator
+
+
+def make_game(decider: RolloutBotDecider) -> Game:
+    game = Game(
+        players=[RolloutBot(decider=decider), BigMoney()],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        headless=True,
+        random_order=False,
+        seed=1,
+    )
+    game.start()
+    return game
+
+
+def test_determinize_moves_hand_effects():
+    game = Game(
+        players=[RolloutBot(), BigMoney()],
+        expansions=[base_set],
+        kingdom_cards=[moat],
+        headless=True,
+        random_order=False,
+        seed=1,
+    )
+    game.start()
+    player, opponent = game.players
+    opponent.hand.add(moat)
+    opponent.deck.add(moat)
+    opponent.deck.add(moat)
+
+    def moat_effects(game: Game) -> int:
+        opponent = game.players[1]
+        return sum(1 for effect in game.effect_registry.attack_effects if effect.get_player() is opponent)
+
+    assert moat_effects(game) == 1
+    rng = random.Random(0)
+    counts = set()
+    for _ in range(30):
+        clone = game.clone()
+        determinize(clone, clone.players[0], rng)
+        count = clone.players[1].hand.cards.count(moat)
+        assert moat_effects(clone) == count
+        counts.add(count)
+    # the guessed hands differ in their number of Moats
+    assert len(counts) > 1
+    assert moat_effects(game) == 1
+
+
+def test_rollout_buy_decision_does_not_change_game():
+    game = make_game(RolloutBotDecider(rollouts=4, seed=0))
+    player = game.players[0]
+    player.state.money = 8
+    hand = player.hand.cards[:]
+    deck = player.deck.cards[:]
+
+    card = player.decider.buy_phase_decision([province, curse], player, game)
+
+    assert card is province
+    assert player.hand.cards == hand
+    assert player.deck.cards == deck
+    assert player.state.money == 8
+    assert game.supply.pile_length("Province") == 8
+    assert game.supply.pile_length("Curse") == 10
+
+
+def test_rollout_single_option():
+    game = make_game(RolloutBotDecider(rollouts=4, seed=0))
+    player = game.players[0]
+    assert player.decider.buy_phase_decision([], player, game) is None
+    assert player.decider.action_phase_decision([], player, game) is None
+
+
+def test_rollout_action_decision():
+    game = make_game(RolloutBotDecider(rollouts=4, seed=0))
+    player = game.players[0]
+    player.hand.add(smithy)
+
+    card = player.decider.action_phase_decision([smithy], player, game)
+
+    assert card in (smithy, None)
+    assert smithy in player.hand
+    assert len(player.hand) == 6
+
+
+def test_rollout_time_limit():
+    decider = RolloutBotDecider(rollouts=1000, time_limit=0.0, seed=0)
+    game = make_game(decider)
+    player = game.players[0]
+    player.state.money = 6
+
+    # with no time, each option is still played out once
+    card = decider.buy_phase_decision([copper, gold], player, game)
+
+    assert card in (copper, gold, None)
+
+
+def test_rollout_processes():
+    with RolloutBotDecider(rollouts=4, processes=2, seed=0) as decider:
+        game = make_game(decider)
+        player = game.players[0]
+        player.state.money = 8
+
+        assert decider.buy_phase_decision([province, curse], player, game) is province
+        pool = decider._pool
+        assert pool is not None
+
+        # the pool is kept for the next decision
+        player.hand.add(smithy)
+        assert decider.action_phase_decision([smithy], player, game) in (smithy, None)
+        assert decider._pool is pool
+    assert decider._pool is None
+
+
+def test_rollout_shared_pool():
+    with multiprocessing.Pool(processes=2) as pool:
+        decider = RolloutBotDecider(rollouts=4, processes=2, seed=0, pool=pool)
+        game = make_game(decider)
+        player = game.players[0]
+        player.state.money = 8
+
+        assert decider.buy_phase_decision([province, curse], player, game) is province
+        assert decider._pool is None
+
+
+def test_rollout_processes_in_simulator_workers():
+    # workers of the simulator cannot start processes, so playouts stay in the worker
+    bot = RolloutBot(decider=RolloutBotDecider(rollouts=1, max_turns=4, processes=2, seed=0))
+    game = Game(
+        players=[bot, BigMoney()],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        headless=True,
+    )
+    result = Simulator(game, iterations=2, workers=2, seed=1).run()
+    assert result.iterations == 2
+
+
+def test_rollout_bot_game():
+    bot = RolloutBot(decider=RolloutBotDecider(rollouts=1, max_turns=4, seed=0))
+    game = Game(
+        players=[bot, BigMoney()],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        headless=True,
+        seed=2,
+    )
+    result = game.play()
+    assert result.turns > 0
@@ -1,5 +1,5 @@
 import pytest
-from pyminion.core import AbstractDeck, DiscardPile, Hand, Playmat
+from pyminion.core import AbstractDeck, CardType, DiscardPile, Hand, Playmat
 from pyminion.exceptions import (
     CardNotFound,
     InsufficientActions,
@@ -8,6 +8,7 @@ from pyminion.exceptions import (
     InvalidCardPlay,
 )
 from pyminion.expansions.base import (
+    base_set,
     Copper,
     Estate,
     copper,
@@ -324,3 +325,54 @@ def test_cleanup_phase(player: Player, game: Game):
     player.start_cleanup_phase(game)
     assert len(player.hand) == 5
     assert len(player.playmat) == 0
+
+
+def test_counted_zones_game():
+    from pyminion.bots.examples import BigMoney, BigMoneyUltimate
+    from pyminion.core import CountedDeck, CountedDiscardPile, CountedHand
+
+    bm = BigMoney()
+    bm.use_counted_zones()
+    bm_ultimate = BigMoneyUltimate()
+    bm_ultimate.use_counted_zones()
+    game = Game(
+        players=[bm, bm_ultimate],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        headless=True,
+    )
+    game.play()
+
+    for player in game.players:
+        assert isinstance(player.deck, CountedDeck)
+        assert isinstance(player.discard_pile, CountedDiscardPile)
+        assert isinstance(player.hand, CountedHand)
+        for zone in (player.deck, player.discard_pile, player.hand):
+            for card in set(zone.cards):
+                assert zone.count(card) == zone.cards.count(card)
+        assert player.get_card_count(copper) == sum(1 for c in player.get_all_cards() if c is copper)
+
+
+def test_track_deck_stats_game():
+    from pyminion.bots.examples import BanditBot, BigMoneyUltimate, ChapelBot
+    from pyminion.expansions.base import bandit, chapel
+
+    players = [BigMoneyUltimate(), BanditBot(), ChapelBot()]
+    for player in players:
+        player.debug_deck_stats = True
+    game = Game(
+        players=players,
+        expansions=[base_set],
+        kingdom_cards=[smithy, bandit, chapel],
+        headless=True,
+        track_deck_stats=True,
+        seed=8,
+    )
+    game.play()
+
+    for player in game.players:
+        player.check_deck_stats()
+        all_cards = list(player.get_all_cards())
+        assert player.get_all_cards_count() == len(all_cards)
+        assert player.get_treasure_count() == sum(1 for c in all_cards if CardType.Treasure in c.type)
+        assert player.get_card_count(copper) == all_cards.count(copper)
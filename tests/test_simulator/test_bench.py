@@ -0,0 +1,35 @@
+import json
+
+from pyminion.bench import SCENARIOS, compare_results, main, run_scenario
+
+
+def test_bench_main(tmp_path, capsys):
+    path = str(tmp_path / "bench.json")
+
+    assert main(["--games", "2", "--output", path]) == 0
+
+    with open(path) as file:
+        results = json.load(file)
+    assert list(results["scenarios"]) == [scenario.name for scenario in SCENARIOS]
+    for result in results["scenarios"].values():
+        assert result["games"] == 2
+        assert result["turns"] > 0
+        assert result["decisions"] > 0
+        assert result["games_per_sec"] > 0
+        assert result["decisions_per_sec"] > result["games_per_sec"]
+        assert result["peak_memory_kb"] > 0
+    assert "games/s" in capsys.readouterr().err
+
+
+def test_bench_is_deterministic():
+    (scenario,) = [s for s in SCENARIOS if s.name == "attacks"]
+    first = run_scenario(scenario, games=3, seed=1)
+    second = run_scenario(scenario, games=3, seed=1, repeat=2)
+
+    assert first["players"] == ["witch", "militia"]
+    assert (first["turns"], first["decisions"]) == (second["turns"], second["decisions"])
+
+    old = {"scenarios": {"attacks": dict(first, games_per_sec=first["games_per_sec"] / 2)}}
+    (line,) = compare_results(old, {"scenarios": {"attacks": first}})
+    assert "+100.0%" in line
+    assert "games differ" not in line
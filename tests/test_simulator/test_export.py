@@ -0,0 +1,70 @@
+import json
+import os
+
+from pyminion.bots.examples import BigMoney, BigMoneyUltimate
+from pyminion.encoding import CardIndex, get_standard_card_index
+from pyminion.expansions.base import base_set, smithy
+from pyminion.export import NPY_HEADER_LENGTH, ResultExporter, read_columns, read_npy
+from pyminion.game import Game
+from pyminion.result import GameOutcome
+from pyminion.simulator import Simulator
+import pytest
+
+
+def test_export_results(tmp_path):
+    bm = BigMoney()
+    bm_ultimate = BigMoneyUltimate()
+    game = Game(players=[bm, bm_ultimate], expansions=[base_set], kingdom_cards=[smithy], headless=True)
+    directory = str(tmp_path / "results")
+
+    with ResultExporter(directory, players=[bm, bm_ultimate], chunk_size=2) as exporter:
+        result = Simulator(game, iterations=5, seed=1, exporter=exporter).run()
+
+    columns = read_columns(directory, get_standard_card_index())
+    assert list(columns["game_turns"]) == [r.turns for r in result.game_results]
+    assert len(columns["player_game"]) == 10
+    assert list(columns["player_game"]) == [i // 2 for i in range(10)]
+
+    ids = get_standard_card_index().ids
+    num_cards = len(ids)
+    for row, (game_index, summary) in enumerate(
+        (i, s) for i, r in enumerate(result.game_results) for s in r.player_summaries
+    ):
+        assert columns["player_game"][row] == game_index
+        assert columns["player_player"][row] == [bm, bm_ultimate].index(summary.player)
+        assert GameOutcome(columns["player_result"][row]) == summary.result
+        assert columns["player_score"][row] == summary.score
+        assert columns["player_turn_order"][row] == summary.turn_order
+        deck = columns["player_deck"][row * num_cards:(row + 1) * num_cards]
+        assert {card: deck[ids[card]] for card in summary.deck} == dict(summary.deck)
+        assert sum(deck) == sum(summary.deck.values())
+
+    for i, game_result in enumerate(result.game_results):
+        if len(game_result.winners) == 1:
+            assert columns["game_winner"][i] == [bm, bm_ultimate].index(game_result.winners[0])
+        else:
+            assert columns["game_winner"][i] == -1
+
+    with open(os.path.join(directory, "meta.json")) as file:
+        meta = json.load(file)
+    assert meta["games"] == 5
+    assert meta["players"] == ["big_money", "big_money_ultimate"]
+    assert len(meta["cards"]) == num_cards
+
+    with pytest.raises(ValueError):
+        read_columns(directory, CardIndex([smithy]))
+
+
+def test_npy_files(tmp_path):
+    directory = str(tmp_path / "results")
+    with ResultExporter(directory, chunk_size=1):
+        pass
+
+    path = os.path.join(directory, "player_deck.npy")
+    values, shape = read_npy(path)
+    assert len(values) == 0
+    assert shape == (0, len(get_standard_card_index()))
+    with open(path, "rb") as file:
+        header = file.read(NPY_HEADER_LENGTH)
+    assert header.startswith(b"\x93NUMPY\x01\x00")
+    assert header.endswith(b"\n")
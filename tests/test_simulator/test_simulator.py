@@ -1,7 +1,9 @@
-from pyminion.bots.examples import BigMoney, BigMoneyUltimate
-from pyminion.expansions.base import base_set, smithy
+from pyminion.bots.examples import BigMoney, BigMoneySmithy, BigMoneyUltimate
+from pyminion.expansions.base import base_set, copper, smithy
 from pyminion.game import Game
+from pyminion.result import get_wilson_interval
 from pyminion.simulator import Simulator
+import pytest
 
 
 def test_sim():
@@ -14,3 +16,221 @@ def test_sim():
     result = sim.run()
 
     assert "ran 2 games" in str(result)
+
+
+def test_sim_parallel():
+    bm = BigMoney()
+    bm_ultimate = BigMoneyUltimate()
+    game = Game(
+        players=[bm, bm_ultimate],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        log_stdout=False,
+    )
+    sim = Simulator(game, iterations=8, workers=2)
+    result = sim.run()
+
+    assert "ran 8 games" in str(result)
+    assert len(result.game_results) == 8
+    for game_result in result.game_results:
+        assert all(p in (bm, bm_ultimate) for p in game_result.winners)
+        for summary in game_result.player_summaries:
+            assert summary.player in (bm, bm_ultimate)
+            assert summary.deck[smithy] == sum(1 for c in summary.deck.elements() if c is smithy)
+
+
+def test_sim_parallel_seed_matches_sequential():
+    game = Game(
+        players=[BigMoney(), BigMoneyUltimate()],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        log_stdout=False,
+    )
+    sequential = Simulator(game, iterations=4, seed=42).run()
+    parallel = Simulator(game, iterations=4, workers=2, seed=42).run()
+
+    for seq_result, par_result in zip(sequential.game_results, parallel.game_results):
+        assert seq_result.turns == par_result.turns
+        assert seq_result.winners == par_result.winners
+        for seq_summary, par_summary in zip(seq_result.player_summaries, par_result.player_summaries):
+            assert seq_summary.player is par_summary.player
+            assert seq_summary.score == par_summary.score
+            assert seq_summary.deck == par_summary.deck
+
+
+def test_sim_replay():
+    bm = BigMoney()
+    bm_ultimate = BigMoneyUltimate()
+    game = Game(
+        players=[bm, bm_ultimate],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        log_stdout=False,
+    )
+    sim = Simulator(game, iterations=3, seed=3)
+    result = sim.run()
+
+    replayed = sim.replay(2)
+    original = result.game_results[2]
+    assert replayed.turns == original.turns
+    assert replayed.winners == original.winners
+    for replayed_summary, original_summary in zip(replayed.player_summaries, original.player_summaries):
+        assert replayed_summary.player is original_summary.player
+        assert replayed_summary.deck == original_summary.deck
+
+
+def test_sim_streaming():
+    bm = BigMoney()
+    bm_ultimate = BigMoneyUltimate()
+    game = Game(
+        players=[bm, bm_ultimate],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        log_stdout=False,
+    )
+    sim = Simulator(game, iterations=4, keep_results=False)
+    result = sim.run()
+
+    assert len(sim.results) == 0
+    assert len(result.game_results) == 0
+    assert sum(result.turn_counts.values()) == 4
+    for player_result in result.player_results:
+        assert player_result.wins + player_result.losses + player_result.ties == 4
+        assert sum(player_result.score_counts.values()) == 4
+        assert sum(player_result.turn_counts.values()) == 4
+        assert player_result.mean_score > 0
+        assert sum(player_result.deck_counts[copper].values()) == 4
+
+
+def test_sim_streaming_matches_results():
+    game = Game(
+        players=[BigMoney(), BigMoneyUltimate()],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        log_stdout=False,
+    )
+    kept = Simulator(game, iterations=3, seed=1).run()
+    streamed = Simulator(game, iterations=3, seed=1, keep_results=False).run()
+
+    for kept_result, streamed_result in zip(kept.player_results, streamed.player_results):
+        assert kept_result.wins == streamed_result.wins
+        assert kept_result.losses == streamed_result.losses
+        assert kept_result.ties == streamed_result.ties
+        assert kept_result.score_counts == streamed_result.score_counts
+        assert kept_result.deck_counts == streamed_result.deck_counts
+
+
+def test_wilson_interval():
+    low, high = get_wilson_interval(50, 100)
+    assert low == pytest.approx(0.4038, abs=1e-4)
+    assert high == pytest.approx(0.5962, abs=1e-4)
+
+    low, high = get_wilson_interval(0, 10)
+    assert low == pytest.approx(0.0)
+    assert 0 < high < 0.35
+
+    assert get_wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_sim_stops_early():
+    game = Game(
+        players=[BigMoney(), BigMoneySmithy()],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        headless=True,
+    )
+    sim = Simulator(game, iterations=10_000, seed=3, confidence=0.99, check_every=50)
+    result = sim.run()
+
+    assert result.stopped_early
+    assert 100 <= result.iterations < 10_000
+    assert result.iterations % 50 == 0
+    assert len(result.game_results) == result.iterations
+    bm, smithy_bm = result.player_results
+    assert bm.games == result.iterations
+    assert bm.confidence == 0.99
+    assert bm.win_interval[1] < smithy_bm.win_interval[0]
+    assert "stopped early" in str(result)
+
+    parallel = Simulator(game, iterations=10_000, workers=2, seed=3, confidence=0.99, check_every=50).run()
+    assert parallel.iterations == result.iterations
+    assert [p.wins for p in parallel.player_results] == [p.wins for p in result.player_results]
+
+
+def test_sim_stops_at_margin():
+    game = Game(
+        players=[BigMoney(), BigMoneySmithy()],
+        expansions=[base_set],
+        kingdom_cards=[smithy],
+        headless=True,
+    )
+    result = Simulator(game, iterations=10_000, seed=3, margin=0.1, keep_results=False).run()
+
+    assert result.stopped_early
+    for player_result in result.player_results:
+        low, high = player_result.win_interval
+        assert high - low <= 0.2
+        assert low <= player_result.win_rate <= high
+
+
+def test_sim_without_stopping_plays_all_games():
+    game = Game(
+        players=[BigMoney(), BigMoney()],
+        expansions=[base_set],
+        headless=True,
+    )
+    result = Simulator(game, iterations=20, seed=3, confidence=0.95, min_iterations=1, check_every=1, margin=0.001).run()
+
+    assert not result.stopped_early
+    assert result.iterations == 20
+
+
+class CrashingExporter:
+    """
+    Stands in for a process that dies after a number of games.
+
+    """
+
+    def __init__(self, games: int):
+        self.games = games
+
+    def add_result(self, result):
+        self.games -= 1
+        if self.games < 0:
+            raise RuntimeError("process died")
+
+
+def test_sim_resume(tmp_path):
+    path = str(tmp_path / "simulation.checkpoint")
+
+    def make_game():
+        game = Game(
+            players=[BigMoney(), BigMoneySmithy()],
+            expansions=[base_set],
+            kingdom_cards=[smithy],
+            headless=True,
+        )
+        game.rng.seed(4)
+        return game
+
+    expected = Simulator(make_game(), iterations=25, keep_results=False).run()
+
+    sim = Simulator(make_game(), iterations=25, checkpoint_path=path, checkpoint_every=10, exporter=CrashingExporter(15))
+    with pytest.raises(RuntimeError):
+        sim.run()
+
+    resumed = Simulator.from_checkpoint(path)
+    assert resumed.games == 10
+    result = resumed.run()
+
+    assert result.iterations == 25
+    assert len(result.game_results) == 15
+    assert result.turn_counts == expected.turn_counts
+    for resumed_result, expected_result in zip(result.player_results, expected.player_results):
+        assert resumed_result.player.player_id == expected_result.player.player_id
+        assert resumed_result.wins == expected_result.wins
+        assert resumed_result.score_counts == expected_result.score_counts
+        assert resumed_result.deck_counts == expected_result.deck_counts
+
+    # the finished simulation is checkpointed too
+    assert Simulator.resume(path, workers=2).turn_counts == expected.turn_counts
@@ -0,0 +1,102 @@
+import json
+import os
+import random
+from collections import Counter
+
+from pyminion.bots.examples import BigMoney, BigMoneySmithy
+from pyminion.expansions.base import base_set, smithy
+from pyminion.expansions.intrigue import intrigue_set
+from pyminion.sweep import KingdomSweep, get_card_statistics, sample_kingdoms
+import pytest
+
+
+def test_sample_kingdoms():
+    kingdoms = sample_kingdoms([base_set, intrigue_set], 10, random.Random(1), required=[smithy])
+
+    assert len(kingdoms) == 10
+    for kingdom in kingdoms:
+        assert len(kingdom) == 10
+        assert len(set(kingdom)) == 10
+        assert kingdom[0] is smithy
+    counts = Counter(card for kingdom in kingdoms for card in kingdom[1:])
+    assert max(counts.values()) - min(counts.values()) <= 1
+
+    with pytest.raises(ValueError):
+        sample_kingdoms([[smithy]], 1, random.Random(1))
+
+
+def make_sweep(kingdoms, cache_dir=None) -> KingdomSweep:
+    return KingdomSweep(
+        [BigMoney(), BigMoneySmithy()],
+        expansions=[base_set],
+        kingdoms=kingdoms,
+        iterations=2,
+        seed=1,
+        cache_dir=cache_dir,
+        required=[smithy],
+    )
+
+
+def test_sweep():
+    sweep = make_sweep(4)
+    result = sweep.run()
+
+    assert len(result.pairing_results) == 4
+    assert all(pairing_result.games == 4 for pairing_result in result.pairing_results)
+    assert "Sweep Result: 4 kingdoms, 16 games" in str(result)
+
+    statistics = {s.card: s for s in result.card_statistics}
+    assert smithy not in statistics
+    assert sum(s.kingdoms for s in statistics.values()) == 4 * 9
+    for card_statistics in statistics.values():
+        assert card_statistics.games == 4 * card_statistics.kingdoms
+        assert sum(card_statistics.win_rates) == pytest.approx(1)
+        assert sum(card_statistics.shifts) == pytest.approx(0)
+
+
+def points_by_id(pairing_result) -> dict:
+    return {(p.player_id, o.player_id): points for (p, o), points in pairing_result.points.items()}
+
+
+def test_sweep_cache(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    kingdoms = sample_kingdoms([base_set], 3, random.Random(2), required=[smithy])
+
+    first = make_sweep(kingdoms[:2], cache_dir).run()
+    assert len(os.listdir(cache_dir)) == 2
+
+    # mark a cached result to see that it is loaded instead of played again
+    sweep = make_sweep(kingdoms, cache_dir)
+    path = sweep.get_cache_path(kingdoms[0])
+    with open(path) as file:
+        data = json.load(file)
+    data["player_results"][0]["wins"] = 100
+    with open(path, "w") as file:
+        json.dump(data, file)
+
+    results = list(sweep.iter_results())
+    assert len(os.listdir(cache_dir)) == 3
+    assert [r.kingdom for r in results] == kingdoms
+    assert results[0].player_results[0].wins == 100
+    cached, played = results[1], first.pairing_results[1]
+    assert cached.turn_counts == played.turn_counts
+    assert points_by_id(cached) == points_by_id(played)
+    for cached_result, played_result in zip(cached.player_results, played.player_results):
+        assert cached_result.player.player_id == played_result.player.player_id
+        assert cached_result.score_counts == played_result.score_counts
+        assert cached_result.deck_counts == played_result.deck_counts
+
+    # results do not depend on the other kingdoms of the sweep
+    fresh = make_sweep(kingdoms[2:]).run()
+    assert points_by_id(fresh.pairing_results[0]) == points_by_id(results[2])
+
+
+def test_card_statistics():
+    result = make_sweep(3).run()
+    players = result.players
+    statistics = get_card_statistics(players, result.pairing_results)
+
+    assert smithy in {s.card for s in statistics}
+    (smithy_statistics,) = [s for s in statistics if s.card is smithy]
+    assert smithy_statistics.kingdoms == 3
+    assert smithy_statistics.baseline_win_rates == [0.0, 0.0]
@@ -0,0 +1,81 @@
+from collections import Counter
+
+from pyminion.bots.examples import BigMoney, BigMoneySmithy, BigMoneyUltimate
+from pyminion.expansions.base import base_set, moat, smithy, witch
+from pyminion.tournament import BASE_RATING, Tournament, get_ratings
+import pytest
+
+
+def test_tournament():
+    bm = BigMoney()
+    bm_smithy = BigMoneySmithy()
+    bm_ultimate = BigMoneyUltimate()
+    tournament = Tournament(
+        [bm, bm_smithy, bm_ultimate],
+        expansions=[base_set],
+        kingdoms=[[smithy], [smithy, witch, moat]],
+        iterations=3,
+        seed=1,
+    )
+
+    pairing_results = list(tournament.iter_results())
+
+    assert len(pairing_results) == 6
+    assert all(pairing_result.games == 6 for pairing_result in pairing_results)
+    assert {tuple(pairing_result.kingdom) for pairing_result in pairing_results} == {(smithy,), (smithy, witch, moat)}
+    for pairing_result in pairing_results:
+        first, second = pairing_result.players
+        assert pairing_result.points[(first, second)] + pairing_result.points[(second, first)] == 6
+        wins = [result.wins + result.ties / 2 for result in pairing_result.player_results]
+        assert wins == [pairing_result.points[(first, second)], pairing_result.points[(second, first)]]
+
+    result = tournament.get_result()
+    assert len(result.standings) == 3
+    assert [s.rating for s in result.standings] == sorted((s.rating for s in result.standings), reverse=True)
+    assert all(standing.games == 24 for standing in result.standings)
+    assert "Tournament Result: 6 pairings, 36 games" in str(result)
+
+
+def test_tournament_parallel_matches_sequential():
+    players = [BigMoney(), BigMoneySmithy(), BigMoneyUltimate()]
+
+    def summarize(result):
+        return [(s.player.player_id, s.wins, s.losses, s.ties) for s in result.standings]
+
+    sequential = Tournament(players, expansions=[base_set], kingdoms=[[smithy]], iterations=2, seed=2).run()
+    with Tournament(players, expansions=[base_set], kingdoms=[[smithy]], iterations=2, workers=2, seed=2) as tournament:
+        parallel = tournament.run()
+
+    assert summarize(parallel) == summarize(sequential)
+    assert len(parallel.pairing_results) == 3
+
+
+def test_tournament_multiplayer():
+    players = [BigMoney(), BigMoneySmithy(), BigMoneyUltimate()]
+    tournament = Tournament(players, expansions=[base_set], kingdoms=[[smithy]], iterations=1, players_per_game=3, seed=1)
+
+    (pairing_result,) = tournament.run().pairing_results
+
+    # one game in every rotation of the seats
+    assert pairing_result.games == 3
+    assert pairing_result.players == players
+
+    with pytest.raises(ValueError):
+        Tournament(players, expansions=[base_set], players_per_game=4)
+
+
+def test_get_ratings():
+    a, b, c = BigMoney(), BigMoneySmithy(), BigMoneyUltimate()
+
+    ratings = get_ratings([a, b], Counter({(a, b): 50, (b, a): 50}))
+    assert ratings[a] == pytest.approx(BASE_RATING)
+    assert ratings[b] == pytest.approx(BASE_RATING)
+
+    ratings = get_ratings([a, b, c], Counter({(a, b): 75, (b, a): 25, (b, c): 75, (c, b): 25}))
+    assert ratings[a] > ratings[b] > ratings[c]
+    # 3:1 odds are close to a difference of 400 * log10(3)
+    assert ratings[a] - ratings[b] == pytest.approx(191, abs=10)
+
+    # unbeaten players get a finite rating
+    ratings = get_ratings([a, b], Counter({(a, b): 10}))
+    assert ratings[a] > ratings[b]